@@ -1,8 +1,9 @@
 import os
+import uuid
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
-from flask import Flask, request, render_template
+from flask import Flask, jsonify, request, render_template, url_for
 
 from src.common.type_defs import SourceClassMap
 from src.components.ingestion.ingestion import IngestionManager
@@ -25,6 +26,15 @@ app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
 app.config["MODEL_RUN_FOLDER"] = MODEL_RUN_FOLDER
 app.config["EDA_FOLDER"] = EDA_FOLDER
 
+# Full-data EDA refinements of sampled uploads, by id, until a page has
+# picked up their outcome
+EDA_REFINEMENTS = {}
+
+
+def static_url(path):
+    """URL of a "static/..." path returned by the EDA."""
+    return url_for("static", filename=path.split("static/", 1)[-1])
+
 
 @app.route("/ingest-data", methods=["GET", "POST"])
 def ingest():
@@ -33,16 +43,15 @@ def ingest():
     eda_shape = None
     eda_images = []
     eda_summary = None
+    refinement_id = None
 
     if request.method == "POST":
         uploaded_file = request.files.get("file")
 
         if uploaded_file and uploaded_file.filename != "":
-            # Extract file extension
-            ext = uploaded_file.filename.rsplit(".", 1)[-1]
-
+            # Detect the source from the file extension (including e.g. .csv.zst)
             try:
-                source_enum = SourceClassMap.from_extension(ext)
+                source_enum = SourceClassMap.from_path(uploaded_file.filename)
             except ValueError as e:
                 return str(e), 400
 
@@ -50,12 +59,31 @@ def ingest():
             file_path = os.path.join(
                 app.config["UPLOAD_FOLDER"], uploaded_file.filename
             )
+            os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
+            uploaded_file.save(file_path)
 
             # Run ingestion
             data_ingestor = IngestionManager(ingest_path=file_path)
+            ingestion_config = data_ingestor.ingestion_config
+            # Plots are served from the static folder
+            ingestion_config.eda_folder_path = app.config["EDA_FOLDER"]
+            # Interactive view: EDA on a sample, refined to full-data
+            # statistics in the background; the page polls for the refined
+            # result and swaps it in
+            ingestion_config.eda_sample_rows = 100_000
+            ingestion_config.eda_refine = True
+            # Request threads must not fork a process pool: render serially
+            ingestion_config.eda_max_workers = 1
 
             # Get the raw data
             data_ingest_feedback = data_ingestor.run()
+            eda_head = data_ingest_feedback["eda_head"]
+            eda_shape = data_ingest_feedback["eda_shape"]
+            eda_images = data_ingest_feedback["eda_images"]
+            eda_summary = data_ingest_feedback["eda_summary"]
+            if data_ingestor.eda_refinement is not None:
+                refinement_id = uuid.uuid4().hex
+                EDA_REFINEMENTS[refinement_id] = data_ingestor.eda_refinement
             message = f"""✅ File ingested with EDA into temp project folder '{app.config["MODEL_RUN_FOLDER"]}/'. """
 
         else:
@@ -64,10 +92,37 @@ def ingest():
     return render_template(
         "ingest.html",
         message=message,
-        eda_head=data_ingest_feedback['eda_head']
-        eda_shape=data_ingest_feedback['eda_shape']
-        eda_images=data_ingest_feedback['eda_images']
-        eda_summary=data_ingest_feedback['eda_summary']
+        eda_head=eda_head,
+        eda_shape=eda_shape,
+        eda_images=[static_url(image) for image in eda_images],
+        eda_summary=eda_summary,
+        refinement_id=refinement_id,
+    )
+
+
+@app.route("/eda-refinement/<refinement_id>")
+def eda_refinement(refinement_id):
+    """Poll the full-data EDA of a sampled upload."""
+    future = EDA_REFINEMENTS.get(refinement_id)
+    if future is None:
+        return jsonify(status="unknown"), 404
+    if not future.done():
+        return jsonify(status="pending")
+
+    EDA_REFINEMENTS.pop(refinement_id, None)
+    if future.exception() is not None:
+        return jsonify(status="failed", error=str(future.exception()))
+    result = future.result()
+    if result is None:
+        # A newer upload's EDA took over before this one was refined
+        return jsonify(status="superseded")
+    eda_head, eda_shape, eda_images, eda_summary = result
+    return jsonify(
+        status="ready",
+        eda_head=eda_head,
+        eda_shape=eda_shape,
+        eda_images=[static_url(image) for image in eda_images],
+        eda_summary=eda_summary,
     )
 
 
@@ -0,0 +1,50 @@
+"""
+Benchmark save/load times of model artifacts in compressed and artifact
+(uncompressed, memory-mappable) mode.
+
+    python -m scripts.dev.benchmark_joblib_artifacts
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.neighbors import KNeighborsRegressor
+from sklearn.preprocessing import StandardScaler
+
+from src.common.sources.joblib_source import JoblibSource, numpy_buffer_bytes
+
+rng = np.random.default_rng(0)
+X = rng.random((200_000, 20))
+y = X @ rng.random(20) + rng.normal(scale=0.1, size=len(X))
+
+artifacts = {
+    "random_forest": RandomForestRegressor(n_estimators=20, n_jobs=-1, random_state=0).fit(X, y),
+    "pre_proc": ColumnTransformer([("num", StandardScaler(), list(range(20)))]).fit(X),
+    "knn": KNeighborsRegressor().fit(X, y),
+}
+modes = {
+    "compress=3": {"compress": 3},
+    "artifact": {"compress": 0, "mmap_mode": "r"},
+}
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    print(f"{'artifact':<15}{'mode':<12}{'buffers MB':>11}{'file MB':>9}{'save s':>8}{'load s':>8}")
+    for name, obj in artifacts.items():
+        buffers_mb = numpy_buffer_bytes(obj) / 1024**2
+        for mode, config in modes.items():
+            path = os.path.join(tmp_dir, f"{name}-{mode}.joblib")
+            source = JoblibSource(config)
+            _, save_s = timed(lambda: source._write(obj, path))
+            _, load_s = timed(lambda: source._read(path))
+            file_mb = os.path.getsize(path) / 1024**2
+            print(f"{name:<15}{mode:<12}{buffers_mb:>11.1f}{file_mb:>9.1f}{save_s:>8.3f}{load_s:>8.3f}")
@@ -0,0 +1,94 @@
+import os
+import threading
+from collections import OrderedDict
+
+from pandas import DataFrame
+
+from src.common.monitoring.logger import logging
+
+
+class FrameCache:
+    """
+    In-process LRU cache of parsed DataFrames, bounded by memory.
+
+    Entries are keyed by (absolute path, file size, mtime, reader options),
+    so rewriting a file naturally misses the old entry. The cache keeps its
+    own copy of every frame and lookups return a fresh copy of it, so
+    callers may modify what they get (including in place, e.g.
+    ``df.loc[...] =``) without the edits leaking into the cache. Copying
+    is still far cheaper than parsing the file again.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024**2):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(path: str, read_kwargs: dict = None):
+        stat = os.stat(path)
+        options = repr(sorted((read_kwargs or {}).items()))
+        return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, options)
+
+    def get(self, key):
+        """Return a copy of the cached frame, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            frame = entry[0]
+        # Copy outside the lock; cached frames are never modified
+        return frame.copy(deep=True)
+
+    def put(self, key, df):
+        """Cache a DataFrame, evicting least recently used entries to fit."""
+        if not isinstance(df, DataFrame):
+            return
+        nbytes = int(df.memory_usage(deep=True).sum())
+        if nbytes > self.max_bytes:
+            logging.info(f"Not caching {key[0]}: {nbytes} bytes exceeds cache budget")
+            return
+
+        with self._lock:
+            self._pop(key)
+            while self._entries and self.current_bytes + nbytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = (df.copy(deep=True), nbytes)
+            self.current_bytes += nbytes
+
+    def invalidate(self, path: str):
+        """Drop every cached entry for ``path``."""
+        path = os.path.abspath(path)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == path]:
+                self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def info(self) -> dict:
+        """Return hit/miss counters and current memory usage."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
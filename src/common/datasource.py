@@ -1,7 +1,22 @@
+import os
+from src.common.cache import FrameCache
+from src.common.query import (
+    is_ndjson,
+    query_batches,
+    query_dataframe,
+    query_frame,
+    supports_pushdown,
+)
 from src.common.type_defs import SourceClassMap
+from src.common.write_behind import WriteBehindQueue
 
 
 class DataSourceIO:
+    # Shared by every DataSourceIO so repeated reads across components hit
+    cache = FrameCache()
+    # Shared background writer for write_flat_file(..., background=True)
+    writer = WriteBehindQueue()
+
     # def __init__(self, source_enum: SourceClassMap, source_config: dict):
 
     #     self.source_enum = source_enum
@@ -40,24 +55,135 @@ class DataSourceIO:
         source = source_class()
         return source
 
-    def read_flat_file(self, path: str):
+    def read_flat_file(
+        self, path: str, use_cache: bool = True, query: str = None, **read_kwargs
+    ):
         """
         Initializes the ingestion source.
 
         Args:
             path: path of flat file
+            use_cache: serve unchanged files from the shared in-process cache
+            query: optional SQL over the file as table ``data``, run on an
+                embedded engine so only the result is materialized
+            read_kwargs: optional source read arguments, e.g. ``columns=[...]``
+                and ``filters=[("col", ">", 1)]``; for CSV and newline-delimited
+                JSON files these are pushed down to the embedded engine as
+                well. ``lines`` states whether a JSON file is newline-delimited
+                (detected from its first line otherwise); other JSON is parsed
+                whole and filtered in memory
         """
-        source = self.set_source_from_path(path)
-        df = source.read_flat_file(path)
+        # Never read around a queued write to the same path
+        self.writer.wait(path)
+
+        key = None
+        if use_cache and os.path.isfile(path):
+            key = self._cache_key(path, query, read_kwargs)
+            df = self.cache.get(key)
+            if df is not None:
+                return df
+
+        lines = read_kwargs.pop("lines", None)
+        json_records = SourceClassMap.from_path(str(path)) is SourceClassMap.JSON and not (
+            os.path.isfile(path) and is_ndjson(path, lines)
+        )
+        if not json_records and self._use_pushdown(path, query, read_kwargs):
+            df = query_frame(path, query=query, **read_kwargs)
+        elif json_records and (query is not None or read_kwargs):
+            # Array-of-records JSON cannot be scanned lazily: parse it whole
+            source = self.set_source_from_path(path)
+            df = query_dataframe(source.read_flat_file(path), query=query, **read_kwargs)
+        else:
+            source = self.set_source_from_path(path)
+            if lines is not None:
+                source.config["lines"] = lines
+            df = source.read_flat_file(path, **read_kwargs)
+
+        if key is not None:
+            self.cache.put(key, df)
         return df
 
-    def write_flat_file(self, df, path: str):
+    @staticmethod
+    def _use_pushdown(path, query, read_kwargs) -> bool:
+        if query is not None:
+            return True
+        # Text formats have no native projection or filtering
+        text_format = SourceClassMap.from_path(str(path)) in (
+            SourceClassMap.CSV,
+            SourceClassMap.JSON,
+        )
+        return text_format and supports_pushdown(path) and bool(read_kwargs)
+
+    def query_batches(
+        self, path, query: str = None, batch_size: int = 100_000, **read_kwargs
+    ):
+        """
+        Streams the result of a query over local files as Arrow record batches.
+
+        Args:
+            path: CSV/NDJSON/Parquet/Feather file, partitioned directory or
+                list of files
+            query: optional SQL over the files as table ``data``
+            batch_size: maximum rows per batch
+            read_kwargs: ``columns`` and ``filters`` applied in the scan
+        """
+        yield from query_batches(path, query=query, batch_size=batch_size, **read_kwargs)
+
+    def cache_info(self) -> dict:
+        """Returns hit/miss counters and memory usage of the read cache."""
+        return self.cache.info()
+
+    def read_flat_file_chunks(self, path: str, chunksize: int = 100_000, **read_kwargs):
+        """
+        Streams a flat file as DataFrame chunks with stable dtypes.
+
+        Args:
+            path: path of flat file
+            chunksize: maximum number of rows per chunk
+            read_kwargs: optional source read arguments
+        """
+        self.writer.wait(path)
+        source = self.set_source_from_path(path)
+        yield from source.read_flat_file_chunks(path, chunksize, **read_kwargs)
+
+    def write_flat_file(
+        self, df, path: str, cache_result: bool = False, background: bool = False
+    ):
         """
         Initializes the ingestion source.
 
         Args:
             df: pandas dataframe
-            source_enum: Enum value from SourceClassMap
+            path: destination path of flat file
+            cache_result: seed the read cache with ``df``; only use this for
+                formats that read back to an identical frame (e.g. Parquet)
+            background: queue the write on the shared write-behind executor
+                and return its Future immediately; ``df`` must not be
+                modified in place afterwards. Reads of ``path`` wait for it.
+
+        Returns:
+            the Future of a background write, otherwise None
         """
+        if background:
+            return self.writer.submit(path, self._write_now, df, path, cache_result)
+        self._write_now(df, path, cache_result)
+
+    def _write_now(self, df, path: str, cache_result: bool = False):
         source = self.set_source_from_path(path)
         source.write_flat_file(df, path)
+        self.cache.invalidate(path)
+        if cache_result:
+            self.cache.put(self._cache_key(path), df)
+
+    def _cache_key(self, path: str, query: str = None, read_kwargs: dict = None):
+        # A plain read and the frame seeded by a write must share one key
+        options = dict(read_kwargs or {})
+        if query is not None:
+            options["query"] = query
+        return self.cache.make_key(path, options)
+
+    def flush(self):
+        """
+        Waits for every background write, raising the first error among them.
+        """
+        self.writer.flush()
@@ -0,0 +1,196 @@
+import os
+import re
+import json
+
+import pyarrow as pa
+
+from src.common.schema import DataSchema
+from src.common.sources.parquet_source import build_filter_expression, open_dataset
+from src.common.type_defs import SourceClassMap
+
+# Formats the embedded engines can scan lazily; JSON must be newline-delimited
+DATASET_FORMATS = {
+    SourceClassMap.CSV: "csv",
+    SourceClassMap.JSON: "json",
+    SourceClassMap.PARQUET: "parquet",
+    SourceClassMap.FEATHER: "feather",
+}
+
+# Name the files are exposed under in SQL queries
+TABLE_NAME = "data"
+
+
+# A SELECT whose output columns are all bare references to columns of ``data``
+_SELECT = re.compile(r"^\s*select\s+(?P<items>.+?)\s+from\s+data\b(?P<rest>.*)$", re.I | re.S)
+_COLUMN_REFERENCE = re.compile(r'^(\*|[A-Za-z_][A-Za-z0-9_]*|"[^"]+")$')
+_SET_OPERATION = re.compile(r"\b(union|intersect|except)\b", re.I)
+
+
+def is_plain_projection(query: str) -> bool:
+    """
+    Whether every column ``query`` returns is a source column passed through
+    unchanged, so the file's schema sidecar describes it. Anything else -
+    aggregates, expressions, aliases, DISTINCT, set operations - is not.
+    """
+    match = _SELECT.match(query.strip().rstrip(";"))
+    if match is None or _SET_OPERATION.search(match.group("rest")):
+        return False
+    items = [item.strip() for item in match.group("items").split(",")]
+    return all(_COLUMN_REFERENCE.match(item) for item in items)
+
+
+def _import_duckdb():
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError("SQL queries over files require 'duckdb'") from e
+    return duckdb
+
+
+def is_ndjson(path, lines: bool = None) -> bool:
+    """
+    Whether a JSON file is newline-delimited, which the dataset engines
+    require. ``lines`` states it explicitly; otherwise the first line must
+    be a complete record: array-of-records and indented JSON (what
+    JSONSource writes by default) start with "[" or a bare "{" line.
+    """
+    if lines is not None:
+        return bool(lines)
+    with pa.input_stream(str(path), compression="detect") as f:
+        head = f.read(64 * 1024).lstrip()
+    first, _, rest = head.partition(b"\n")
+    try:
+        record = json.loads(first)
+    except ValueError:
+        return False
+    if not isinstance(record, dict):
+        return False
+    # A lone one-line object is NDJSON only if it is not a column-oriented frame
+    return bool(rest.strip()) or not all(isinstance(v, dict) for v in record.values())
+
+
+def supports_pushdown(path) -> bool:
+    paths = [path] if isinstance(path, (str, os.PathLike)) else list(path)
+    try:
+        members = [SourceClassMap.from_path(str(p)) for p in paths]
+    except ValueError:
+        return False
+    if not all(member in DATASET_FORMATS for member in members):
+        return False
+    try:
+        return all(
+            is_ndjson(p) for p, member in zip(paths, members) if member is SourceClassMap.JSON
+        )
+    except OSError:
+        return False
+
+
+def open_file_dataset(path):
+    """
+    Open one or more local CSV/NDJSON/Parquet/Feather files (or a
+    hive-partitioned directory) as a lazily scanned pyarrow dataset.
+    """
+    paths = [str(path)] if isinstance(path, (str, os.PathLike)) else list(map(str, path))
+    formats = set()
+    for p in paths:
+        member = SourceClassMap.from_path(p)
+        if member not in DATASET_FORMATS:
+            raise ValueError(f"Query pushdown does not support .{member.ext} files")
+        formats.add(DATASET_FORMATS[member])
+    if len(formats) > 1:
+        raise ValueError(f"Cannot query mixed file formats together: {sorted(formats)}")
+    return open_dataset(paths[0] if len(paths) == 1 else paths, file_format=formats.pop())
+
+
+def _scan(path, columns=None, filters=None):
+    dataset = open_file_dataset(path)
+    return dataset.scanner(columns=columns, filter=build_filter_expression(filters))
+
+
+def _connect(path, columns=None, filters=None):
+    """DuckDB connection with the files registered as the table ``data``."""
+    duckdb = _import_duckdb()
+    con = duckdb.connect()
+    # A bare dataset lets DuckDB push its own projections and filters down
+    if columns is None and not filters:
+        con.register(TABLE_NAME, open_file_dataset(path))
+    else:
+        con.register(TABLE_NAME, _scan(path, columns, filters))
+    return con
+
+
+def query_batches(path, query: str = None, columns=None, filters=None, batch_size: int = 100_000):
+    """
+    Stream the result of a query over local files as Arrow record batches.
+
+    Without ``query`` the projection (``columns``) and ``filters`` are
+    evaluated by the pyarrow dataset scanner: only the projected columns are
+    decoded, and Parquet row groups and hive partitions that cannot match
+    are skipped. With ``query`` the files are exposed to DuckDB as the table
+    ``data``, e.g. "SELECT region, avg(pm25) FROM data GROUP BY region";
+    DuckDB pushes its own projections and filters into the same scan.
+
+    Args:
+        path: file, hive-partitioned directory, or list of files
+        query: optional SQL over the table ``data``
+        columns: columns to read
+        filters: (column, op, value) tuples, see build_filter_expression
+        batch_size: maximum rows per batch
+    """
+    if query is None:
+        for batch in _scan(path, columns, filters).to_batches():
+            for start in range(0, batch.num_rows, batch_size):
+                yield batch.slice(start, batch_size)
+        return
+
+    con = _connect(path, columns, filters)
+    try:
+        yield from con.execute(query).fetch_record_batch(batch_size)
+    finally:
+        con.close()
+
+
+def query_frame(path, query: str = None, columns=None, filters=None):
+    """
+    Run a query (see ``query_batches``) and return the result as a DataFrame.
+    A schema sidecar next to a single CSV/JSON file is applied to the result
+    when it only holds source columns (see ``is_plain_projection``); computed
+    columns keep the types the engine gave them.
+    """
+    if query is None:
+        df = _scan(path, columns, filters).to_table().to_pandas()
+    else:
+        con = _connect(path, columns, filters)
+        try:
+            df = con.execute(query).df()
+        finally:
+            con.close()
+
+    plain = query is None or is_plain_projection(query)
+    if plain and isinstance(path, (str, os.PathLike)) and os.path.isfile(path):
+        schema = DataSchema.load(str(path))
+        if schema is not None:
+            df = schema.apply(df)
+    return df
+
+
+def query_dataframe(df, query: str = None, columns=None, filters=None):
+    """
+    Apply ``columns``, ``filters`` and ``query`` (see ``query_batches``) to a
+    frame already in memory, for files the engines cannot scan lazily such
+    as array-of-records JSON.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if filters:
+        table = table.filter(build_filter_expression(filters))
+    if columns is not None:
+        table = table.select(columns)
+    if query is None:
+        return table.to_pandas()
+
+    con = _import_duckdb().connect()
+    try:
+        con.register(TABLE_NAME, table)
+        return con.execute(query).df()
+    finally:
+        con.close()
@@ -0,0 +1,143 @@
+import os
+import json
+from dataclasses import dataclass, field, asdict
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+
+@dataclass
+class DataSchema:
+    """
+    Column types persisted next to a text flat file so it can be re-read
+    without type inference.
+
+    - dtypes: compact numpy dtype per numeric/bool/object column
+    - categories: category values per categorical column
+    - datetime_columns: columns parsed as datetimes
+    - file_size/file_mtime_ns: stat of the data file the schema describes,
+      used to ignore the sidecar once the file is rewritten by something else
+    """
+
+    columns: list
+    dtypes: dict = field(default_factory=dict)
+    categories: dict = field(default_factory=dict)
+    datetime_columns: list = field(default_factory=list)
+    file_size: int = None
+    file_mtime_ns: int = None
+
+    @staticmethod
+    def sidecar_path(path: str) -> str:
+        return f"{path}.schema.json"
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, category_ratio: float = 0.5):
+        """
+        Build a schema from a DataFrame, downcasting wherever it is lossless.
+
+        Args:
+            df: DataFrame about to be written
+            category_ratio: object columns with at most this ratio of unique
+                values to rows are stored as categoricals
+        """
+        schema = cls(columns=[str(col) for col in df.columns])
+        for col in df.columns:
+            series = df[col]
+            name = str(col)
+            if pd.api.types.is_datetime64_any_dtype(series):
+                schema.datetime_columns.append(name)
+            elif isinstance(series.dtype, pd.CategoricalDtype):
+                schema.categories[name] = series.cat.categories.tolist()
+            elif pd.api.types.is_bool_dtype(series):
+                schema.dtypes[name] = "bool"
+            elif pd.api.types.is_integer_dtype(series):
+                schema.dtypes[name] = str(
+                    pd.to_numeric(series, downcast="integer").dtype
+                )
+            elif pd.api.types.is_float_dtype(series):
+                schema.dtypes[name] = _compact_float_dtype(series)
+            elif pd.api.types.is_object_dtype(series):
+                uniques = series.dropna().unique()
+                is_text = all(isinstance(value, str) for value in uniques)
+                if is_text and len(uniques) <= category_ratio * len(series):
+                    schema.categories[name] = sorted(uniques)
+                else:
+                    schema.dtypes[name] = "object"
+        return schema
+
+    def csv_read_options(self) -> dict:
+        """Keyword arguments that make ``pd.read_csv`` apply this schema."""
+        dtype = dict(self.dtypes)
+        for col, categories in self.categories.items():
+            dtype[col] = pd.CategoricalDtype(categories)
+        return {"dtype": dtype, "parse_dates": list(self.datetime_columns)}
+
+    def arrow_schema(self) -> pa.Schema:
+        """
+        Explicit Arrow schema for vectorized readers such as pyarrow.json.
+        Object columns may hold mixed types, so they are left to inference.
+        """
+        fields = []
+        for col in self.columns:
+            if col in self.datetime_columns:
+                fields.append((col, pa.timestamp("ns")))
+            elif col in self.categories:
+                fields.append((col, pa.string()))
+            elif self.dtypes.get(col, "object") != "object":
+                fields.append((col, pa.from_numpy_dtype(np.dtype(self.dtypes[col]))))
+        return pa.schema(fields)
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Cast an already-parsed DataFrame to this schema."""
+        for col, dtype in self.dtypes.items():
+            if col in df.columns:
+                df[col] = df[col].astype(dtype)
+        for col, categories in self.categories.items():
+            if col in df.columns:
+                df[col] = df[col].astype(pd.CategoricalDtype(categories))
+        for col in self.datetime_columns:
+            if col in df.columns:
+                df[col] = pd.to_datetime(df[col])
+        return df
+
+    def matches_file(self, path: str) -> bool:
+        """Whether the data file is still the one this schema was written for."""
+        stat = os.stat(path)
+        return stat.st_size == self.file_size and stat.st_mtime_ns == self.file_mtime_ns
+
+    def save(self, path: str, stat_path: str = None):
+        """
+        Record the data file stat and write the sidecar for ``path``.
+
+        ``stat_path`` is the file whose stat to record when the data is not
+        at ``path`` yet, e.g. a temp file about to be renamed into place
+        (a rename keeps size and mtime).
+        """
+        stat = os.stat(path if stat_path is None else stat_path)
+        self.file_size = stat.st_size
+        self.file_mtime_ns = stat.st_mtime_ns
+        sidecar_path = self.sidecar_path(path)
+        tmp_path = f"{sidecar_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(asdict(self), f, default=str)
+        os.replace(tmp_path, sidecar_path)
+
+    @classmethod
+    def load(cls, path: str):
+        """Return the sidecar schema for ``path``, or None if missing or stale."""
+        sidecar_path = cls.sidecar_path(path)
+        if not os.path.exists(sidecar_path):
+            return None
+        with open(sidecar_path) as f:
+            schema = cls(**json.load(f))
+        return schema if schema.matches_file(path) else None
+
+
+def _compact_float_dtype(series: pd.Series) -> str:
+    """Return float32 if every value survives the round trip, else float64."""
+    values = series.to_numpy(dtype="float64")
+    narrowed = values.astype("float32").astype("float64")
+    if np.array_equal(values, narrowed, equal_nan=True):
+        return "float32"
+    return "float64"
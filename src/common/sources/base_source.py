@@ -1,18 +1,28 @@
 import os
 import sys
+import uuid
+import shutil
 import pandas as pd
 from pandas import DataFrame
 
 from src.common.monitoring.logger import logging
 from src.common.exception import CustomException
+from src.common.schema import DataSchema
 
 
 class DataSource:
-    def __init__(self, config: dict = {}):
+    # Text formats lose dtypes on disk, so they persist a schema sidecar
+    schema_sidecar = False
+    # Write to a temp path and rename into place, so readers never see a
+    # partial file; sources whose "path" is not a local file opt out
+    atomic_writes = True
+
+    def __init__(self, config: dict = None):
         """
         Initialize the data source with a configuration dictionary.
         """
-        self.config = config
+        # A fresh dict per source: callers set per-read options on it
+        self.config = {} if config is None else config
 
     def set_io_config(self, config: dict = None):
         """
@@ -23,16 +33,73 @@ class DataSource:
             self.config.update(config)
         return self.config
 
-    def read_flat_file(self, path: str):
+    def read_flat_file(self, path: str, **read_kwargs):
+        """
+        Read a flat file into memory.
+
+        Args:
+            path: path of flat file
+            read_kwargs: source-specific read arguments, e.g. ``columns`` and
+                ``filters`` for the columnar sources
+        """
         # path = self.config["path"] if path is None else path
         logging.info(f"Reading data from: {path}")
         try:
-            return self._read(path)
+            read_kwargs.update(self._sidecar_read_kwargs(path))
+            return self._read(path, **read_kwargs)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def read_flat_file_chunks(self, path: str, chunksize: int = 100_000, **read_kwargs):
+        """
+        Stream a flat file as a sequence of DataFrames of at most ``chunksize`` rows.
+
+        Every chunk is cast to the dtypes of the first chunk, so downstream
+        consumers see the same schema throughout the stream.
+
+        Args:
+            path: path of flat file
+            chunksize: maximum number of rows per chunk
+            read_kwargs: source-specific read arguments
+        """
+        logging.info(f"Streaming data from: {path} (chunksize={chunksize})")
+        try:
+            read_kwargs.update(self._sidecar_read_kwargs(path))
+            chunks = self._read_chunks(path, chunksize, **read_kwargs)
+            yield from self._stabilize_chunk_dtypes(chunks)
         except Exception as e:
             raise CustomException(e, sys)
 
-    def write_flat_file(self, df, path: str = None):
+    @staticmethod
+    def _stabilize_chunk_dtypes(chunks):
+        """Cast each chunk to the dtypes observed in the first chunk."""
+        dtypes = None
+        for chunk in chunks:
+            if dtypes is None:
+                dtypes = chunk.dtypes.to_dict()
+            else:
+                for col, dtype in dtypes.items():
+                    if col not in chunk.columns or chunk[col].dtype == dtype:
+                        continue
+                    values = chunk[col]
+                    try:
+                        cast = values.astype(dtype)
+                        # Refuse casts that lose information, e.g. 2.5 -> 2
+                        lossless = cast.astype(values.dtype).equals(values)
+                    except (TypeError, ValueError):
+                        lossless = False
+                    if not lossless:
+                        raise ValueError(
+                            f"Column '{col}' changed dtype from {dtype} to "
+                            f"{values.dtype} between chunks; pass an explicit "
+                            "dtype in the read options"
+                        )
+                    chunk[col] = cast
+            yield chunk
+
+    def write_flat_file(self, df, path: str = None, **write_kwargs):
         # path = self.config["path"] if path is None else path
+        # write_kwargs are passed through to the source's _write
         directory = os.path.dirname(path)
         if directory and not os.path.exists(directory):
             os.makedirs(directory, exist_ok=True)  # Create dirs if missing
@@ -40,13 +107,61 @@ class DataSource:
 
         logging.info(f"Writing data to: {path}")
         try:
-            return self._write(df, path)
+            schema = None
+            if self._uses_sidecar() and isinstance(df, DataFrame):
+                schema = DataSchema.from_frame(df)
+            if self.atomic_writes:
+                return self._write_atomic(df, path, schema, **write_kwargs)
+            result = self._write(df, path, **write_kwargs)
+            if schema is not None:
+                schema.save(path)
+            return result
         except Exception as e:
             raise CustomException(e, sys)
 
+    def _write_atomic(self, df, path: str, schema=None, **write_kwargs):
+        """
+        Write to a hidden temp path next to ``path`` and rename it into place.
+        The temp name keeps the file name as its suffix, so extension-based
+        behavior (compression, .npy) is unchanged.
+
+        A ``schema`` sidecar is saved before the rename, with the temp file's
+        stat: until the new data lands, readers find it stale for the old file
+        and ignore it, so old data is never read with the new schema.
+        """
+        directory, name = os.path.split(path)
+        tmp_path = os.path.join(directory, f".tmp-{uuid.uuid4().hex[:8]}-{name}")
+        try:
+            result = self._write(df, tmp_path, **write_kwargs)
+            if schema is not None:
+                schema.save(path, stat_path=tmp_path)
+            _replace(tmp_path, path)
+            return result
+        except BaseException:
+            _remove(tmp_path)
+            raise
+
+    def _uses_sidecar(self) -> bool:
+        return self.schema_sidecar and (self.config or {}).get("schema_sidecar", True)
+
+    def _sidecar_read_kwargs(self, path: str) -> dict:
+        """Return ``{"schema": DataSchema}`` when a valid sidecar exists for path."""
+        if not self._uses_sidecar():
+            return {}
+        schema = DataSchema.load(path)
+        if schema is None:
+            return {}
+        logging.info(f"Applying schema sidecar for: {path}")
+        return {"schema": schema}
+
     def _read(self):
         raise NotImplementedError
 
+    def _read_chunks(self, path: str, chunksize: int):
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support chunked reads"
+        )
+
     def _write(self, df):
         raise NotImplementedError
 
@@ -62,3 +177,22 @@ class DataSource:
                 "score": [85.5, 92.0, 78.3],
             }
         )
+
+
+def _remove(path: str):
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def _replace(src: str, dst: str):
+    """os.replace that also swaps directory outputs (e.g. .csr) over old ones."""
+    if not os.path.isdir(dst):
+        os.replace(src, dst)
+        return
+    # A non-empty directory cannot be renamed over; move it aside first
+    old = f"{src}.old"
+    os.replace(dst, old)
+    os.replace(src, dst)
+    shutil.rmtree(old, ignore_errors=True)
@@ -0,0 +1,89 @@
+import os
+import gzip
+from contextlib import contextmanager
+
+# Compound extension suffix -> codec, e.g. raw.csv.zst
+COMPRESSION_EXTENSIONS = {
+    "gz": "gzip",
+    "zst": "zstd",
+    "lz4": "lz4",
+}
+
+
+def split_compression(path: str):
+    """
+    Split a compression suffix off a path.
+
+    Returns:
+        (path without the compression suffix, codec name or None)
+    """
+    base, ext = os.path.splitext(str(path))
+    codec = COMPRESSION_EXTENSIONS.get(ext.lower().lstrip("."))
+    return (base, codec) if codec else (str(path), None)
+
+
+def open_compressed(path: str, mode: str, codec: str, level: int = None, threads: int = -1):
+    """
+    Open a streaming (de)compressing file handle.
+
+    Args:
+        path: file path
+        mode: "rb", "wb", "rt" or "wt"
+        codec: one of the COMPRESSION_EXTENSIONS values
+        level: compression level (codec default when None)
+        threads: zstd worker threads on write, -1 for one per core
+    """
+    text_args = {"encoding": "utf-8", "newline": ""} if "t" in mode else {}
+
+    if codec == "gzip":
+        return gzip.open(path, mode, compresslevel=6 if level is None else level, **text_args)
+
+    if codec == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("Reading or writing .zst files requires 'zstandard'") from e
+        if "w" in mode:
+            cctx = zstandard.ZstdCompressor(level=3 if level is None else level, threads=threads)
+            return zstandard.open(path, mode, cctx=cctx, **text_args)
+        return zstandard.open(path, mode, **text_args)
+
+    if codec == "lz4":
+        try:
+            import lz4.frame
+        except ImportError as e:
+            raise ImportError("Reading or writing .lz4 files requires 'lz4'") from e
+        return lz4.frame.open(path, mode, compression_level=0 if level is None else level, **text_args)
+
+    raise ValueError(f"Unsupported compression codec: {codec}")
+
+
+@contextmanager
+def compressed_handle(path: str, mode: str, config: dict = None):
+    """
+    Yield something pandas can read from or write to for ``path``.
+
+    Uncompressed paths are yielded unchanged so pandas opens them itself;
+    compressed paths are yielded as streaming file handles.
+
+    Args:
+        path: file path, optionally with a compression suffix
+        mode: "rb", "wb", "rt" or "wt"
+        config: source config; "compression_level" and "compression_threads"
+            tune writes
+    """
+    codec = split_compression(path)[1]
+    if codec is None:
+        yield path
+        return
+
+    config = config or {}
+    handle = open_compressed(
+        path,
+        mode,
+        codec,
+        level=config.get("compression_level"),
+        threads=config.get("compression_threads", -1),
+    )
+    with handle:
+        yield handle
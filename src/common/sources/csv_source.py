@@ -1,15 +1,32 @@
 import pandas as pd
 from src.common.sources.base_source import DataSource
+from src.common.sources.compression import compressed_handle
 
 
 class CSVSource(DataSource):
-    def _read(self, path: str):
+    schema_sidecar = True
+
+    def _read_options(self, schema=None):
         options = self.config.get("options", {})
-        return pd.read_csv(path, **options)
+        if schema is None:
+            return options
+        # Explicit read options take precedence over the persisted schema
+        return {**schema.csv_read_options(), **options}
+
+    def _read(self, path: str, schema=None):
+        with compressed_handle(path, "rb") as f:
+            return pd.read_csv(f, **self._read_options(schema))
+
+    def _read_chunks(self, path: str, chunksize: int, schema=None):
+        options = self._read_options(schema)
+        with compressed_handle(path, "rb") as f:
+            with pd.read_csv(f, chunksize=chunksize, **options) as reader:
+                yield from reader
 
     def _write(self, df, path: str):
         options = self.config.get("write_options", {})
-        df.to_csv(path, index=False, **options)
+        with compressed_handle(path, "wt", self.config) as f:
+            df.to_csv(f, index=False, **options)
 
     def generate_sample_table(self):
         sample_df = super().generate_sample_table()
@@ -1,32 +1,72 @@
 import pandas as pd
 import gcsfs
+from pyarrow.fs import FSSpecHandler, PyFileSystem
 from src.common.sources.base_source import DataSource
+from src.common.sources.parquet_source import (
+    build_filter_expression,
+    iter_dataset_frames,
+    open_dataset,
+)
 
 
 class GCSSource(DataSource):
+    def _get_gcsfs(self):
+        if getattr(self, "_gcsfs", None) is None:
+            project = self.config.get("project")
+            token = self.config.get("token", "default")  # Or a path to a JSON file or dict
+            self._gcsfs = gcsfs.GCSFileSystem(project=project, token=token)
+        return self._gcsfs
+
+    def _get_filesystem(self):
+        # Any pyarrow filesystem (e.g. a LocalFileSystem stand-in) can be passed in the config
+        if self.config.get("filesystem") is not None:
+            return self.config["filesystem"]
+        return PyFileSystem(FSSpecHandler(self._get_gcsfs()))
+
+    def _get_dataset(self):
+        path = self.config["path"]  # e.g., gs://bucket_name/path/to/readings/
+        if self.config.get("filesystem") is None:
+            path = path.removeprefix("gs://")
+        return open_dataset(path, self._get_filesystem(), self.config.get("file_format", "csv"))
+
     def load(self):
-        path = self.config["path"]  # e.g., gs://bucket_name/path/to/file.csv
+        """
+        CSV files are streamed whole; Parquet files and hive-partitioned
+        directories are read as a dataset, fetching only the footers and
+        the column chunks that survive ``columns``/``filters`` pruning as
+        ranged reads.
+        """
+        path = self.config["path"]
         options = self.config.get("options", {})
-        project = self.config.get("project")
-        token = self.config.get("token", "default")  # Or a path to a JSON file or dict
 
-        fs = gcsfs.GCSFileSystem(project=project, token=token)
+        if self.config.get("file_format", "csv") == "csv":
+            with self._get_gcsfs().open(path, "rb") as f:
+                return pd.read_csv(f, **options)
+
+        table = self._get_dataset().to_table(
+            columns=self.config.get("columns"),
+            filter=build_filter_expression(self.config.get("filters")),
+        )
+        return table.to_pandas()
 
-        with fs.open(path, "rb") as f:
-            return pd.read_csv(f, **options)
+    def load_chunks(self, chunksize: int = 100_000):
+        yield from iter_dataset_frames(
+            self._get_dataset(),
+            chunksize,
+            columns=self.config.get("columns"),
+            filters=self.config.get("filters"),
+        )
 
     def generate_sample_table(self):
         sample_df = super().generate_sample_table()
         output_path = self.config.get(
             "output_path"
         )  # e.g., gs://bucket_name/sample_table.csv
-        project = self.config.get("project")
-        token = self.config.get("token", "default")
 
         if not output_path:
             raise ValueError("Missing required config key: 'output_path'")
 
-        fs = gcsfs.GCSFileSystem(project=project, token=token)
+        fs = self._get_gcsfs()
 
         with fs.open(output_path, "w") as f:
             sample_df.to_csv(f, index=False)
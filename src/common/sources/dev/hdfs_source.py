@@ -1,34 +1,63 @@
 import pandas as pd
 import pyarrow.fs as fs
 from src.common.sources.base_source import DataSource
+from src.common.sources.parquet_source import (
+    build_filter_expression,
+    iter_dataset_frames,
+    open_dataset,
+)
 
 
 class HDFSSource(DataSource):
-    def load(self):
-        hdfs_host = self.config["host"]
-        hdfs_port = self.config.get("port", 8020)
-        hdfs_path = self.config["path"]
+    def _get_filesystem(self):
+        # Any pyarrow filesystem (e.g. fs.LocalFileSystem()) can be passed in the config
+        if self.config.get("filesystem") is not None:
+            return self.config["filesystem"]
+        if getattr(self, "_filesystem", None) is None:
+            hdfs_host = self.config["host"]
+            hdfs_port = self.config.get("port", 8020)
+            self._filesystem = fs.HadoopFileSystem(host=hdfs_host, port=hdfs_port)
+        return self._filesystem
+
+    def _get_dataset(self):
         file_format = self.config.get("file_format", "csv")  # or "parquet"
+        if file_format not in ("csv", "parquet"):
+            raise ValueError(f"Unsupported file format: {file_format}")
+        return open_dataset(self.config["path"], self._get_filesystem(), file_format)
 
-        hdfs = fs.HadoopFileSystem(host=hdfs_host, port=hdfs_port)
-        file = hdfs.open_input_file(hdfs_path)
+    def load(self):
+        """
+        Read a file or a hive-partitioned directory as a dataset.
 
-        if file_format == "csv":
-            return pd.read_csv(file)
-        elif file_format == "parquet":
-            return pd.read_parquet(file)
-        else:
-            raise ValueError(f"Unsupported file format: {file_format}")
+        Config:
+            path: file or directory, e.g. "/data/readings" holding
+                region=north/part-0.parquet, ...
+            columns: only these columns are read
+            filters: (column, op, value) tuples; partition-key filters skip
+                whole directories and Parquet row groups are pruned on their
+                min/max statistics before any data is fetched
+        """
+        table = self._get_dataset().to_table(
+            columns=self.config.get("columns"),
+            filter=build_filter_expression(self.config.get("filters")),
+        )
+        return table.to_pandas()
+
+    def load_chunks(self, chunksize: int = 100_000):
+        yield from iter_dataset_frames(
+            self._get_dataset(),
+            chunksize,
+            columns=self.config.get("columns"),
+            filters=self.config.get("filters"),
+        )
 
     def generate_sample_table(self):
         sample_df = super().generate_sample_table()
 
-        hdfs_host = self.config["host"]
-        hdfs_port = self.config.get("port", 8020)
         output_path = self.config["output_path"]
         file_format = self.config.get("file_format", "csv")
 
-        hdfs = fs.HadoopFileSystem(host=hdfs_host, port=hdfs_port)
+        hdfs = self._get_filesystem()
         with hdfs.open_output_stream(output_path) as out_stream:
             if file_format == "csv":
                 sample_df.to_csv(out_stream, index=False)
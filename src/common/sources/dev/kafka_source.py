@@ -1,12 +1,37 @@
+import io
+import os
+import uuid
+import json
+from datetime import datetime, timezone
+
 import pandas as pd
-from confluent_kafka import Consumer, KafkaException
+import pyarrow as pa
+import pyarrow.json as pa_json
+from confluent_kafka import Consumer, KafkaError, KafkaException
+from src.common.monitoring.logger import logging
 from src.common.sources.base_source import DataSource
+from src.common.sources.parquet_source import ParquetSource
+
+
+def decode_json_batch(payloads) -> pd.DataFrame:
+    """
+    Decode a batch of JSON message payloads into one DataFrame.
+
+    The batch is parsed in a single vectorized pass as newline-delimited
+    JSON; payloads that are not one object per line (e.g. pretty-printed)
+    fall back to per-message decoding.
+    """
+    payloads = [p if isinstance(p, bytes) else p.encode("utf-8") for p in payloads]
+    try:
+        table = pa_json.read_json(io.BytesIO(b"\n".join(payloads)))
+        return table.to_pandas()
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pd.DataFrame.from_records([json.loads(p) for p in payloads])
 
 
 class KafkaSource(DataSource):
-    def load(self):
-        topic = self.config["topic"]
-        conf = self.config.get(
+    def _get_conf(self):
+        return self.config.get(
             "conf",
             {
                 "bootstrap.servers": "localhost:9092",
@@ -14,10 +39,19 @@ class KafkaSource(DataSource):
                 "auto.offset.reset": "earliest",
             },
         )
+
+    def _create_consumer(self, conf):
+        # Tests can swap in an in-memory consumer with the same interface
+        consumer_factory = self.config.get("consumer_factory", Consumer)
+        return consumer_factory(conf)
+
+    def load(self):
+        topic = self.config["topic"]
+        conf = self._get_conf()
         # timeout = self.config.get("timeout", 10)  # seconds
         max_messages = self.config.get("max_messages", 1000)
 
-        consumer = Consumer(conf)
+        consumer = self._create_consumer(conf)
         consumer.subscribe([topic])
 
         messages = []
@@ -28,7 +62,7 @@ class KafkaSource(DataSource):
                 if msg is None:
                     break  # No more messages in timeout period
                 if msg.error():
-                    if msg.error().code() == KafkaException._PARTITION_EOF:
+                    if msg.error().code() == KafkaError._PARTITION_EOF:
                         break
                     else:
                         raise KafkaException(msg.error())
@@ -43,6 +77,67 @@ class KafkaSource(DataSource):
 
         return df
 
+    def stream(self, max_batches: int = None):
+        """
+        Consume the topic in micro-batches and flush each batch to a Parquet
+        partition that downstream ingestion can read.
+
+        Offsets are committed only after a batch has been written, so a crash
+        replays at most the unflushed batch (at-least-once delivery).
+
+        Config:
+            output_dir: dataset directory, e.g. "data/events.parquet";
+                batches land in ingest_date=YYYY-MM-DD/part-<uuid>.parquet
+            batch_size: messages per consume() call (default 10000)
+            batch_timeout: seconds to wait for a batch (default 1.0)
+            stop_when_idle: return once a consume() call comes back empty
+
+        Returns:
+            list of partition file paths written
+        """
+        topic = self.config["topic"]
+        output_dir = self.config["output_dir"]
+        batch_size = self.config.get("batch_size", 10_000)
+        batch_timeout = self.config.get("batch_timeout", 1.0)
+        stop_when_idle = self.config.get("stop_when_idle", True)
+
+        # Offsets are committed manually after each flush
+        conf = {**self._get_conf(), "enable.auto.commit": False}
+        consumer = self._create_consumer(conf)
+        consumer.subscribe([topic])
+        writer = ParquetSource()
+
+        partitions = []
+        try:
+            while max_batches is None or len(partitions) < max_batches:
+                messages = consumer.consume(num_messages=batch_size, timeout=batch_timeout)
+                payloads = []
+                for msg in messages:
+                    if msg.error():
+                        if msg.error().code() == KafkaError._PARTITION_EOF:
+                            continue
+                        raise KafkaException(msg.error())
+                    payloads.append(msg.value())
+
+                if not payloads:
+                    if stop_when_idle:
+                        break
+                    continue
+
+                df = decode_json_batch(payloads)
+                ingest_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+                path = os.path.join(
+                    output_dir, f"ingest_date={ingest_date}", f"part-{uuid.uuid4().hex}.parquet"
+                )
+                writer.write_flat_file(df, path)
+                consumer.commit(asynchronous=False)
+                partitions.append(path)
+                logging.info(f"Flushed {len(df)} Kafka records to {path}")
+        finally:
+            consumer.close()
+
+        return partitions
+
     def generate_sample_table(self):
         sample_df = super().generate_sample_table()
         print("Kafka source does not support writing sample data.")
@@ -1,50 +1,160 @@
-import boto3
+import os
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
 import pandas as pd
+from src.common.monitoring.logger import logging
 from src.common.sources.base_source import DataSource
 
 
 class KinesisSource(DataSource):
-    def load(self):
+    def _get_client(self):
+        if getattr(self, "_client", None) is None:
+            region_name = self.config.get("region_name", "us-east-1")
+            self._client = boto3.client("kinesis", region_name=region_name)
+        return self._client
+
+    def list_shards(self):
+        """Return the ids of every shard in the stream."""
+        client = self._get_client()
         stream_name = self.config["stream_name"]
-        region_name = self.config.get("region_name", "us-east-1")
-        shard_id = self.config.get("shard_id", "shardId-000000000000")
-        limit = self.config.get("limit", 1000)  # max records to fetch
+        shard_ids = []
+        kwargs = {"StreamName": stream_name}
+        while True:
+            response = client.list_shards(**kwargs)
+            shard_ids.extend(shard["ShardId"] for shard in response["Shards"])
+            if not response.get("NextToken"):
+                return shard_ids
+            # Pagination requests take the token instead of the stream name
+            kwargs = {"NextToken": response["NextToken"]}
 
-        client = boto3.client("kinesis", region_name=region_name)
+    def load_checkpoints(self) -> dict:
+        checkpoint_path = self.config.get("checkpoint_path")
+        if not checkpoint_path or not os.path.exists(checkpoint_path):
+            return {}
+        with open(checkpoint_path) as f:
+            return json.load(f)
 
-        # Get shard iterator
-        shard_iterator_response = client.get_shard_iterator(
-            StreamName=stream_name,
-            ShardId=shard_id,
-            ShardIteratorType="TRIM_HORIZON",  # or 'LATEST', 'AT_SEQUENCE_NUMBER', etc.
-        )
-        shard_iterator = shard_iterator_response["ShardIterator"]
+    def save_checkpoints(self, checkpoints: dict):
+        checkpoint_path = self.config.get("checkpoint_path")
+        if not checkpoint_path:
+            return
+        os.makedirs(os.path.dirname(checkpoint_path) or ".", exist_ok=True)
+        with open(checkpoint_path, "w") as f:
+            json.dump(checkpoints, f, indent=2)
 
-        records = []
-        while len(records) < limit and shard_iterator:
+    def _read_shard(self, shard_id, after_sequence_number=None):
+        """
+        Read one shard from its checkpoint (or the configured start position).
+
+        Returns:
+            (list of per-response DataFrames, last sequence number, malformed records)
+        """
+        client = self._get_client()
+        stream_name = self.config["stream_name"]
+        limit = self.config.get("limit", 1000)  # max records per shard
+        # GetRecords allows 5 calls per second per shard
+        poll_interval = self.config.get("poll_interval", 0.2)
+
+        if after_sequence_number:
+            iterator_kwargs = {
+                "ShardIteratorType": "AFTER_SEQUENCE_NUMBER",
+                "StartingSequenceNumber": after_sequence_number,
+            }
+        else:
+            iterator_kwargs = {
+                "ShardIteratorType": self.config.get("iterator_type", "TRIM_HORIZON")
+            }
+        shard_iterator = client.get_shard_iterator(
+            StreamName=stream_name, ShardId=shard_id, **iterator_kwargs
+        )["ShardIterator"]
+
+        frames, malformed = [], []
+        count, last_sequence_number = 0, after_sequence_number
+        while shard_iterator and count < limit:
             response = client.get_records(
-                ShardIterator=shard_iterator, Limit=limit - len(records)
+                ShardIterator=shard_iterator, Limit=min(10_000, limit - count)
             )
             shard_iterator = response.get("NextShardIterator")
+
+            records = []
             for record in response["Records"]:
-                # Assuming JSON data encoded in base64
-                data_str = (
-                    record["Data"].decode("utf-8")
-                    if isinstance(record["Data"], bytes)
-                    else record["Data"]
-                )
+                data = record["Data"]
                 try:
-                    data_json = json.loads(data_str)
-                    records.append(data_json)
-                except json.JSONDecodeError:
-                    # Skip or handle malformed record
-                    continue
+                    records.append(json.loads(data))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    malformed.append(
+                        {
+                            "shard_id": shard_id,
+                            "sequence_number": record["SequenceNumber"],
+                            "data": data,
+                        }
+                    )
+                last_sequence_number = record["SequenceNumber"]
+            if records:
+                frames.append(pd.DataFrame.from_records(records))
+            count += len(response["Records"])
+
             if not response["Records"]:
-                break  # No more records
+                # Caught up with the tip of the shard
+                if response.get("MillisBehindLatest", 0) == 0:
+                    break
+                # Empty pages while behind (e.g. across a gap in the shard):
+                # back off instead of spinning into the read throughput limit
+                time.sleep(poll_interval)
+
+        return frames, last_sequence_number, malformed
+
+    def load(self):
+        """
+        Read every shard concurrently, resuming from checkpointed sequence
+        numbers so reruns only return records that arrived since.
+
+        Config:
+            checkpoint_path: JSON file of the last sequence number per shard
+            poll_interval: seconds to wait after an empty page that is still
+                behind the tip of the shard (default 0.2)
+            max_workers: concurrent shard readers (default: one per shard, max 16)
+            on_malformed: "skip" (log and keep in self.malformed_records) or "raise"
+        """
+        # Only read the configured shard when one is given explicitly
+        shard_ids = (
+            [self.config["shard_id"]] if self.config.get("shard_id") else self.list_shards()
+        )
+        checkpoints = self.load_checkpoints()
+        max_workers = min(self.config.get("max_workers", 16), len(shard_ids)) or 1
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                executor.map(
+                    lambda shard_id: self._read_shard(shard_id, checkpoints.get(shard_id)),
+                    shard_ids,
+                )
+            )
+
+        frames = []
+        self.malformed_records = []
+        for shard_id, (shard_frames, last_sequence_number, malformed) in zip(
+            shard_ids, results
+        ):
+            frames.extend(shard_frames)
+            self.malformed_records.extend(malformed)
+            if last_sequence_number:
+                checkpoints[shard_id] = last_sequence_number
+
+        if self.malformed_records:
+            message = f"{len(self.malformed_records)} malformed Kinesis records"
+            if self.config.get("on_malformed", "skip") == "raise":
+                raise ValueError(message)
+            logging.warning(f"Skipped {message}")
 
-        df = pd.DataFrame(records)
-        return df
+        # Checkpoint only once every shard has been read successfully
+        self.save_checkpoints(checkpoints)
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True, copy=False)
 
     def generate_sample_table(self):
         sample_df = super().generate_sample_table()
@@ -1,6 +1,6 @@
 import pandas as pd
-from sqlalchemy import create_engine
 from src.common.sources.base_source import DataSource
+from src.common.sources.dev.sql_engines import get_engine, read_sql_frames
 
 
 class MySQLSource(DataSource):
@@ -15,10 +15,11 @@ class MySQLSource(DataSource):
         # Create connection string
         conn_str = f"mysql+pymysql://{user}:{password}@{host}:{port}/{database}"
 
-        engine = create_engine(conn_str)
-        with engine.connect() as conn:
-            df = pd.read_sql(query, conn)
-        return df
+        # partition_column/lower_bound/upper_bound/num_partitions split the
+        # query into key ranges read concurrently on pooled connections
+        engine = get_engine(conn_str)
+        frames = list(read_sql_frames(engine, query, self.config))
+        return pd.concat(frames, ignore_index=True, copy=False)
 
     def generate_sample_table(self):
         sample_df = super().generate_sample_table()
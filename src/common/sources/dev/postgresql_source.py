@@ -1,9 +1,14 @@
+import io
 import pandas as pd
-from sqlalchemy import create_engine
+from pandas.io.sql import get_schema
 from src.common.sources.base_source import DataSource
+from src.common.sources.dev.sql_engines import get_engine, read_sql_frames
 
 
 class PostgreSQLSource(DataSource):
+    # write_flat_file's path names a table, not a local file
+    atomic_writes = False
+
     def __init__(self, config):
         super().__init__(config)
         self.set_path_string()
@@ -11,34 +16,94 @@ class PostgreSQLSource(DataSource):
     def set_path_string(self):
         self.config["path"] = self.config["database"] + "." + self.config["table"]
 
-    def _get_engine(self):
+    def _get_dsn(self):
+        # An explicit URL (e.g. an SQLite stand-in for tests) wins over the parts
+        if self.config.get("url"):
+            return self.config["url"]
         user = self.config["user"]
         password = self.config["password"]
         host = self.config.get("host", "localhost")
         port = self.config.get("port", 5432)
         database = self.config["database"]
-        conn_str = f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{database}"
-        return create_engine(conn_str)
+        return f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{database}"
 
-    def _read(self):
-        engine = self._get_engine()
-        query = self.config["query"]
-        with engine.connect() as conn:
-            df = pd.read_sql(query, conn)
-        return df
+    def _get_engine(self):
+        return get_engine(self._get_dsn(), **self.config.get("engine_options", {}))
+
+    def _read(self, path: str = None):
+        chunks = list(self._read_chunks(path, self.config.get("chunksize", 50_000)))
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True, copy=False)
+
+    def _read_chunks(self, path: str = None, chunksize: int = 50_000):
+        """
+        Stream the query in chunks. stream_results uses a server-side (named)
+        cursor on PostgreSQL, so only one chunk of rows is held client-side
+        at a time.
 
-    def _write(self, df):
+        With a ``partition_column`` (plus optional ``lower_bound``,
+        ``upper_bound`` and ``num_partitions``) the query is split into key
+        ranges read concurrently on pooled connections instead.
+        """
+        yield from read_sql_frames(
+            self._get_engine(), self.config["query"], self.config, chunksize=chunksize
+        )
+
+    def _write(self, df, path: str = None):
         engine = self._get_engine()
         table = self.config["table"]
         if not table:
             raise ValueError("Missing required config key: 'table'")
         write_options = self.config.get("write_options", {})
-        df.to_sql(
-            table,
-            engine,
-            index=False,
-            if_exists=write_options.get("if_exists", "replace"),
-        )
+        if_exists = write_options.get("if_exists", "replace")
+        chunksize = write_options.get("chunksize", 100_000)
+
+        if engine.dialect.name != "postgresql":
+            # Stand-in databases without COPY get batched multi-row inserts
+            df.to_sql(
+                table,
+                engine,
+                index=False,
+                if_exists=if_exists,
+                method="multi",
+                chunksize=max(1, 30_000 // max(1, len(df.columns))),
+            )
+            return
+
+        # Create (or replace) the table from the frame's schema, then bulk
+        # load rows with COPY FROM STDIN in bounded CSV chunks. DDL is
+        # transactional in PostgreSQL, so both run in one transaction: a
+        # failed load leaves the previous table in place
+        preparer = engine.dialect.identifier_preparer
+        quoted_table = preparer.quote(table)
+        create_sql = get_schema(df.head(0), table, con=engine).strip()
+        ddl = [create_sql]
+        if if_exists == "replace":
+            ddl.insert(0, f"DROP TABLE IF EXISTS {quoted_table}")
+        elif if_exists == "append":
+            ddl = [create_sql.replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1)]
+        columns = ", ".join(preparer.quote(str(col)) for col in df.columns)
+        copy_sql = f"COPY {quoted_table} ({columns}) FROM STDIN WITH (FORMAT csv)"
+
+        raw_conn = engine.raw_connection()
+        try:
+            with raw_conn.cursor() as cursor:
+                for statement in ddl:
+                    cursor.execute(statement)
+                for start in range(0, len(df), chunksize):
+                    buffer = io.StringIO()
+                    df.iloc[start : start + chunksize].to_csv(
+                        buffer, index=False, header=False
+                    )
+                    buffer.seek(0)
+                    cursor.copy_expert(copy_sql, buffer)
+            raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
 
     def generate_sample_table(self):
         sample_df = super().generate_sample_table()
@@ -1,43 +1,127 @@
 import json
+from itertools import islice
+
 import pandas as pd
 import redis
 from src.common.sources.base_source import DataSource
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional
+    _json_loads = json.loads
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _unique(keys):
+    # SCAN may return a key more than once (e.g. across a rehash)
+    seen = set()
+    for key in keys:
+        if key not in seen:
+            seen.add(key)
+            yield key
+
 
 class RedisSource(DataSource):
+    # Rows are written to Redis keys; there is no local file to swap in
+    atomic_writes = False
+
+    def _get_client(self):
+        # A ready-made client (e.g. fakeredis) can be passed in the config
+        if self.config.get("client") is not None:
+            return self.config["client"]
+        if getattr(self, "_client", None) is None:
+            self._client = redis.Redis(
+                host=self.config.get("host", "localhost"),
+                port=self.config.get("port", 6379),
+                db=self.config.get("db", 0),
+                password=self.config.get("password", None),
+                decode_responses=self.config.get(
+                    "decode_responses", True
+                ),  # decode bytes to str
+            )
+        return self._client
+
     def load(self):
-        host = self.config.get("host", "localhost")
-        port = self.config.get("port", 6379)
-        db = self.config.get("db", 0)
-        password = self.config.get("password", None)
+        chunks = list(self.load_chunks())
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True, copy=False)
+
+    def load_chunks(self):
+        """
+        Yield DataFrames of up to ``batch_size * pipeline_depth`` keys.
+
+        Keys are walked with cursor-based SCAN (non-blocking, unlike KEYS) and
+        values fetched with MGET batches, several of which share one pipelined
+        round trip. Keys SCAN returns more than once are fetched only once.
+        """
+        client = self._get_client()
         pattern = self.config.get("pattern", "*")  # Key pattern to fetch
-        decode_responses = self.config.get(
-            "decode_responses", True
-        )  # decode bytes to str
-
-        client = redis.Redis(
-            host=host,
-            port=port,
-            db=db,
-            password=password,
-            decode_responses=decode_responses,
-        )
-
-        keys = client.keys(pattern)
-        records = []
-
-        for key in keys:
-            val = client.get(key)
-            try:
-                # Attempt to parse JSON string to dict
-                data = json.loads(val)
-                records.append(data)
-            except (json.JSONDecodeError, TypeError):
-                # Fallback: treat as raw string value
-                records.append({"key": key, "value": val})
-
-        df = pd.DataFrame(records)
-        return df
+        batch_size = self.config.get("batch_size", 1000)
+        pipeline_depth = self.config.get("pipeline_depth", 10)
+
+        keys = _unique(client.scan_iter(match=pattern, count=batch_size))
+        for key_group in _batched(keys, batch_size * pipeline_depth):
+            pipe = client.pipeline(transaction=False)
+            key_batches = list(_batched(key_group, batch_size))
+            for key_batch in key_batches:
+                pipe.mget(key_batch)
+            values = [value for batch in pipe.execute() for value in batch]
+
+            records = []
+            for key, val in zip(key_group, values):
+                if val is None:
+                    continue  # Key expired between SCAN and MGET
+                try:
+                    # Attempt to parse JSON string to dict
+                    data = _json_loads(val)
+                except (ValueError, TypeError):
+                    data = None
+                if isinstance(data, dict):
+                    records.append(data)
+                else:
+                    # Fallback: treat as raw string value
+                    records.append({"key": key, "value": val})
+            if records:
+                yield pd.DataFrame.from_records(records)
+
+    def _write(self, df, path: str = None):
+        """
+        Bulk-write one JSON value per row with pipelined SETs, so Redis can
+        serve as an online feature cache.
+
+        Config:
+            key_column: column holding each row's key (default: the index)
+            key_prefix: prepended to every key, e.g. "features:"
+            ttl: optional expiry in seconds
+        """
+        client = self._get_client()
+        key_column = self.config.get("key_column")
+        key_prefix = self.config.get("key_prefix", "")
+        ttl = self.config.get("ttl")
+        batch_size = self.config.get("batch_size", 1000)
+
+        ids = df[key_column] if key_column else df.index
+        keys = [f"{key_prefix}{key}" for key in ids]
+        # pandas' C serializer encodes all rows in one pass
+        payloads = df.to_json(orient="records", lines=True).splitlines()
+
+        for start in range(0, len(keys), batch_size):
+            pipe = client.pipeline(transaction=False)
+            batch = zip(keys[start : start + batch_size], payloads[start : start + batch_size])
+            if ttl:
+                for key, payload in batch:
+                    pipe.set(key, payload, ex=ttl)
+            else:
+                pipe.mset(dict(batch))
+            pipe.execute()
 
     def generate_sample_table(self):
         sample_df = super().generate_sample_table()
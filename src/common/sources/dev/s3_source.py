@@ -1,65 +1,334 @@
+import io
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 import boto3
 import pandas as pd
-import io
+import pyarrow.parquet as pq
 from src.common.sources.base_source import DataSource
 
+# S3 rejects multipart parts smaller than 5 MiB (except the last one)
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+
+# One client per credential set, shared by every source instance in the process
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_s3_client(
+    aws_access_key_id=None,
+    aws_secret_access_key=None,
+    aws_session_token=None,
+    region_name=None,
+):
+    """
+    Return the process-wide S3 client for a credential set, creating the
+    session and client on first use. boto3 clients are thread-safe, so the
+    ranged readers and multipart writers share one connection pool.
+    """
+    key = (aws_access_key_id, aws_secret_access_key, aws_session_token, region_name)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            session = boto3.Session(
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+                aws_session_token=aws_session_token,
+                region_name=region_name,
+            )
+            client = session.client("s3")
+            _clients[key] = client
+        return client
+
+
+def clear_s3_clients():
+    """Drop the cached clients, e.g. after rotating credentials."""
+    with _clients_lock:
+        _clients.clear()
+
+
+class S3RangeReader(io.RawIOBase):
+    """
+    Seekable, read-only file over an S3 object backed by ranged GETs.
+
+    Sequential reads (CSV/JSON parsing) keep ``max_workers`` part downloads
+    in flight ahead of the parser, so network transfer overlaps parsing and
+    at most ``max_workers + 1`` parts are buffered. Reads after a seek
+    (Parquet footers and column chunks) fetch just the bytes requested.
+    """
+
+    def __init__(self, client, bucket, key, part_size=DEFAULT_PART_SIZE, max_workers=8):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.max_workers = max_workers
+        self.size = client.head_object(Bucket=bucket, Key=key)["ContentLength"]
+        self._pos = 0
+        self._executor = None
+        self._pending = deque()  # (start, future) of parts ahead of self._pos
+        self._buffer, self._buffer_start = b"", 0
+
+    def _get_range(self, start, end):
+        """Fetch bytes [start, end) of the object."""
+        response = self.client.get_object(
+            Bucket=self.bucket, Key=self.key, Range=f"bytes={start}-{end - 1}"
+        )
+        return response["Body"].read()
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self._pos = max(0, offset)
+        return self._pos
+
+    def _reset_prefetch(self):
+        for _, future in self._pending:
+            future.cancel()
+        self._pending.clear()
+
+    def _fill_prefetch(self, start):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        next_start = self._pending[-1][0] + self.part_size if self._pending else start
+        while len(self._pending) < self.max_workers and next_start < self.size:
+            end = min(next_start + self.part_size, self.size)
+            future = self._executor.submit(self._get_range, next_start, end)
+            self._pending.append((next_start, future))
+            next_start = end
+
+    def readinto(self, b):
+        if self._pos >= self.size:
+            return 0
+        n = min(len(b), self.size - self._pos)
+
+        offset = self._pos - self._buffer_start
+        if not 0 <= offset < len(self._buffer):
+            if self._pending and self._pending[0][0] == self._pos:
+                # Continuing a sequential scan: take the next prefetched part
+                self._buffer_start, future = self._pending.popleft()
+                self._buffer = future.result()
+                self._fill_prefetch(self._pos)
+            elif n < self.part_size:
+                # Random access, e.g. a Parquet footer or column chunk
+                self._reset_prefetch()
+                self._buffer_start = self._pos
+                self._buffer = self._get_range(self._pos, self._pos + n)
+            else:
+                self._reset_prefetch()
+                self._fill_prefetch(self._pos)
+                self._buffer_start, future = self._pending.popleft()
+                self._buffer = future.result()
+                self._fill_prefetch(self._pos)
+            offset = 0
+
+        data = self._buffer[offset : offset + n]
+        b[: len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._reset_prefetch()
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+        super().close()
+
+
+class S3MultipartWriter(io.RawIOBase):
+    """
+    Write-only file that streams into an S3 multipart upload.
+
+    Data is cut into ``part_size`` parts uploaded concurrently; once
+    ``max_workers`` uploads are in flight writes block, so memory stays
+    bounded at roughly ``(max_workers + 1) * part_size``. Objects smaller
+    than one part are sent with a single PUT. A failed upload is aborted
+    so no orphaned parts are left behind.
+    """
+
+    def __init__(self, client, bucket, key, part_size=DEFAULT_PART_SIZE, max_workers=4):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.max_workers = max_workers
+        self._buffer = bytearray()
+        self._upload_id = None
+        self._executor = None
+        self._futures = []  # (part number, future returning the ETag)
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._buffer += b
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[: self.part_size])
+            del self._buffer[: self.part_size]
+            self._submit_part(part)
+        return len(b)
+
+    def _upload_part(self, part_number, data):
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        return response["ETag"]
+
+    def _submit_part(self, data):
+        if self._upload_id is None:
+            response = self.client.create_multipart_upload(Bucket=self.bucket, Key=self.key)
+            self._upload_id = response["UploadId"]
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        # Back-pressure: wait for the oldest in-flight part before queuing more
+        in_flight = [future for _, future in self._futures if not future.done()]
+        if len(in_flight) >= self.max_workers:
+            in_flight[0].result()
+        part_number = len(self._futures) + 1
+        self._futures.append((part_number, self._executor.submit(self._upload_part, part_number, data)))
+
+    def abort(self):
+        if self._upload_id is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+            )
+            self._upload_id = None
+        self._buffer.clear()
+        super().close()
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._upload_id is None:
+                self.client.put_object(Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer))
+            else:
+                if self._buffer:
+                    self._submit_part(bytes(self._buffer))
+                parts = [
+                    {"PartNumber": number, "ETag": future.result()}
+                    for number, future in self._futures
+                ]
+                self.client.complete_multipart_upload(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+                self._executor.shutdown(wait=True)
+                self._upload_id = None
+        except Exception:
+            self.abort()
+            raise
+        self._buffer.clear()
+        super().close()
+
 
 class S3Source(DataSource):
+    def _get_client(self):
+        # A ready-made client can be passed in the config
+        if self.config.get("client") is not None:
+            return self.config["client"]
+        return get_s3_client(
+            aws_access_key_id=self.config.get("aws_access_key_id"),
+            aws_secret_access_key=self.config.get("aws_secret_access_key"),
+            aws_session_token=self.config.get("aws_session_token"),
+            region_name=self.config.get("region_name"),
+        )
+
+    def open_reader(self) -> S3RangeReader:
+        return S3RangeReader(
+            self._get_client(),
+            self.config["bucket"],
+            self.config["key"],
+            part_size=self.config.get("part_size", DEFAULT_PART_SIZE),
+            max_workers=self.config.get("max_workers", 8),
+        )
+
+    def open_writer(self) -> S3MultipartWriter:
+        return S3MultipartWriter(
+            self._get_client(),
+            self.config["bucket"],
+            self.config["key"],
+            part_size=self.config.get("part_size", DEFAULT_PART_SIZE),
+            max_workers=self.config.get("max_workers", 4),
+        )
+
     def read(self):
-        bucket = self.config["bucket"]
-        key = self.config["key"]
-        aws_access_key_id = self.config.get("aws_access_key_id")
-        aws_secret_access_key = self.config.get("aws_secret_access_key")
-        aws_session_token = self.config.get("aws_session_token")
-        region_name = self.config.get("region_name")
+        """
+        Parse the object while it downloads in parallel byte ranges.
+
+        Config:
+            file_type: "csv", "json" or "parquet"
+            columns: for parquet, only the footer and these columns' chunks
+                are fetched
+            part_size: bytes per ranged GET / multipart part (default 8 MiB)
+            max_workers: concurrent ranged GETs (default 8)
+        """
         file_type = self.config.get("file_type", "csv")
         read_options = self.config.get("read_options", {})
 
-        session = boto3.Session(
-            aws_access_key_id=aws_access_key_id,
-            aws_secret_access_key=aws_secret_access_key,
-            aws_session_token=aws_session_token,
-            region_name=region_name,
-        )
-        s3 = session.client("s3")
-        obj = s3.get_object(Bucket=bucket, Key=key)
-        data = obj["Body"].read()
-
-        if file_type == "csv":
-            return pd.read_csv(io.BytesIO(data), **read_options)
-        elif file_type == "json":
-            return pd.read_json(io.BytesIO(data), **read_options)
-        else:
-            raise ValueError(f"Unsupported file_type: {file_type}")
+        with self.open_reader() as raw:
+            if file_type == "parquet":
+                parquet_file = pq.ParquetFile(raw)
+                return parquet_file.read(columns=self.config.get("columns")).to_pandas()
+            f = io.BufferedReader(raw, buffer_size=raw.part_size)
+            if file_type == "csv":
+                return pd.read_csv(f, **read_options)
+            elif file_type == "json":
+                return pd.read_json(f, **read_options)
+            else:
+                raise ValueError(f"Unsupported file_type: {file_type}")
 
     def write(self, df: pd.DataFrame):
-        bucket = self.config["bucket"]
-        key = self.config["key"]
+        """
+        Stream the frame into a multipart upload with bounded buffers,
+        instead of serializing it fully in memory before one PUT.
+        """
         file_type = self.config.get("file_type", "csv")
-        aws_access_key_id = self.config.get("aws_access_key_id")
-        aws_secret_access_key = self.config.get("aws_secret_access_key")
-        aws_session_token = self.config.get("aws_session_token")
-        region_name = self.config.get("region_name")
         write_options = self.config.get("write_options", {})  # e.g., index=False
 
-        session = boto3.Session(
-            aws_access_key_id=aws_access_key_id,
-            aws_secret_access_key=aws_secret_access_key,
-            aws_session_token=aws_session_token,
-            region_name=region_name,
-        )
-        s3 = session.client("s3")
-
-        buffer = io.BytesIO()
-        if file_type == "csv":
-            df.to_csv(buffer, **write_options)
-        elif file_type == "json":
-            df.to_json(buffer, **write_options)
-        else:
+        if file_type not in ("csv", "json", "parquet"):
             raise ValueError(f"Unsupported file_type: {file_type}")
 
-        buffer.seek(0)
-        s3.put_object(Bucket=bucket, Key=key, Body=buffer.getvalue())
+        writer = self.open_writer()
+        try:
+            if file_type == "parquet":
+                df.to_parquet(writer, **write_options)
+            else:
+                f = io.TextIOWrapper(
+                    io.BufferedWriter(writer, buffer_size=writer.part_size),
+                    encoding="utf-8",
+                    newline="",
+                )
+                if file_type == "csv":
+                    df.to_csv(f, **write_options)
+                else:
+                    df.to_json(f, **write_options)
+                # Detach rather than close, so a failed write is never completed
+                f.flush()
+                f.detach().detach()
+        except Exception:
+            writer.abort()
+            raise
+        writer.close()
 
     def generate_sample_table(self):
         sample_df = super().generate_sample_table()
@@ -0,0 +1,155 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+# One pooled engine per DSN, shared by every source instance in the process
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(dsn: str, **engine_options):
+    """
+    Return the process-wide pooled SQLAlchemy engine for ``dsn``, creating it
+    on first use. Connections are checked out of the engine's pool, so
+    repeated reads and writes reuse open connections.
+
+    Args:
+        dsn: SQLAlchemy connection URL
+        engine_options: create_engine options, only applied on first use
+    """
+    with _engines_lock:
+        engine = _engines.get(dsn)
+        if engine is None:
+            engine = create_engine(dsn, pool_pre_ping=True, **engine_options)
+            _engines[dsn] = engine
+        return engine
+
+
+def dispose_engines():
+    """Close every pooled connection, e.g. before forking worker processes."""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+def partition_bounds(lower_bound, upper_bound, num_partitions: int):
+    """
+    Split [lower_bound, upper_bound] into ``num_partitions`` equal strides,
+    as Spark's JDBC reader does. Numeric and date/datetime bounds are
+    supported.
+
+    Returns:
+        list of (start, end) pairs; the first start and the last end are
+        None, so rows outside the bounds still land in the edge partitions
+    """
+    if isinstance(lower_bound, (str, pd.Timestamp)) or hasattr(lower_bound, "isoformat"):
+        lower_bound, upper_bound = pd.Timestamp(lower_bound), pd.Timestamp(upper_bound)
+    if num_partitions < 1:
+        raise ValueError("num_partitions must be at least 1")
+    if upper_bound < lower_bound:
+        raise ValueError("upper_bound must not be smaller than lower_bound")
+
+    stride = (upper_bound - lower_bound) / num_partitions
+    edges = [lower_bound + stride * i for i in range(1, num_partitions)]
+    if isinstance(lower_bound, pd.Timestamp):
+        edges = [edge.to_pydatetime() for edge in edges]
+    starts = [None] + edges
+    ends = edges + [None]
+    return list(zip(starts, ends))
+
+
+def read_sql_partitioned(
+    engine,
+    query: str,
+    partition_column: str,
+    lower_bound=None,
+    upper_bound=None,
+    num_partitions: int = 4,
+    max_workers: int = None,
+):
+    """
+    Read ``query`` as ``num_partitions`` key-range slices run concurrently,
+    each on its own pooled connection.
+
+    Bounds only decide the stride, they do not filter: rows below the lower
+    bound (and NULL keys) go to the first slice, rows above the upper bound
+    to the last. Missing bounds are looked up with MIN/MAX on the query.
+
+    Yields:
+        one DataFrame per partition, in key order
+    """
+    query = query.strip().rstrip(";")
+    column = engine.dialect.identifier_preparer.quote(partition_column)
+    subquery = f"({query}) AS _partitioned"
+
+    if lower_bound is None or upper_bound is None:
+        with engine.connect() as conn:
+            row = conn.execute(text(f"SELECT MIN({column}), MAX({column}) FROM {subquery}")).one()
+        if row[0] is None:  # empty result
+            num_partitions = 1
+        lower_bound = row[0] if lower_bound is None else lower_bound
+        upper_bound = row[1] if upper_bound is None else upper_bound
+
+    if lower_bound is None:
+        slices = [(None, None)]
+    else:
+        slices = partition_bounds(lower_bound, upper_bound, num_partitions)
+
+    def read_slice(bounds):
+        start, end = bounds
+        predicates, params = [], {}
+        if start is not None:
+            predicates.append(f"{column} >= :start")
+            params["start"] = start
+        if end is not None:
+            predicates.append(f"{column} < :end")
+            params["end"] = end
+        where = " AND ".join(predicates) or "1 = 1"
+        if start is None:
+            where = f"({where}) OR {column} IS NULL"
+        with engine.connect() as conn:
+            return pd.read_sql(text(f"SELECT * FROM {subquery} WHERE {where}"), conn, params=params)
+
+    max_workers = min(max_workers or len(slices), len(slices))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # map yields in submission order, so frames arrive in key order
+        yield from executor.map(read_slice, slices)
+
+
+def read_sql_frames(engine, query: str, config: dict, chunksize: int = None):
+    """
+    Run ``query`` through a partitioned read when the source config names a
+    ``partition_column`` (with optional ``lower_bound``, ``upper_bound``,
+    ``num_partitions`` and ``max_workers``), otherwise on a single cursor.
+
+    Yields:
+        DataFrames of at most ``chunksize`` rows (one frame when None)
+    """
+    if config.get("partition_column"):
+        frames = read_sql_partitioned(
+            engine,
+            query,
+            config["partition_column"],
+            lower_bound=config.get("lower_bound"),
+            upper_bound=config.get("upper_bound"),
+            num_partitions=config.get("num_partitions", 4),
+            max_workers=config.get("max_workers"),
+        )
+        for frame in frames:
+            if not chunksize:
+                yield frame
+                continue
+            for start in range(0, len(frame), chunksize):
+                yield frame.iloc[start : start + chunksize].reset_index(drop=True)
+        return
+
+    with engine.connect().execution_options(
+        stream_results=True, max_row_buffer=chunksize or 1000
+    ) as conn:
+        if chunksize:
+            yield from pd.read_sql(text(query), conn, chunksize=chunksize)
+        else:
+            yield pd.read_sql(text(query), conn)
@@ -1,20 +1,27 @@
 import pandas as pd
-from sqlalchemy import create_engine
 from src.common.sources.base_source import DataSource
+from src.common.sources.dev.sql_engines import get_engine, read_sql_frames
 
 
 class SQLSource(DataSource):
     def load(self):
+        """
+        Config:
+            partition_column: numeric or date column to split the query on;
+                with lower_bound, upper_bound and num_partitions the slices
+                are read concurrently on pooled connections
+        """
         connection_uri = self.config["connection_uri"]
         query = self.config["query"]
-        engine = create_engine(connection_uri)
-        return pd.read_sql(query, engine)
+        engine = get_engine(connection_uri)
+        frames = list(read_sql_frames(engine, query, self.config))
+        return pd.concat(frames, ignore_index=True, copy=False)
 
     def generate_sample_table(self):
         sample_df = super().generate_sample_table()
         connection_uri = self.config["connection_uri"]
         table_name = self.config.get("table_name", "sample_table")
-        engine = create_engine(connection_uri)
+        engine = get_engine(connection_uri)
 
         # Write the sample DataFrame to the SQL database
         sample_df.to_sql(table_name, engine, if_exists="replace", index=False)
@@ -0,0 +1,41 @@
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+from src.common.sources.base_source import DataSource
+from src.common.sources.parquet_source import (
+    build_filter_expression,
+    iter_dataset_frames,
+)
+
+
+class FeatherSource(DataSource):
+    def _read(self, path: str, columns=None, filters=None):
+        options = self.config.get("options", {})
+        columns = columns or options.get("columns")
+        filters = filters or options.get("filters")
+
+        # Feather (Arrow IPC) files are memory-mapped, so unselected columns
+        # and filtered-out record batches are never materialized
+        dataset = ds.dataset(path, format="feather")
+        table = dataset.to_table(
+            columns=columns, filter=build_filter_expression(filters)
+        )
+        return table.to_pandas()
+
+    def _read_chunks(self, path: str, chunksize: int, columns=None, filters=None):
+        options = self.config.get("options", {})
+        dataset = ds.dataset(path, format="feather")
+        yield from iter_dataset_frames(
+            dataset,
+            chunksize,
+            columns=columns or options.get("columns"),
+            filters=filters or options.get("filters"),
+        )
+
+    def _write(self, df, path: str):
+        options = self.config.get("write_options", {})
+        feather.write_feather(df.reset_index(drop=True), path, **options)
+
+    def generate_sample_table(self):
+        sample_df = super().generate_sample_table()
+        self.write(sample_df)
+        return sample_df
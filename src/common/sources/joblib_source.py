@@ -1,13 +1,152 @@
+import os
+import json
+import pickle
+import types
+from fnmatch import fnmatch
+
 import joblib
+import numpy as np
+import pandas as pd
 from src.common.sources.base_source import DataSource
 
+# Artifacts whose NumPy buffers total at least this many bytes are stored
+# uncompressed so they can be memory-mapped on load
+DEFAULT_MMAP_THRESHOLD = 16 * 1024**2
+
+_SCALARS = (str, bytes, bytearray, int, float, complex, bool, type(None), np.generic)
+_OPAQUE = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def numpy_buffer_bytes(obj) -> int:
+    """
+    Total size of the numeric NumPy arrays reachable from ``obj`` (tree node
+    arrays, fitted coefficients, DataFrame blocks, ...). Containers and the
+    reduced state pickle would save (``__reduce_ex__``) are walked; nothing
+    is serialized or copied.
+    """
+    total = 0
+    seen = set()
+    keep_alive = []  # reduced states must outlive their id()
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _SCALARS + _OPAQUE):
+            continue
+        seen.add(id(item))
+        keep_alive.append(item)
+        if isinstance(item, np.ndarray):
+            # Object arrays are pickled element by element, not as a buffer
+            if item.dtype != object:
+                total += item.nbytes
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        else:
+            # What pickle would serialize: (constructor, args, state, ...)
+            try:
+                stack.append(item.__reduce_ex__(5))
+            except Exception:
+                continue
+    return total
+
+
+def is_compressed(path: str) -> bool:
+    """Uncompressed joblib files are plain pickles and start with the PROTO opcode."""
+    with open(path, "rb") as f:
+        return f.read(1) != pickle.PROTO
+
+
+def artifact_sidecar_path(path: str) -> str:
+    return f"{path}.mmap.json"
+
+
+def artifact_mmap_mode(path: str):
+    """
+    The mmap mode recorded for a file written in artifact mode, or None for
+    any other file (or once the file has been rewritten by something else).
+    """
+    sidecar_path = artifact_sidecar_path(path)
+    if not os.path.exists(sidecar_path):
+        return None
+    with open(sidecar_path) as f:
+        marker = json.load(f)
+    stat = os.stat(path)
+    if (stat.st_size, stat.st_mtime_ns) != (marker["file_size"], marker["file_mtime_ns"]):
+        return None
+    return marker["mmap_mode"]
+
 
 class JoblibSource(DataSource):
+    """
+    Config:
+        compress: explicit compression level (0-9), overrides the policy
+        compress_policy: {filename glob: level}, e.g. {"model_*.joblib": 0,
+            "pre_proc.joblib": 3}; first match wins
+        mmap_threshold: without an explicit level, artifacts (models,
+            arrays) holding at least this many bytes of NumPy buffers are
+            stored uncompressed (default 16 MiB) and everything else with
+            level 3. pandas objects are data, not artifacts: they only
+            enter artifact mode through a compress_policy level of 0
+        mmap_mode: how files are loaded. By default only artifacts that the
+            policy or threshold stored uncompressed ("artifact mode") are
+            memory-mapped, read-only ("r"), so worker processes loading the
+            same model share one copy through the page cache; everything
+            else, e.g. ingested DataFrames, loads as ordinary writable
+            objects. Set it to force a mode ("r", "c", ...) or None.
+    """
+
     def _read(self, path: str):
-        return joblib.load(path)
+        if "mmap_mode" in self.config:
+            mmap_mode = self.config["mmap_mode"]
+        else:
+            mmap_mode = artifact_mmap_mode(path)
+        # mmap_mode has no effect (beyond a warning) on compressed files
+        if mmap_mode and is_compressed(path):
+            mmap_mode = None
+        return joblib.load(path, mmap_mode=mmap_mode)
+
+    def _resolve_compression(self, obj, path: str):
+        """(level, whether the policy chose artifact mode) for one artifact."""
+        if self.config.get("compress") is not None:
+            return self.config["compress"], False
+        name = os.path.basename(path)
+        for pattern, level in self.config.get("compress_policy", {}).items():
+            if fnmatch(name, pattern):
+                return level, level == 0
+        threshold = self.config.get("mmap_threshold", DEFAULT_MMAP_THRESHOLD)
+        # Frames loaded memory-mapped would be read-only, so they stay compressed
+        is_frame = isinstance(obj, (pd.DataFrame, pd.Series))
+        if not is_frame and numpy_buffer_bytes(obj) >= threshold:
+            return 0, True
+        return 3, False
+
+    def compression_for(self, obj, path: str) -> int:
+        """Resolve the compression level for one artifact."""
+        return self._resolve_compression(obj, path)[0]
+
+    def write_flat_file(self, obj, path: str = None):
+        # Resolve against the final name: the atomic write goes through a
+        # temp name that the policy globs would not match
+        compress, artifact = self._resolve_compression(obj, path)
+        result = super().write_flat_file(obj, path, compress=compress)
+
+        sidecar_path = artifact_sidecar_path(path)
+        if artifact:
+            stat = os.stat(path)
+            with open(f"{sidecar_path}.tmp", "w") as f:
+                json.dump(
+                    {"mmap_mode": "r", "file_size": stat.st_size, "file_mtime_ns": stat.st_mtime_ns},
+                    f,
+                )
+            os.replace(f"{sidecar_path}.tmp", sidecar_path)
+        elif os.path.exists(sidecar_path):
+            os.remove(sidecar_path)
+        return result
 
-    def _write(self, obj, path: str):
-        compress = self.config.get("compress", 3)  # default: moderate compression
+    def _write(self, obj, path: str, compress: int = None):
+        if compress is None:
+            compress = self.compression_for(obj, path)
         protocol = self.config.get("protocol", None)  # default: latest
         print(
             f"Saving joblib object to: {path} (compress={compress}, protocol={protocol})"
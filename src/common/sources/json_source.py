@@ -1,19 +1,101 @@
+import io
+from contextlib import nullcontext
+from dataclasses import replace
+from itertools import islice
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.json as pa_json
 from src.common.sources.base_source import DataSource
+from src.common.sources.compression import compressed_handle, split_compression
 
 
 class JSONSource(DataSource):
+    schema_sidecar = True
+
     def __init__(self, config: dict = None):
         # Default configuration
         default_config = {
             "path": None,
             "options": {"orient": "records"},
             "lines": False,
+            # "pyarrow": NDJSON parsed by pyarrow.json, written in streamed chunks
+            "engine": "pandas",
         }
         # Merge defaults with user config (if provided)
         self.config = {**default_config, **(config or {})}
 
-    def _read(self, path: str):
+    @staticmethod
+    def _schema_read_options(schema=None):
+        """Disable pandas type inference when a schema sidecar is applied."""
+        if schema is None:
+            return {}
+        return {
+            "dtype": False,
+            "convert_dates": list(schema.datetime_columns),
+            "keep_default_dates": False,
+        }
+
+    def _uses_arrow(self) -> bool:
+        config = self.config or {}
+        if config.get("engine", "pandas") != "pyarrow":
+            return False
+        if not config.get("lines", False):
+            raise ValueError("The pyarrow JSON engine requires 'lines': True in the config")
+        return True
+
+    def _arrow_parse_options(self, schema=None):
+        """
+        Parse with an explicit schema so no column is type-inferred twice:
+        the config ``schema`` (column -> Arrow type alias, e.g.
+        {"pm25": "float32"}) overrides the sidecar schema.
+        """
+        fields = {f.name: f.type for f in schema.arrow_schema()} if schema else {}
+        for col, dtype in (self.config.get("schema") or {}).items():
+            fields[col] = pa.type_for_alias(dtype)
+        return pa_json.ParseOptions(
+            explicit_schema=pa.schema(list(fields.items())) if fields else None,
+            unexpected_field_behavior="infer",
+        )
+
+    def _arrow_schema_overrides(self, schema=None):
+        """Drop columns typed by the config ``schema`` from the sidecar schema."""
+        overrides = self.config.get("schema") or {}
+        if schema is None or not overrides:
+            return schema
+        return replace(
+            schema,
+            dtypes={k: v for k, v in schema.dtypes.items() if k not in overrides},
+            categories={k: v for k, v in schema.categories.items() if k not in overrides},
+            datetime_columns=[c for c in schema.datetime_columns if c not in overrides],
+        )
+
+    @staticmethod
+    def _open_arrow_stream(path: str):
+        # Arrow decompresses natively, without a Python-level stream in between
+        return pa.input_stream(path, compression=split_compression(path)[1])
+
+    def _read_arrow(self, path: str, schema=None):
+        parse_options = self._arrow_parse_options(schema)
+        with self._open_arrow_stream(path) as f:
+            table = pa_json.read_json(f, parse_options=parse_options)
+        schema = self._arrow_schema_overrides(schema)
+        df = table.to_pandas()
+        return schema.apply(df) if schema is not None else df
+
+    def _read_arrow_chunks(self, path: str, chunksize: int, schema=None):
+        parse_options = self._arrow_parse_options(schema)
+        schema = self._arrow_schema_overrides(schema)
+        with io.BufferedReader(self._open_arrow_stream(path)) as f:
+            while lines := list(islice(f, chunksize)):
+                table = pa_json.read_json(io.BytesIO(b"".join(lines)), parse_options=parse_options)
+                if parse_options.explicit_schema is None:
+                    # Pin the first chunk's types for the rest of the stream
+                    parse_options.explicit_schema = table.schema
+                df = table.to_pandas()
+                yield schema.apply(df) if schema is not None else df
+
+    def _read(self, path: str, schema=None):
         # Ensure config is at least an empty dict
         config = self.config or {}
 
@@ -24,15 +106,53 @@ class JSONSource(DataSource):
                 "Path must be provided either in method argument or config."
             )
 
+        if self._uses_arrow():
+            return self._read_arrow(path, schema)
+
         # Get options safely
-        options = config.get("options", {})
+        options = {**self._schema_read_options(schema), **config.get("options", {})}
         lines = config.get("lines", False)
 
-        return pd.read_json(path, lines=lines, **options)
+        with compressed_handle(path, "rt") as f:
+            df = pd.read_json(f, lines=lines, **options)
+        return schema.apply(df) if schema is not None else df
+
+    def _read_chunks(self, path: str, chunksize: int, schema=None):
+        config = self.config or {}
+        if self._uses_arrow():
+            yield from self._read_arrow_chunks(path, chunksize, schema)
+            return
+        options = {**self._schema_read_options(schema), **config.get("options", {})}
+
+        # pandas can only stream newline-delimited records
+        if not config.get("lines", False):
+            raise ValueError("Chunked JSON reads require 'lines': True in the config")
+
+        with compressed_handle(path, "rt") as f:
+            with pd.read_json(f, lines=True, chunksize=chunksize, **options) as reader:
+                for chunk in reader:
+                    yield schema.apply(chunk) if schema is not None else chunk
+
+    def _write_ndjson(self, df, path: str):
+        """
+        Stream rows out as NDJSON in ``chunksize``-row slices, each encoded
+        by pandas' C serializer, so only one slice is held as text at once.
+        Datetimes are written as ISO strings that pyarrow.json parses back.
+        """
+        chunksize = self.config.get("chunksize", 100_000)
+        with compressed_handle(path, "wt", self.config) as f:
+            with open(f, "w", encoding="utf-8") if isinstance(f, str) else nullcontext(f) as f:
+                for start in range(0, len(df), chunksize):
+                    text = df.iloc[start : start + chunksize].to_json(
+                        orient="records", lines=True, date_format="iso", date_unit="ns"
+                    )
+                    f.write(text if text.endswith("\n") else text + "\n")
 
     def _write(self, df, path: str):
         # Ensure config is at least an empty dict
         config = self.config or {}
+        if self._uses_arrow():
+            return self._write_ndjson(df, path)
         options = config.get("write_options", {}).copy()
         lines = config.get("lines", False)
         # Use orient from options if present, else default
@@ -44,7 +164,8 @@ class JSONSource(DataSource):
             options.pop("index", None)
 
         # Pass orient explicitly once, and unpack other options
-        df.to_json(path, orient=orient, lines=lines, **options)
+        with compressed_handle(path, "wt", self.config) as f:
+            df.to_json(f, orient=orient, lines=lines, **options)
 
     def generate_sample_table(self):
         sample_df = super().generate_sample_table()
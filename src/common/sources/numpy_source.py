@@ -0,0 +1,45 @@
+import os
+import json
+import numpy as np
+from scipy.sparse import csr_matrix
+from src.common.sources.base_source import DataSource
+
+
+class NumpySource(DataSource):
+    """Dense arrays stored as .npy and reopened memory-mapped."""
+
+    def _read(self, path: str):
+        # Read-only memory maps let joblib workers share pages without copies
+        mmap_mode = self.config.get("mmap_mode", "r")
+        return np.load(path, mmap_mode=mmap_mode, allow_pickle=False)
+
+    def _write(self, arr, path: str):
+        np.save(path, np.asarray(arr), allow_pickle=False)
+
+
+class SparseSource(DataSource):
+    """
+    CSR matrices stored as a directory of component .npy arrays
+    (data, indices, indptr) plus their shape, so each component can be
+    memory-mapped on read. scipy's .npz is a zip archive and cannot be.
+    """
+
+    components = ("data", "indices", "indptr")
+
+    def _read(self, path: str):
+        mmap_mode = self.config.get("mmap_mode", "r")
+        arrays = [
+            np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in self.components
+        ]
+        with open(os.path.join(path, "shape.json")) as f:
+            shape = tuple(json.load(f))
+        return csr_matrix(tuple(arrays), shape=shape, copy=False)
+
+    def _write(self, matrix, path: str):
+        matrix = csr_matrix(matrix)
+        os.makedirs(path, exist_ok=True)
+        for name in self.components:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(matrix, name))
+        with open(os.path.join(path, "shape.json"), "w") as f:
+            json.dump(list(matrix.shape), f)
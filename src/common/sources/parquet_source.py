@@ -0,0 +1,114 @@
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from src.common.sources.base_source import DataSource
+
+
+def build_filter_expression(filters):
+    """
+    Convert simple filter expressions into a pyarrow dataset expression.
+
+    Args:
+        filters: list of (column, op, value) tuples combined with AND, or a
+            list of such lists combined with OR (the pyarrow DNF format), e.g.
+            [("region", "==", "north"), ("pm25", ">", 35)]
+
+    Returns:
+        pyarrow.dataset.Expression or None when no filters are given
+    """
+    if not filters:
+        return None
+    if isinstance(filters, ds.Expression):
+        return filters
+    return pq.filters_to_expression(filters)
+
+
+def open_dataset(path, filesystem=None, file_format: str = "parquet"):
+    """
+    Open a file or hive-partitioned directory as a pyarrow dataset.
+
+    Parquet fragments pre-buffer their reads: the column chunks a scan
+    needs are fetched as a few coalesced ranged reads, so on remote
+    filesystems only the footers and the projected, unpruned column chunks
+    are downloaded.
+
+    Parquet files written at different times (e.g. streamed micro-batches)
+    may disagree on their schemas: a column that was int64 in one file and
+    double in the next, or fields only later files have. The dataset schema
+    is then the permissive union of every file's schema, so older files
+    are cast up on read and missing fields come back null, instead of the
+    first file's schema being applied to all of them.
+
+    Args:
+        path: file or directory path on ``filesystem``
+        filesystem: a ``pyarrow.fs.FileSystem`` (local when None)
+        file_format: "parquet", "feather"/"ipc" or "csv"
+    """
+    unify = file_format == "parquet"
+    if file_format == "parquet":
+        file_format = ds.ParquetFileFormat(
+            default_fragment_scan_options=ds.ParquetFragmentScanOptions(pre_buffer=True)
+        )
+    dataset = ds.dataset(path, filesystem=filesystem, format=file_format, partitioning="hive")
+    if not unify:
+        return dataset
+
+    fragment_schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+    # Partition fields only exist in the dataset schema, so it goes first
+    schema = pa.unify_schemas([dataset.schema, *fragment_schemas], promote_options="permissive")
+    if schema.equals(dataset.schema):
+        return dataset
+    return ds.dataset(
+        path, schema=schema, filesystem=filesystem, format=file_format, partitioning="hive"
+    )
+
+
+def iter_dataset_frames(dataset, chunksize, columns=None, filters=None):
+    """
+    Yield DataFrames of at most ``chunksize`` rows from a pyarrow dataset.
+    """
+    batches = dataset.to_batches(
+        columns=columns,
+        filter=build_filter_expression(filters),
+        batch_size=chunksize,
+    )
+    for batch in batches:
+        # Filtering can leave whole batches empty
+        if batch.num_rows:
+            yield batch.to_pandas()
+
+
+class ParquetSource(DataSource):
+    def _read(self, path: str, columns=None, filters=None):
+        options = self.config.get("options", {})
+        columns = columns or options.get("columns")
+        filters = filters or options.get("filters")
+
+        # Paths may be single files or hive-partitioned dataset directories.
+        # Row groups whose min/max statistics cannot satisfy the filter are
+        # skipped by the dataset scanner, and only projected columns are decoded
+        dataset = open_dataset(path)
+        table = dataset.to_table(
+            columns=columns, filter=build_filter_expression(filters)
+        )
+        return table.to_pandas()
+
+    def _read_chunks(self, path: str, chunksize: int, columns=None, filters=None):
+        options = self.config.get("options", {})
+        dataset = open_dataset(path)
+        yield from iter_dataset_frames(
+            dataset,
+            chunksize,
+            columns=columns or options.get("columns"),
+            filters=filters or options.get("filters"),
+        )
+
+    def _write(self, df, path: str):
+        # Smaller row groups give the reader finer-grained statistics to prune on
+        options = {"row_group_size": 100_000, **self.config.get("write_options", {})}
+        df.to_parquet(path, index=False, **options)
+
+    def generate_sample_table(self):
+        sample_df = super().generate_sample_table()
+        self.write(sample_df)
+        return sample_df
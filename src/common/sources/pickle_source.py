@@ -1,15 +1,18 @@
 import pandas as pd
 from src.common.sources.base_source import DataSource
+from src.common.sources.compression import compressed_handle
 
 
 class PickleSource(DataSource):
     def _read(self, path: str):
         options = self.config.get("options", {})
-        return pd.read_pickle(path, **options)
+        with compressed_handle(path, "rb") as f:
+            return pd.read_pickle(f, **options)
 
     def _write(self, df, path: str):
         options = self.config.get("write_options", {})
-        df.to_pickle(path, **options)
+        with compressed_handle(path, "wb", self.config) as f:
+            df.to_pickle(f, **options)
 
     def generate_sample_table(self):
         sample_df = super().generate_sample_table()
@@ -1,10 +1,14 @@
 import os
 from enum import Enum
 
+from src.common.sources.compression import split_compression
 from src.common.sources.csv_source import CSVSource
 from src.common.sources.json_source import JSONSource
 from src.common.sources.joblib_source import JoblibSource
 from src.common.sources.pickle_source import PickleSource
+from src.common.sources.parquet_source import ParquetSource
+from src.common.sources.feather_source import FeatherSource
+from src.common.sources.numpy_source import NumpySource, SparseSource
 
 # from common.sources.sql_source import SQLSource
 # from common.sources.api_source import APISource
@@ -16,6 +20,10 @@ class SourceClassMap(Enum):
     JSON = ("json", JSONSource)
     JOBLIB = ("joblib", JoblibSource)
     PICKLE = ("pkl", PickleSource)
+    PARQUET = ("parquet", ParquetSource)
+    FEATHER = ("feather", FeatherSource)
+    NUMPY = ("npy", NumpySource)
+    SPARSE = ("csr", SparseSource)
 
     def __init__(self, ext, cls):
         self.ext = ext
@@ -24,6 +32,8 @@ class SourceClassMap(Enum):
     @classmethod
     def from_path(cls, filepath: str):
         """Return enum member based on file filepath."""
+        # Look through compression suffixes, e.g. raw.csv.zst -> csv
+        filepath = split_compression(filepath)[0]
         ext = os.path.splitext(filepath)[-1].lower().lstrip(".")
 
         for member in cls:
@@ -34,7 +44,7 @@ class SourceClassMap(Enum):
     @classmethod
     def from_extension(cls, ext: str):
         """Return enum member based on file extension."""
-        ext = ext.lower()
+        ext = split_compression(ext.lower())[0].lstrip(".")
         for member in cls:
             if member.ext == ext:
                 return member
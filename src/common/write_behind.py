@@ -0,0 +1,118 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from src.common.monitoring.logger import logging
+
+
+class WriteBehindQueue:
+    """
+    Background executor for flat-file writes.
+
+    Writes to the same path run in submission order; writes to different
+    paths run concurrently. Each write returns a Future, and ``wait(path)``
+    / ``flush()`` give ordering guarantees: a read that waits on a path
+    sees the latest submitted write, or gets its error. Combined with the
+    sources' atomic temp-file-and-rename writes, readers never observe a
+    partial file.
+
+    The error of a path's latest write is kept until ``wait`` or ``flush``
+    has raised it (or a later write to the path succeeds), so it surfaces
+    however long after the failure the path is waited on.
+
+    Callers must not modify an object in place after submitting it.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._executor = None
+        self._pending = {}  # abspath -> latest Future for that path
+        self._failed = {}  # abspath -> error of its latest write, not yet raised
+        self._lock = threading.Lock()
+
+    def submit(self, path: str, write_fn, *args, **kwargs):
+        """Queue ``write_fn(*args, **kwargs)`` as the next write to ``path``."""
+        key = os.path.abspath(path)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="write-behind"
+                )
+            previous = self._pending.get(key)
+            # The Future does not exist before submit() returns, so _run
+            # identifies its write by this token instead
+            token = object()
+            future = self._executor.submit(
+                self._run, key, token, previous, write_fn, args, kwargs
+            )
+            future.token = token
+            self._pending[key] = future
+        return future
+
+    def _run(self, key, token, previous, write_fn, args, kwargs):
+        if previous is not None:
+            # Earlier writes to the path were submitted (so dequeued) first,
+            # so waiting on them cannot deadlock the pool
+            wait([previous])
+        try:
+            result = write_fn(*args, **kwargs)
+        except Exception as e:
+            logging.error(f"Background write to {key} failed: {e}")
+            self._finish(key, token, e)
+            raise
+        self._finish(key, token, None)
+        return result
+
+    def _finish(self, key, token, error):
+        # Runs before the Future completes: once a waiter sees it done, the
+        # outcome is already recorded
+        with self._lock:
+            latest = self._pending.get(key)
+            if latest is not None and getattr(latest, "token", None) is not token:
+                # A newer write to the path is queued and decides its outcome;
+                # remember the failure only until then
+                if error is not None:
+                    self._failed.setdefault(key, error)
+                return
+            self._pending.pop(key, None)
+            if error is None:
+                self._failed.pop(key, None)
+            else:
+                self._failed[key] = error
+
+    def wait(self, path: str):
+        """
+        Block until every queued write to ``path`` has finished, and raise
+        the error of the latest one if it failed, so a reader never mistakes
+        the previous file for the one it is waiting on.
+        """
+        key = os.path.abspath(path)
+        with self._lock:
+            future = self._pending.get(key)
+        if future is not None:
+            wait([future])
+        with self._lock:
+            error = self._failed.pop(key, None)
+        if error is not None:
+            raise error
+
+    def flush(self):
+        """
+        Block until every queued write has finished, then raise the first
+        error among the paths whose writes failed and were not yet raised.
+        """
+        while True:
+            with self._lock:
+                futures = list(self._pending.values())
+            if not futures:
+                break
+            wait(futures)
+
+        with self._lock:
+            failed, self._failed = list(self._failed.values()), {}
+        if failed:
+            raise failed[0]
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
@@ -0,0 +1,132 @@
+import os
+import json
+import shutil
+import hashlib
+import uuid
+
+import pandas as pd
+
+from src.common.monitoring.logger import logging
+
+# Bump when the EDA outputs change shape, so stale entries stop matching
+EDA_CACHE_VERSION = 1
+
+RESULT_FILE = "result.json"
+
+
+def eda_fingerprint(data, settings: dict = None) -> str:
+    """
+    Content fingerprint of the data an EDA run is computed from, plus the
+    settings that affect its outputs.
+
+    Args:
+        data: DataFrame, or anything with a ``fingerprint()`` method (e.g.
+            a DataProfile)
+        settings: EDA settings to include in the key
+    """
+    digest = hashlib.sha256()
+    digest.update(repr((EDA_CACHE_VERSION, sorted((settings or {}).items()))).encode())
+    if isinstance(data, pd.DataFrame):
+        digest.update(pd.util.hash_pandas_object(data, index=False).values.tobytes())
+        digest.update(repr([(str(col), str(dtype)) for col, dtype in data.dtypes.items()]).encode())
+    else:
+        digest.update(data.fingerprint().encode())
+    return digest.hexdigest()
+
+
+def publish_file(src: str, dst: str):
+    """
+    Make ``src`` visible at ``dst``, replacing any previous file atomically.
+    Hard links avoid copying; copies are the fallback across filesystems.
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return
+    tmp = os.path.join(os.path.dirname(dst), f".tmp-{uuid.uuid4().hex[:8]}-{os.path.basename(dst)}")
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+    try:
+        os.replace(tmp, dst)
+    finally:
+        # rename() is a no-op when both names are links to the same file
+        if os.path.lexists(tmp):
+            os.unlink(tmp)
+
+
+class EDACache:
+    """
+    On-disk cache of EDA results keyed by content fingerprint.
+
+    Every entry is a directory named after the fingerprint, holding the
+    rendered PNGs and a result.json with the head, shape and summary HTML
+    and the image file names. Entries are least recently used first out
+    once the cache grows beyond ``max_bytes``; a hit refreshes the
+    result.json mtime, which is the recency order.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 256 * 1024**2):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def get(self, key: str):
+        """Return the cached result dict, or None on a miss."""
+        entry = self.entry_path(key)
+        result_path = os.path.join(entry, RESULT_FILE)
+        try:
+            with open(result_path) as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not all(os.path.exists(os.path.join(entry, name)) for name in result["images"]):
+            return None
+        os.utime(result_path)
+        logging.info(f"EDA cache hit: {key[:12]}")
+        return result
+
+    def put(self, key: str, result: dict):
+        """
+        Record the result of a run whose images were rendered into
+        ``entry_path(key)``, then evict old entries to fit the budget.
+        """
+        entry = self.entry_path(key)
+        os.makedirs(entry, exist_ok=True)
+        tmp = os.path.join(entry, f".tmp-{uuid.uuid4().hex[:8]}-{RESULT_FILE}")
+        with open(tmp, "w") as f:
+            json.dump(result, f)
+        os.replace(tmp, os.path.join(entry, RESULT_FILE))
+        self.evict(keep=key)
+
+    def entries(self):
+        """(last used, bytes, key) of every entry, oldest first."""
+        if not os.path.isdir(self.root):
+            return []
+        entries = []
+        for item in os.scandir(self.root):
+            if not item.is_dir():
+                continue
+            files = [f for f in os.scandir(item.path) if f.is_file()]
+            result = [f for f in files if f.name == RESULT_FILE]
+            # Unfinished entries age from when their directory was last written
+            last_used = (result[0] if result else item).stat().st_mtime_ns
+            entries.append((last_used, sum(f.stat().st_size for f in files), item.name))
+        return sorted(entries)
+
+    def evict(self, keep: str = None):
+        """Remove least recently used entries until the cache fits ``max_bytes``."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self.entry_path(key), ignore_errors=True)
+            total -= size
+            logging.info(f"Evicted EDA cache entry {key[:12]}")
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,176 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+
+# Non-interactive backend: plots are only ever written to PNG files
+matplotlib.use("Agg")
+
+import numpy as np
+import seaborn as sns
+from matplotlib.figure import Figure
+
+
+def binned_counts(values: np.ndarray, lower: np.ndarray, upper: np.ndarray, bins: int):
+    """
+    Per-column histograms of a 2-D array in a single vectorized pass.
+
+    Every finite value is mapped to ``column * bins + bin`` and counted with
+    one ``np.bincount`` over the whole matrix; NaNs are skipped.
+
+    Returns:
+        (n_columns, bins) array of counts
+    """
+    n_rows, n_cols = values.shape
+    width = np.where(upper > lower, upper - lower, 1.0)
+    scaled = (values - lower) / width * bins
+    finite = np.isfinite(scaled)
+    # The maximum lands on the right edge of the last bin, as in np.histogram
+    bin_index = np.clip(scaled[finite].astype(np.int64), 0, bins - 1)
+    column_index = np.broadcast_to(np.arange(n_cols), values.shape)[finite]
+    counts = np.bincount(column_index * bins + bin_index, minlength=n_cols * bins)
+    return counts.reshape(n_cols, bins)
+
+
+def gaussian_smooth(counts: np.ndarray, sigma_bins: np.ndarray) -> np.ndarray:
+    """
+    Binned Gaussian KDE: convolve each row of fine-grid counts with a
+    Gaussian kernel of ``sigma_bins`` grid steps (FFT, so cost is per grid
+    point rather than per row of data).
+    """
+    n_cols, grid_size = counts.shape
+    size = 2 * grid_size
+    freqs = np.fft.rfftfreq(size)
+    # Fourier transform of a unit-mass Gaussian is exp(-2 (pi f sigma)^2)
+    kernels = np.exp(-2 * (np.pi * freqs[None, :] * sigma_bins[:, None]) ** 2)
+    smoothed = np.fft.irfft(np.fft.rfft(counts, n=size, axis=1) * kernels, n=size, axis=1)
+    return np.clip(smoothed[:, :grid_size], 0, None)
+
+
+def histogram_data(df, numeric_cols, bins: int = 30, grid_size: int = 256):
+    """
+    Precompute histogram bars and KDE curves for every numeric column.
+
+    Bandwidths follow Scott's rule (as seaborn's ``kde=True`` does); the KDE
+    is scaled to counts per histogram bin so it overlays the bars.
+
+    Returns:
+        list of dicts with column, edges, counts, grid and kde
+    """
+    if len(numeric_cols) == 0:
+        return []
+    values = df[list(numeric_cols)].to_numpy(dtype="float64", na_value=np.nan)
+    lower, upper = np.nanmin(values, axis=0), np.nanmax(values, axis=0)
+    lower, upper = np.nan_to_num(lower), np.nan_to_num(upper)
+
+    counts = binned_counts(values, lower, upper, bins)
+    fine_counts = binned_counts(values, lower, upper, grid_size)
+
+    n = np.isfinite(values).sum(axis=0)
+    std = np.nanstd(values, axis=0, ddof=1) if len(values) > 1 else np.zeros(len(lower))
+    bandwidth = np.nan_to_num(std) * np.maximum(n, 1) ** (-1 / 5)
+    span = np.where(upper > lower, upper - lower, 1.0)
+    kde = gaussian_smooth(fine_counts.astype("float64"), bandwidth / span * grid_size)
+    # fine-grid counts -> counts per coarse histogram bin
+    kde *= grid_size / bins
+
+    results = []
+    for i, col in enumerate(numeric_cols):
+        edges = np.linspace(lower[i], upper[i], bins + 1)
+        grid = lower[i] + (np.arange(grid_size) + 0.5) * span[i] / grid_size
+        results.append(
+            {
+                "column": col,
+                "edges": edges,
+                "counts": counts[i],
+                "grid": grid,
+                "kde": kde[i] if bandwidth[i] > 0 else None,
+            }
+        )
+    return results
+
+
+def render_histogram(hist: dict, save_path: str):
+    """Draw one precomputed histogram with its KDE overlay."""
+    # Figures are created without pyplot's global state, so rendering is
+    # safe from background threads as well as worker processes
+    fig = Figure(figsize=(8, 6))
+    ax = fig.add_subplot()
+    edges = hist["edges"]
+    ax.bar(
+        edges[:-1],
+        hist["counts"],
+        width=np.diff(edges),
+        align="edge",
+        color="blue",
+        alpha=0.5,
+        edgecolor="white",
+    )
+    if hist["kde"] is not None:
+        ax.plot(hist["grid"], hist["kde"], color="blue")
+    ax.set_xlabel(str(hist["column"]))
+    ax.set_ylabel("Count")
+    ax.set_title(f"Distribution of {hist['column']}")
+    fig.savefig(save_path)
+    return save_path
+
+
+def render_heatmap(corr, save_path: str):
+    """Draw the annotated correlation heatmap."""
+    fig = Figure(figsize=(10, 8))
+    ax = fig.add_subplot()
+    sns.heatmap(corr, annot=True, cmap="coolwarm", ax=ax)
+    fig.savefig(save_path)
+    return save_path
+
+
+def render_eda_plots(
+    df, numeric_cols, eda_folder_path, max_workers=None, corr=None, histograms=None
+):
+    """
+    Render every EDA plot, concurrently in a process pool.
+
+    Statistics are computed here in one vectorized pass; workers only draw
+    and PNG-encode. The correlation heatmap, the most expensive single
+    figure, is submitted first so it renders alongside the histograms.
+
+    Args:
+        df: data to plot; may be None when corr and histograms are given
+        numeric_cols: columns to draw distributions for
+        eda_folder_path: output folder for the PNG files
+        max_workers: process pool size (None -> one per core)
+        corr: precomputed correlation matrix (computed from df if None)
+        histograms: precomputed ``histogram_data`` output, e.g. from a
+            streaming profile (computed from df if None)
+
+    Returns:
+        list of PNG file names, histograms first, in column order
+    """
+    if histograms is None:
+        histograms = histogram_data(df, numeric_cols)
+    tasks = [
+        (render_histogram, hist, f"{hist['column']}_distribution.png")
+        for hist in histograms
+    ]
+    if len(numeric_cols) > 1:
+        corr = df[list(numeric_cols)].corr() if corr is None else corr
+        tasks.insert(0, (render_heatmap, corr, "correlation_heatmap.png"))
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+    if max_workers <= 1:
+        for func, data, filename in tasks:
+            func(data, os.path.join(eda_folder_path, filename))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(func, data, os.path.join(eda_folder_path, filename))
+                for func, data, filename in tasks
+            ]
+            for future in futures:
+                future.result()
+
+    filenames = [filename for _, _, filename in tasks]
+    if len(numeric_cols) > 1:
+        # Keep the previous order: distributions, then the heatmap
+        filenames = filenames[1:] + filenames[:1]
+    return filenames
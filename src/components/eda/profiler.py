@@ -0,0 +1,543 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from src.components.eda.plots import gaussian_smooth
+
+# Row order of the summary table, following df.describe(include="all")
+SUMMARY_INDEX = [
+    "count",
+    "unique",
+    "top",
+    "freq",
+    "mean",
+    "std",
+    "min",
+    "25%",
+    "50%",
+    "75%",
+    "max",
+    "skew",
+    "kurtosis",
+    "null_count",
+]
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch (Karnin, Lang & Liberty). Level ``h`` holds items of
+    weight 2**h; a full level is sorted and every other item promoted.
+    Exact while fewer than ``k`` items have been seen, and mergeable.
+    """
+
+    def __init__(self, k: int = 200, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind at this level
+                keep, items = items[len(items) - len(items) % 2 :], items[: len(items) - len(items) % 2]
+                promoted = items[self._rng.integers(2) :: 2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values: np.ndarray):
+        values = values[np.isfinite(values)]
+        if len(values):
+            self.n += len(values)
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantiles(self, qs):
+        if self.n == 0:
+            return [np.nan] * len(qs)
+        if len(self.levels) == 1:
+            # Nothing compacted yet: exact, with pandas' linear interpolation
+            return list(np.quantile(self.levels[0], qs))
+        items = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(len(items), 2.0**level) for level, items in enumerate(self.levels)]
+        )
+        order = np.argsort(items)
+        items, cumulative = items[order], np.cumsum(weights[order])
+        return list(np.interp(np.asarray(qs) * cumulative[-1], cumulative, items))
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter over 64-bit hashes. Merging takes the
+    register-wise maximum, which is exactly the sketch of the union.
+    """
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = np.zeros(2**precision, dtype=np.uint8)
+
+    def update(self, values: pd.Series):
+        if len(values) == 0:
+            return
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - self.precision)) - 1)
+        # Position of the leftmost 1-bit in the remaining 64 - p bits
+        bit_length = np.zeros(len(rest), dtype=np.int64)
+        for shift in (32, 16, 8, 4, 2, 1):
+            high = rest >= np.uint64(1 << shift)
+            rest = np.where(high, rest >> np.uint64(shift), rest)
+            bit_length += np.where(high, shift, 0)
+        bit_length += (rest > 0).astype(np.int64)
+        rank = (64 - self.precision - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog"):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(2.0 ** -self.registers.astype(np.float64))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)  # linear counting for small sets
+        return int(round(estimate))
+
+
+class TopK:
+    """
+    Mergeable Misra-Gries frequent items summary. Counts are exact while
+    there are at most ``capacity`` distinct values, and otherwise
+    underestimate by at most n / (capacity + 1).
+    """
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self.counts = {}
+
+    def _add_counts(self, counts: dict):
+        for value, count in counts.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+        if len(self.counts) > self.capacity:
+            ranked = sorted(self.counts.values(), reverse=True)
+            cut = ranked[self.capacity]
+            self.counts = {v: c - cut for v, c in self.counts.items() if c > cut}
+
+    def update(self, values: pd.Series):
+        self._add_counts(values.value_counts(dropna=True).to_dict())
+
+    def merge(self, other: "TopK"):
+        self._add_counts(other.counts)
+        return self
+
+    def most_common(self, n: int = 1):
+        return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:n]
+
+
+class DyadicHistogram:
+    """
+    Fixed-width histogram whose bin width is a power of two and whose bins
+    are aligned to multiples of it. When values fall outside the range it
+    can cover with ``max_bins`` bins, adjacent bin pairs are merged and the
+    width doubles. Two such histograms always share a common coarsening,
+    so merges are exact.
+    """
+
+    def __init__(self, max_bins: int = 256):
+        self.max_bins = max_bins
+        self.width = None
+        self.start = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def _coarsen(self):
+        counts = self.counts
+        if self.start % 2:
+            counts = np.concatenate([[0], counts])
+            self.start -= 1
+        if len(counts) % 2:
+            counts = np.concatenate([counts, [0]])
+        self.counts = counts.reshape(-1, 2).sum(axis=1)
+        self.start //= 2
+        self.width *= 2
+
+    def _cover(self, lower: float, upper: float):
+        """Grow (and if needed coarsen) the bins to cover [lower, upper]."""
+        while True:
+            first = min(self.start, int(np.floor(lower / self.width)))
+            last = max(self.start + len(self.counts) - 1, int(np.floor(upper / self.width)))
+            if last - first + 1 <= self.max_bins:
+                break
+            self._coarsen()
+        end = self.start + len(self.counts) - 1
+        self.counts = np.concatenate(
+            [
+                np.zeros(self.start - first, dtype=np.int64),
+                self.counts,
+                np.zeros(last - end, dtype=np.int64),
+            ]
+        )
+        self.start = first
+
+    def update(self, values: np.ndarray):
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return
+        lower, upper = values.min(), values.max()
+        if self.width is None:
+            span = upper - lower
+            if span > 0:
+                self.width = 2.0 ** np.ceil(np.log2(span / self.max_bins))
+            else:
+                self.width = 2.0 ** (np.floor(np.log2(abs(lower))) - 8) if lower else 1.0
+            self.start = int(np.floor(lower / self.width))
+            self.counts = np.zeros(1, dtype=np.int64)
+        self._cover(lower, upper)
+        index = np.floor(values / self.width).astype(np.int64) - self.start
+        self.counts += np.bincount(index, minlength=len(self.counts))
+
+    def merge(self, other: "DyadicHistogram"):
+        if other.width is None:
+            return self
+        other = _copy_histogram(other)
+        if self.width is None:
+            self.width, self.start, self.counts = other.width, other.start, other.counts
+            return self
+        while True:
+            while self.width < other.width:
+                self._coarsen()
+            while other.width < self.width:
+                other._coarsen()
+            self._cover(other.start * other.width, (other.start + len(other.counts)) * other.width - other.width / 2)
+            if self.width == other.width:
+                break
+        offset = other.start - self.start
+        self.counts[offset : offset + len(other.counts)] += other.counts
+        return self
+
+    def edges(self) -> np.ndarray:
+        return (self.start + np.arange(len(self.counts) + 1)) * self.width
+
+
+def _copy_histogram(hist: DyadicHistogram) -> DyadicHistogram:
+    copy = DyadicHistogram(hist.max_bins)
+    copy.width, copy.start, copy.counts = hist.width, hist.start, hist.counts.copy()
+    return copy
+
+
+def _merge_moments(a: dict, b: dict) -> dict:
+    """Combine per-column central moments (Pebay's pairwise formulas)."""
+    na, nb = a["n"], b["n"]
+    n = na + nb
+    safe_n = np.where(n > 0, n, 1)
+    delta = b["mean"] - a["mean"]
+    mean = a["mean"] + delta * nb / safe_n
+    m2 = a["m2"] + b["m2"] + delta**2 * na * nb / safe_n
+    m3 = (
+        a["m3"]
+        + b["m3"]
+        + delta**3 * na * nb * (na - nb) / safe_n**2
+        + 3 * delta * (na * b["m2"] - nb * a["m2"]) / safe_n
+    )
+    m4 = (
+        a["m4"]
+        + b["m4"]
+        + delta**4 * na * nb * (na**2 - na * nb + nb**2) / safe_n**3
+        + 6 * delta**2 * (na**2 * b["m2"] + nb**2 * a["m2"]) / safe_n**2
+        + 4 * delta * (na * b["m3"] - nb * a["m3"]) / safe_n
+    )
+    return {"n": n, "mean": mean, "m2": m2, "m3": m3, "m4": m4}
+
+
+def _chunk_moments(values: np.ndarray) -> dict:
+    finite = np.isfinite(values)
+    n = finite.sum(axis=0).astype(np.float64)
+    safe_n = np.where(n > 0, n, 1)
+    mean = np.where(finite, values, 0).sum(axis=0) / safe_n
+    dev = np.where(finite, values - mean, 0)
+    return {
+        "n": n,
+        "mean": mean,
+        "m2": (dev**2).sum(axis=0),
+        "m3": (dev**3).sum(axis=0),
+        "m4": (dev**4).sum(axis=0),
+    }
+
+
+def _merge_comoments(a: dict, b: dict) -> dict:
+    """
+    Combine pairwise-complete co-moments. For columns i, j over the rows
+    where both are present: n[i, j] rows, mean[i, j] the mean of column i,
+    m2[i, j] its sum of squared deviations and c[i, j] the co-moment.
+    """
+    na, nb = a["n"], b["n"]
+    n = na + nb
+    safe_n = np.where(n > 0, n, 1)
+    dx = b["mean"] - a["mean"]
+    return {
+        "n": n,
+        "mean": a["mean"] + dx * nb / safe_n,
+        "m2": a["m2"] + b["m2"] + dx**2 * na * nb / safe_n,
+        "c": a["c"] + b["c"] + dx * dx.T * na * nb / safe_n,
+    }
+
+
+def _chunk_comoments(values: np.ndarray) -> dict:
+    present = np.isfinite(values)
+    mask = present.astype(np.float64)
+    # Shift by the column means so the sums below do not cancel badly
+    shift = np.nan_to_num(np.nanmean(values, axis=0)) if len(values) else 0
+    centered = np.where(present, values - shift, 0)
+    n = mask.T @ mask
+    safe_n = np.where(n > 0, n, 1)
+    sums = centered.T @ mask  # sums[i, j]: column i over rows where i and j are present
+    squares = (centered**2).T @ mask
+    products = centered.T @ centered
+    return {
+        "n": n,
+        "mean": sums / safe_n + np.asarray(shift)[:, None],
+        "m2": squares - sums**2 / safe_n,
+        "c": products - sums * sums.T / safe_n,
+    }
+
+
+class DataProfile:
+    """
+    Single-pass, mergeable profile of a tabular dataset.
+
+    Feed it chunks with ``update`` (or build one per worker and ``merge``
+    them). It tracks, per column, counts, nulls and a HyperLogLog distinct
+    count; for numeric columns also exact central moments up to the
+    fourth, min/max, KLL quantiles and a dyadic histogram, plus a pairwise
+    co-moment matrix for correlations; for other columns a top-k summary.
+    Exact statistics (counts, moments, min/max, histograms, covariance)
+    merge to the same result as profiling all rows in one pass, up to
+    floating point rounding.
+    """
+
+    def __init__(self, quantile_k: int = 200, hll_precision: int = 12, top_k: int = 100, max_bins: int = 256):
+        self.quantile_k = quantile_k
+        self.hll_precision = hll_precision
+        self.top_k = top_k
+        self.max_bins = max_bins
+        self.columns = None
+        self.numeric_columns = None
+        self.rows = 0
+        self.head = None
+
+    def _init_columns(self, df: pd.DataFrame):
+        self.columns = list(df.columns)
+        self.numeric_columns = list(df.select_dtypes(include="number").columns)
+        self.head = df.head()
+        n_numeric = len(self.numeric_columns)
+        self.nulls = np.zeros(len(self.columns), dtype=np.int64)
+        self.distinct = [HyperLogLog(self.hll_precision) for _ in self.columns]
+        self.top = {
+            col: TopK(self.top_k) for col in self.columns if col not in self.numeric_columns
+        }
+        self.quantile_sketches = [KLLSketch(self.quantile_k, seed=i) for i in range(n_numeric)]
+        self.hists = [DyadicHistogram(self.max_bins) for _ in range(n_numeric)]
+        self.minimum = np.full(n_numeric, np.inf)
+        self.maximum = np.full(n_numeric, -np.inf)
+        zeros = np.zeros(n_numeric)
+        self.moments = {"n": zeros, "mean": zeros, "m2": zeros, "m3": zeros, "m4": zeros}
+        square = np.zeros((n_numeric, n_numeric))
+        self.comoments = {"n": square, "mean": square, "m2": square, "c": square}
+
+    def update(self, df: pd.DataFrame):
+        """Add one chunk of rows; columns not seen in the first chunk are ignored."""
+        if self.columns is None:
+            self._init_columns(df)
+        df = df.reindex(columns=self.columns)
+        self.rows += len(df)
+        self.nulls += df.isnull().sum().to_numpy()
+
+        for col, hll in zip(self.columns, self.distinct):
+            hll.update(df[col].dropna())
+        for col, top in self.top.items():
+            top.update(df[col])
+
+        if self.numeric_columns:
+            values = df[self.numeric_columns].to_numpy(dtype="float64", na_value=np.nan)
+            self.moments = _merge_moments(self.moments, _chunk_moments(values))
+            self.comoments = _merge_comoments(self.comoments, _chunk_comoments(values))
+            if len(values):
+                with np.errstate(invalid="ignore"):
+                    self.minimum = np.fmin(self.minimum, np.nanmin(values, axis=0))
+                    self.maximum = np.fmax(self.maximum, np.nanmax(values, axis=0))
+            for i in range(len(self.numeric_columns)):
+                self.quantile_sketches[i].update(values[:, i])
+                self.hists[i].update(values[:, i])
+        return self
+
+    def merge(self, other: "DataProfile"):
+        """Fold another partial profile (e.g. from a worker process) into this one."""
+        if other.columns is None:
+            return self
+        if self.columns is None:
+            self.__dict__.update(other.__dict__)
+            return self
+        if other.columns != self.columns or other.numeric_columns != self.numeric_columns:
+            raise ValueError("Cannot merge profiles of differently shaped data")
+
+        self.rows += other.rows
+        self.nulls = self.nulls + other.nulls
+        for hll, other_hll in zip(self.distinct, other.distinct):
+            hll.merge(other_hll)
+        for col, top in self.top.items():
+            top.merge(other.top[col])
+        self.moments = _merge_moments(self.moments, other.moments)
+        self.comoments = _merge_comoments(self.comoments, other.comoments)
+        self.minimum = np.fmin(self.minimum, other.minimum)
+        self.maximum = np.fmax(self.maximum, other.maximum)
+        for sketch, other_sketch in zip(self.quantile_sketches, other.quantile_sketches):
+            sketch.merge(other_sketch)
+        for hist, other_hist in zip(self.hists, other.hists):
+            hist.merge(other_hist)
+        return self
+
+    @classmethod
+    def from_chunks(cls, chunks, **kwargs):
+        profile = cls(**kwargs)
+        for chunk in chunks:
+            profile.update(chunk)
+        return profile
+
+    def fingerprint(self) -> str:
+        """Digest of the accumulated state; equal profiles give equal digests."""
+        digest = hashlib.sha256()
+        digest.update(repr((self.rows, self.columns, self.numeric_columns)).encode())
+        if self.columns is None:
+            return digest.hexdigest()
+        digest.update(pd.util.hash_pandas_object(self.head, index=False).values.tobytes())
+        arrays = [self.nulls, self.minimum, self.maximum]
+        arrays += [self.moments[key] for key in sorted(self.moments)]
+        arrays += [self.comoments[key] for key in sorted(self.comoments)]
+        arrays += [hll.registers for hll in self.distinct]
+        arrays += [np.append(hist.counts, [hist.start, hist.width or 0]) for hist in self.hists]
+        arrays += [level for sketch in self.quantile_sketches for level in sketch.levels]
+        for array in arrays:
+            digest.update(np.ascontiguousarray(array).tobytes())
+        for col in sorted(self.top, key=str):
+            digest.update(repr(sorted(self.top[col].counts.items(), key=repr)).encode())
+        return digest.hexdigest()
+
+    @property
+    def shape(self):
+        return self.rows, len(self.columns or [])
+
+    def summary_frame(self) -> pd.DataFrame:
+        """Summary table shaped like ``df.describe(include="all")`` plus null counts."""
+        moments = self.moments
+        n = moments["n"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            std = np.sqrt(moments["m2"] / (n - 1))
+            # Bias-adjusted, as pandas' skew() and kurt()
+            skew = (
+                np.sqrt(n * (n - 1)) / (n - 2) * np.sqrt(n) * moments["m3"] / moments["m2"] ** 1.5
+            )
+            kurtosis = n * (n + 1) * (n - 1) * moments["m4"] / (
+                (n - 2) * (n - 3) * moments["m2"] ** 2
+            ) - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+
+        summary = {}
+        for pos, col in enumerate(self.columns):
+            stats = {
+                "count": self.rows - self.nulls[pos],
+                "null_count": self.nulls[pos],
+            }
+            if col in self.numeric_columns:
+                i = self.numeric_columns.index(col)
+                quartiles = self.quantile_sketches[i].quantiles([0.25, 0.5, 0.75])
+                has_values = n[i] > 0
+                stats.update(
+                    {
+                        "mean": moments["mean"][i] if has_values else np.nan,
+                        "std": std[i],
+                        "min": self.minimum[i] if has_values else np.nan,
+                        "25%": quartiles[0],
+                        "50%": quartiles[1],
+                        "75%": quartiles[2],
+                        "max": self.maximum[i] if has_values else np.nan,
+                        "skew": skew[i],
+                        "kurtosis": kurtosis[i],
+                    }
+                )
+            else:
+                top = self.top[col].most_common(1)
+                stats["unique"] = self.distinct[pos].count()
+                if top:
+                    stats["top"], stats["freq"] = top[0]
+            summary[col] = stats
+        return pd.DataFrame(summary, index=SUMMARY_INDEX, columns=self.columns)
+
+    def correlation(self) -> pd.DataFrame:
+        """Pairwise-complete Pearson correlations, as ``df.corr()``."""
+        c, m2 = self.comoments["c"], self.comoments["m2"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = c / np.sqrt(m2 * m2.T)
+        corr[self.comoments["n"] < 2] = np.nan
+        return pd.DataFrame(corr, index=self.numeric_columns, columns=self.numeric_columns)
+
+    def covariance(self) -> pd.DataFrame:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = self.comoments["c"] / (self.comoments["n"] - 1)
+        return pd.DataFrame(cov, index=self.numeric_columns, columns=self.numeric_columns)
+
+    def histograms(self, bins: int = 30, grid_size: int = 256):
+        """
+        Histograms and KDE curves in the format of ``plots.histogram_data``,
+        built from the dyadic histograms: fine bins are grouped into about
+        ``bins`` plotted bars and smoothed for the KDE.
+        """
+        results = []
+        n = self.moments["n"]
+        std = np.sqrt(self.moments["m2"] / np.maximum(n - 1, 1))
+        for i, col in enumerate(self.numeric_columns):
+            hist = self.hists[i]
+            if hist.width is None:
+                continue
+            fine, edges = hist.counts, hist.edges()
+            group = max(1, int(np.ceil(len(fine) / bins)))
+            padded = np.concatenate([fine, np.zeros(-len(fine) % group, dtype=np.int64)])
+            counts = padded.reshape(-1, group).sum(axis=1)
+            plot_edges = hist.start * hist.width + np.arange(len(counts) + 1) * hist.width * group
+
+            bandwidth = std[i] * max(n[i], 1) ** (-1 / 5)
+            kde = None
+            if bandwidth > 0:
+                kde = gaussian_smooth(fine[None, :].astype("float64"), np.array([bandwidth / hist.width]))[0]
+                kde *= group  # counts per fine bin -> counts per plotted bar
+            results.append(
+                {
+                    "column": col,
+                    "edges": plot_edges,
+                    "counts": counts,
+                    "grid": (edges[:-1] + edges[1:]) / 2,
+                    "kde": kde,
+                }
+            )
+        return results
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+# Two-sided 95% normal quantile and the matching DKW significance level
+Z_95 = 1.959964
+ALPHA_95 = 0.05
+
+
+def reservoir_sample(data, n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Uniform sample of at most ``n_rows`` rows, without replacement.
+
+    Every row is given a uniform random key and the rows with the
+    ``n_rows`` smallest keys are kept (bottom-k reservoir sampling), so
+    ``data`` can also be an iterable of chunks: the reservoir never holds
+    more than ``n_rows`` rows plus one chunk. Rows keep their original order.
+
+    Args:
+        data: DataFrame or iterable of DataFrame chunks
+        n_rows: row budget
+        seed: random seed, so the same data yields the same sample
+    """
+    chunks = [data] if isinstance(data, pd.DataFrame) else data
+    rng = np.random.default_rng(seed)
+    reservoir, keys = None, np.empty(0)
+    for chunk in chunks:
+        keys = np.concatenate([keys, rng.random(len(chunk))])
+        reservoir = chunk if reservoir is None else pd.concat([reservoir, chunk])
+        if len(keys) > n_rows:
+            keep = np.sort(np.argpartition(keys, n_rows)[:n_rows])
+            reservoir, keys = reservoir.iloc[keep], keys[keep]
+    return reservoir
+
+
+def stratified_sample(df: pd.DataFrame, n_rows: int, column: str, seed: int = 0) -> pd.DataFrame:
+    """
+    Sample ``n_rows`` rows with proportional allocation over the values of
+    ``column`` (nulls form their own stratum). Every stratum keeps at
+    least one row, so rare categories still show up in the summary; the
+    sample can exceed the budget by at most the number of strata.
+    """
+    codes, _ = pd.factorize(df[column], use_na_sentinel=False)
+    sizes = np.bincount(codes)
+    allocation = np.minimum(np.maximum(np.floor(sizes * n_rows / len(df)), 1), sizes)
+
+    # Rank rows within their stratum by a random key; keep the lowest ranks
+    keys = np.random.default_rng(seed).random(len(df))
+    order = np.lexsort((keys, codes))
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    rank = np.empty(len(df), dtype=np.int64)
+    rank[order] = np.arange(len(df)) - np.repeat(starts, sizes)
+    return df[rank < allocation[codes]]
+
+
+def sample_error_bounds(sample: pd.DataFrame, population_rows: int) -> pd.DataFrame:
+    """
+    Approximate 95% error bounds of statistics computed on a sample.
+
+    Rows:
+        sample_size: non-null sample values per column
+        mean_error_95: half-width of the confidence interval of the mean
+            (normal approximation, with finite population correction)
+        quantile_rank_error_95: maximum rank error of the sample quantiles
+            (Dvoretzky-Kiefer-Wolfowitz), e.g. 0.01 means the reported
+            median lies between the 49th and 51st percentiles
+        top_share_error_95: half-width of the confidence interval of the
+            share of the most frequent category
+    """
+    n = sample.notna().sum()
+    fpc = np.sqrt(max(0.0, 1 - len(sample) / population_rows))
+    safe_n = n.where(n > 0)
+    bounds = pd.DataFrame(index=["sample_size"], columns=sample.columns, dtype=object)
+    bounds.loc["sample_size"] = n
+
+    numeric = sample.select_dtypes(include="number").columns
+    mean_error = Z_95 * sample[numeric].std() / np.sqrt(safe_n[numeric]) * fpc
+    rank_error = np.sqrt(np.log(2 / ALPHA_95) / (2 * safe_n[numeric]))
+
+    others = sample.columns.difference(numeric, sort=False)
+    top_share = pd.Series(
+        {
+            col: sample[col].value_counts().iloc[0] / n[col] if n[col] else np.nan
+            for col in others
+        },
+        dtype="float64",
+    )
+    share_error = Z_95 * np.sqrt(top_share * (1 - top_share) / safe_n[others]) * fpc
+
+    for row, values in [
+        ("mean_error_95", mean_error),
+        ("quantile_rank_error_95", rank_error),
+        ("top_share_error_95", share_error),
+    ]:
+        bounds.loc[row] = values.reindex(sample.columns)
+    return bounds
@@ -36,7 +36,8 @@ class FeatureSelector:
             if col in excluded:
                 continue
             
-            if np.issubdtype(dtype, np.number):
+            # Extension dtypes (e.g. category) are never numeric features
+            if isinstance(dtype, np.dtype) and np.issubdtype(dtype, np.number):
                 # keep numeric features
                 features.append(col)
             
@@ -49,7 +50,11 @@ class FeatureSelector:
         """
 
         for col in df.columns:
-            if pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col]):
+            if (
+                pd.api.types.is_object_dtype(df[col])
+                or pd.api.types.is_string_dtype(df[col])
+                or isinstance(df[col].dtype, pd.CategoricalDtype)
+            ):
                 # check if it's actually datetime-like
                 try:
                     pd.to_datetime(df[col], errors="raise")
@@ -81,10 +86,10 @@ class FeatureSelector:
 
             for col in df.columns:
                 # If it's already datetime dtype
-                if np.issubdtype(df[col].dtype, np.datetime64):
+                if pd.api.types.is_datetime64_any_dtype(df[col]):
                     datetime_cols.append(col)
-                # If it's object but parses as datetime
-                elif df[col].dtype == 'object':
+                # If it's object (or categorical text) but parses as datetime
+                elif df[col].dtype == 'object' or isinstance(df[col].dtype, pd.CategoricalDtype):
                     try:
                         pd.to_datetime(df[col], errors='raise')
                         datetime_cols.append(col)
@@ -94,7 +99,7 @@ class FeatureSelector:
             # Pass 2: Standardize datetime handling in each dataset
             # Convert all detected datetime columns to datetime dtype
             for col in datetime_cols:
-                if col in df.columns and not np.issubdtype(df[col].dtype, np.datetime64):
+                if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
                     try:
                         df[col] = pd.to_datetime(df[col], errors="coerce")
                     except Exception:
@@ -1,11 +1,22 @@
 import os
 import sys
+import glob
+import json
+import shutil
+import tempfile
+import threading
+import uuid
+import numpy as np
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pandas.api.types import union_categoricals
 from src.common.exception import CustomException
 from src.common.monitoring.logger import logging
 from src.common.datasource import DataSourceIO
+from src.components.eda.cache import EDACache, eda_fingerprint, publish_file
+from src.components.eda.plots import render_eda_plots
+from src.components.eda.profiler import DataProfile
+from src.components.eda.sampling import reservoir_sample, sample_error_bounds, stratified_sample
 from src.components.type_defs import TraingingParams
 
 from sklearn.model_selection import train_test_split
@@ -16,45 +27,294 @@ from dataclasses import dataclass
 class DataIngestConfig:
     train_data_path: str = os.path.join("model_run", "train.csv")
     test_data_path: str = os.path.join("model_run", "test.csv")
-    raw_data_path: str = os.path.join("model_run", "raw.csv")
+    # Parquet keeps the exact dtypes of the parsed upload, so the snapshot
+    # never needs to be read back to match what later stages will load
+    raw_data_path: str = os.path.join("model_run", "raw.parquet")
     eda_folder_path: str = os.path.join("model_run", "eda")
+    # Per-file provenance of the files making up the raw snapshot
+    manifest_path: str = os.path.join("model_run", "ingest_manifest.json")
+    # Process pool size for multi-file ingestion (None -> one per core)
+    max_workers: int = None
+    # Optional column recording which file each row came from
+    source_file_column: str = None
+    # Process pool size for rendering EDA plots (None -> one per core)
+    eda_max_workers: int = None
+    # Rows per chunk for profile_data(), the streaming EDA for data too large
+    # to load; run() holds the frame anyway and profiles it in memory
+    eda_chunksize: int = None
+    # Disk budget of the fingerprint-keyed EDA result cache (0 -> disabled)
+    eda_cache_max_bytes: int = 256 * 1024**2
+    # Row budget for sampled EDA (None -> statistics over every row)
+    eda_sample_rows: int = None
+    # Sample proportionally within the values of this column instead of uniformly
+    eda_stratify_column: str = None
+    # After a sampled EDA, compute full-data statistics in the background
+    # (needs the EDA cache, which is where the refined result is kept)
+    eda_refine: bool = False
+
+
+def _read_partition(path, read_kwargs=None):
+    """Parse one input file in a worker process."""
+    try:
+        return DataSourceIO().read_flat_file(path, use_cache=False, **(read_kwargs or {}))
+    except Exception as e:
+        # CustomException cannot be pickled back to the parent process
+        raise RuntimeError(str(e)) from None
+
+
+def _profile_partition(path, chunksize):
+    """Profile one input file chunk by chunk in a worker process."""
+    try:
+        chunks = DataSourceIO().read_flat_file_chunks(path, chunksize=chunksize)
+        return DataProfile.from_chunks(chunks)
+    except Exception as e:
+        raise RuntimeError(str(e)) from None
+
 
 class IngestionManager:
+    # Background full-data EDA after a sampled run; one at a time
+    eda_refiner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="eda-refine")
+    # Latest run_eda call per EDA folder: results are only published while
+    # no newer EDA has been run into the same folder
+    _latest_eda = {}
+    # EDA folder -> (run_id, df) of the refinement queued for it; a newer
+    # run_eda drops the entry, so superseded frames are released at once
+    _pending_refinements = {}
+    _latest_eda_lock = threading.Lock()
+
     def __init__(self, ingest_path=None):
         # Initialize the generic source class object
         self.source = DataSourceIO()
         self.ingestion_config = DataIngestConfig()
         self.ingest_path = ingest_path
+        # Future of the full-data EDA started by a sampled run_eda
+        self.eda_refinement = None
+
+    def resolve_paths(self, path):
+        """
+        Expand a path, glob pattern, or list of either into a sorted file list.
+        """
+        patterns = [path] if isinstance(path, (str, os.PathLike)) else list(path)
+        paths = []
+        for pattern in map(str, patterns):
+            matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+            if not matches:
+                raise FileNotFoundError(f"No files match: {pattern}")
+            paths.extend(matches)
+        return paths
+
+    def load_manifest(self):
+        manifest_path = self.ingestion_config.manifest_path
+        if not os.path.exists(manifest_path):
+            return []
+        with open(manifest_path) as f:
+            return json.load(f)
+
+    def save_manifest(self, entries):
+        manifest_path = self.ingestion_config.manifest_path
+        os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+        with open(manifest_path, "w") as f:
+            json.dump(entries, f, indent=2)
+
+    @staticmethod
+    def file_fingerprint(path):
+        stat = os.stat(path)
+        return {
+            "path": os.path.abspath(path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    def read_partitions(self, paths, **read_kwargs):
+        """
+        Parse input files, concurrently in a process pool when there are several.
+
+        Args:
+            paths: input file paths
+            read_kwargs: ``query``, ``columns`` and ``filters`` applied to
+                each file while it is read
+        """
+        if len(paths) == 1:
+            return [self.source.read_flat_file(path=paths[0], **read_kwargs)]
+
+        max_workers = self.ingestion_config.max_workers or os.cpu_count()
+        max_workers = min(max_workers, len(paths))
+        logging.info(f"Reading {len(paths)} files with {max_workers} processes")
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_read_partition, paths, [read_kwargs] * len(paths)))
+
+    def reconcile_schemas(self, frames):
+        """
+        Align partition schemas so they concatenate without losing dtypes.
+
+        Columns missing from a partition are filled with nulls by the concat.
+        Categorical columns are given the union of categories across
+        partitions, otherwise pandas would fall back to object dtype.
+        """
+        columns = list(dict.fromkeys(col for df in frames for col in df.columns))
+        for col in columns:
+            present = [df[col] for df in frames if col in df.columns]
+            if len(present) < len(frames):
+                logging.warning(f"Column '{col}' is missing from some input files")
+            if len(present) > 1 and all(
+                isinstance(series.dtype, pd.CategoricalDtype) for series in present
+            ):
+                categories = union_categoricals(present, ignore_order=True).categories
+                for df in frames:
+                    if col in df.columns:
+                        df[col] = df[col].cat.set_categories(categories)
+        return frames
+
+    def conform_to_snapshot(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Make a frame storable in the Parquet snapshot, which the CSV
+        snapshot used to accept as-is: column names become strings, and
+        object columns mixing value types (e.g. [1, "x", 2.5]) are stored
+        as strings, with nulls kept.
+        """
+        if not all(isinstance(col, str) for col in df.columns):
+            df = df.rename(columns=str)
+        for col in df.select_dtypes(include="object").columns:
+            inferred = pd.api.types.infer_dtype(df[col], skipna=True)
+            if inferred in ("mixed", "mixed-integer"):
+                logging.warning(f"Column '{col}' mixes value types; storing it as strings")
+                df[col] = df[col].map(str, na_action="ignore")
+        return df
+
+    def load_raw(self, path=None, skip_ingested=False, query=None, columns=None, filters=None):
+        """
+        Read the input data and persist the raw snapshot.
 
-    def load_raw(self, path):
+        Args:
+            path: file path, glob pattern, or list of either; defaults to
+                the ingest path given at construction
+            skip_ingested: only read files not yet recorded in the ingest
+                manifest and append them to the existing raw snapshot
+            query: optional SQL over each input file as table ``data``, e.g.
+                "SELECT * FROM data WHERE region = 'north'"; only matching
+                rows are materialized
+            columns: only ingest these columns
+            filters: (column, op, value) row filters pushed into the scan
+        """
         logging.info("Running Data Ingestion")
         try:
-            # Read the raw data            
-            if path is None:
-                df_raw = self.source.read_flat_file(path=self.ingest_path)
+            # Read the raw data
+            paths = self.resolve_paths(self.ingest_path if path is None else path)
+            fingerprints = [self.file_fingerprint(p) for p in paths]
+
+            manifest = self.load_manifest() if skip_ingested else []
+            raw_data_path = self.ingestion_config.raw_data_path
+            if skip_ingested and os.path.exists(raw_data_path):
+                seen = {(e["path"], e["size"], e["mtime_ns"]) for e in manifest}
+                new = [
+                    (p, fp)
+                    for p, fp in zip(paths, fingerprints)
+                    if (fp["path"], fp["size"], fp["mtime_ns"]) not in seen
+                ]
+                logging.info(f"Skipping {len(paths) - len(new)} already ingested files")
+                if not new:
+                    return self.source.read_flat_file(raw_data_path)
+                paths, fingerprints = [p for p, _ in new], [fp for _, fp in new]
+                frames = [self.source.read_flat_file(raw_data_path)]
             else:
-                df_raw = self.source.read_flat_file(path=path)
+                manifest, frames = [], []
 
-            # Save the input data to specified training folder and read back
-            self.source.write_flat_file(df_raw, path=self.ingestion_config.raw_data_path)
-            df = self.source.read_flat_file(path=self.ingestion_config.raw_data_path)
-            return df
+            read_kwargs = {"query": query} if query is not None else {}
+            if columns is not None:
+                read_kwargs["columns"] = columns
+            if filters:
+                read_kwargs["filters"] = filters
+            partitions = self.read_partitions(paths, **read_kwargs)
+            source_file_column = self.ingestion_config.source_file_column
+            for df, fingerprint in zip(partitions, fingerprints):
+                if source_file_column:
+                    df[source_file_column] = pd.Categorical.from_codes(
+                        np.zeros(len(df), dtype="int8"),
+                        categories=[os.path.basename(fingerprint["path"])],
+                    )
+                manifest.append(
+                    {**fingerprint, "rows": len(df), "columns": list(map(str, df.columns))}
+                )
+            frames.extend(partitions)
+
+            if len(frames) == 1:
+                df_raw = frames[0].reset_index(drop=True)
+            else:
+                df_raw = pd.concat(
+                    self.reconcile_schemas(frames), ignore_index=True, copy=False
+                )
+            df_raw = self.conform_to_snapshot(df_raw)
+
+            # Save a snapshot of the input data to the training folder. The
+            # snapshot round-trips to this exact frame, so return it directly
+            # and seed the read cache instead of parsing the file again.
+            self.source.write_flat_file(df_raw, path=raw_data_path, cache_result=True)
+            self.save_manifest(manifest)
+            return df_raw
 
         except Exception as e:
-            raise CustomException(e, sys)            
+            raise CustomException(e, sys)
 
-    def run_eda(self, df: pd.DataFrame):
-        logging.info("Running Exporatory Data Analysis")
+    def profile_data(self, path=None, chunksize: int = None) -> DataProfile:
+        """
+        Profile data in a single streaming pass without loading it whole.
+
+        Each file is read in chunks of ``chunksize`` rows and profiled in a
+        worker process; the partial profiles are then merged. This is the
+        EDA path for data too large to load: point it at the input files
+        and pass the profile to ``run_eda`` instead of going through
+        ``run()``, which loads the data whole.
+
+        Args:
+            path: file path, glob pattern, or list of either; defaults to
+                the raw snapshot
+            chunksize: rows per chunk (defaults to the config's eda_chunksize)
+        """
+        logging.info("Profiling data in a single streaming pass")
         try:
-            eda_folder_path = self.ingestion_config.eda_folder_path
-            os.makedirs(eda_folder_path, exist_ok=True)
-            eda_images = []
+            paths = self.resolve_paths(
+                self.ingestion_config.raw_data_path if path is None else path
+            )
+            chunksize = chunksize or self.ingestion_config.eda_chunksize or 100_000
+            if len(paths) == 1:
+                return _profile_partition(paths[0], chunksize)
 
-            # Show first few rows
-            eda_head = df.head().to_html(classes="table table-striped table-bordered", border=0)
+            max_workers = self.ingestion_config.max_workers or os.cpu_count()
+            max_workers = min(max_workers, len(paths))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                profiles = executor.map(_profile_partition, paths, [chunksize] * len(paths))
+                profile = DataProfile()
+                for partial in profiles:
+                    profile.merge(partial)
+            return profile
 
-            # Show shape
-            eda_shape = f"Rows: {df.shape[0]}, Columns: {df.shape[1]}"
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def compute_eda(self, df, output_folder, population_rows=None, max_workers=None):
+        """
+        Compute the EDA tables and render the plots into ``output_folder``.
+
+        Args:
+            df: DataFrame or DataProfile
+            output_folder: folder for the PNG files
+            population_rows: when ``df`` is a sample, the number of rows it
+                was drawn from; the summary then reports the sample size
+                and approximate error bounds
+            max_workers: plot rendering processes (defaults to the config's
+                eda_max_workers)
+
+        Returns:
+            dict with the head, shape and summary HTML and the image file names
+        """
+        if isinstance(df, DataProfile):
+            head, shape = df.head, df.shape
+            eda_df = df.summary_frame()
+            numeric_cols = df.numeric_columns
+            plot_data = {"corr": df.correlation(), "histograms": df.histograms()}
+            df = None
+        else:
+            head, shape = df.head(), df.shape
 
             # Summary statistics
             eda_df = df.describe(include="all")
@@ -62,40 +322,179 @@ class IngestionManager:
             # Add a row for null counts
             eda_df.loc["null_count"] = df.isnull().sum()
 
-            # Convert to HTML
-            eda_summary = eda_df.to_html(classes="table table-striped table-bordered", border=0)
-
             # Numeric columns
             numeric_cols = df.select_dtypes(include="number").columns
+            plot_data = {}
+
+        eda_shape = f"Rows: {shape[0]}, Columns: {shape[1]}"
+        if population_rows is not None:
+            eda_shape = (
+                f"Rows: {population_rows}, Columns: {shape[1]} "
+                f"(statistics from a sample of {shape[0]} rows)"
+            )
+            eda_df = pd.concat([eda_df, sample_error_bounds(df, population_rows)])
+
+        # Histograms with KDE overlays and the correlation heatmap are
+        # rendered concurrently in a process pool
+        filenames = render_eda_plots(
+            df,
+            numeric_cols,
+            output_folder,
+            max_workers=max_workers or self.ingestion_config.eda_max_workers,
+            **plot_data,
+        )
+        return {
+            # Show first few rows
+            "head": head.to_html(classes="table table-striped table-bordered", border=0),
+            # Show shape
+            "shape": eda_shape,
+            # Convert to HTML
+            "summary": eda_df.to_html(classes="table table-striped table-bordered", border=0),
+            "images": filenames,
+        }
+
+    def sample_for_eda(self, df: pd.DataFrame, n_rows: int) -> pd.DataFrame:
+        """Draw the EDA sample: stratified if a column is configured, else uniform."""
+        column = self.ingestion_config.eda_stratify_column
+        if column is not None:
+            return stratified_sample(df, n_rows, column)
+        return reservoir_sample(df, n_rows)
+
+    def _eda_result(
+        self, df, run_id, population_rows=None, compute=True, publish=True, max_workers=None
+    ):
+        """
+        Return the EDA result for ``df`` and the folder holding its images,
+        and publish the images into the EDA folder (with ``publish``) unless
+        a newer run_eda call than ``run_id`` owns the folder.
+
+        Results are cached under ``<eda_folder_path>/cache`` keyed by a
+        content fingerprint of the data. With ``compute=False`` only a
+        cached result is returned ((None, None) on a miss).
+        """
+        eda_folder_path = self.ingestion_config.eda_folder_path
+        max_bytes = self.ingestion_config.eda_cache_max_bytes
+        if max_bytes:
+            cache = EDACache(os.path.join(eda_folder_path, "cache"), max_bytes=max_bytes)
+            key = eda_fingerprint(df, {"population_rows": population_rows})
+            folder = cache.entry_path(key)
+            result = cache.get(key)
+            if result is None:
+                if not compute:
+                    return None, None
+                os.makedirs(folder, exist_ok=True)
+                result = self.compute_eda(df, folder, population_rows, max_workers)
+                cache.put(key, result)
+        elif compute:
+            folder = tempfile.mkdtemp(prefix=".render-", dir=eda_folder_path)
+            result = self.compute_eda(df, folder, population_rows, max_workers)
+        else:
+            return None, None
+
+        with self._latest_eda_lock:
+            if publish and self._latest_eda.get(os.path.abspath(eda_folder_path)) == run_id:
+                for filename in result["images"]:
+                    publish_file(
+                        os.path.join(folder, filename),
+                        os.path.join(eda_folder_path, filename),
+                    )
+        if not max_bytes:
+            shutil.rmtree(folder, ignore_errors=True)
+        return result, folder
 
-            for num_col in numeric_cols:
-                plt.figure(figsize=(8, 6))
-                sns.histplot(df[num_col], kde=True, color="blue")
-                plt.title(f"Distribution of {num_col}")
-                filename = f"{num_col}_distribution.png"
-                save_path = os.path.join(eda_folder_path, filename)
-                plt.savefig(save_path)
-                plt.close()
+    @staticmethod
+    def _eda_outputs(result, subfolder=None):
+        # Store relative paths for HTML
+        prefix = "static/eda_results/" + (f"{subfolder}/" if subfolder else "")
+        eda_images = [prefix + filename for filename in result["images"]]
+        return result["head"], result["shape"], eda_images, result["summary"]
 
-                # Store relative path for HTML
-                eda_images.append(f"static/eda_results/{filename}")
+    def _refine_eda(self, folder_key, run_id):
+        with self._latest_eda_lock:
+            pending = self._pending_refinements.get(folder_key)
+            if pending is None or pending[0] != run_id:
+                logging.info("Skipping EDA refinement superseded by a newer run")
+                return None
+            del self._pending_refinements[folder_key]
+        df = pending[1]
 
-            if len(numeric_cols) > 1:
-                plt.figure(figsize=(10, 8))
-                sns.heatmap(df[numeric_cols].corr(), annot=True, cmap="coolwarm")
-                filename = "correlation_heatmap.png"
-                save_path = os.path.join(eda_folder_path, filename)
-                plt.savefig(save_path)
-                plt.close()
+        logging.info("Refining sampled EDA with full-data statistics")
+        try:
+            # The images the sampled page shows are left in place: the
+            # refined ones stay in their cache entry. Rendering is serial,
+            # as forking a process pool from a server thread is unsafe
+            result, folder = self._eda_result(df, run_id, publish=False, max_workers=1)
+            subfolder = os.path.relpath(folder, self.ingestion_config.eda_folder_path)
+            return self._eda_outputs(result, subfolder.replace(os.sep, "/"))
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def run_eda(self, df, sample_rows=None, refine=None):
+        """
+        Build the EDA tables and plots.
+
+        Results are cached by a content fingerprint of the data, so an
+        unchanged dataset skips the statistics and plotting; the cached
+        images are linked back into the EDA folder.
+
+        For interactive use the statistics and plots can be computed on a
+        sample of ``sample_rows`` rows (uniform, or stratified on the
+        configured column); the summary then reports the sample size and
+        95% error bounds. With ``refine`` the full-data EDA is computed in
+        the background: ``self.eda_refinement`` resolves to its outputs
+        (images under the EDA cache entry, so the sampled plots are not
+        swapped out from under the sampled summary), or to None when a newer
+        run_eda into the same folder superseded it before it started. Later
+        runs on the same data return it straight from the cache. ``df``
+        must not be modified in place while a refinement is pending.
+
+        Args:
+            df: DataFrame, or a DataProfile from ``profile_data`` for data
+                too large to hold in memory
+            sample_rows: row budget (defaults to the config's eda_sample_rows)
+            refine: defaults to the config's eda_refine
+        """
+        logging.info("Running Exporatory Data Analysis")
+        try:
+            config = self.ingestion_config
+            sample_rows = config.eda_sample_rows if sample_rows is None else sample_rows
+            refine = config.eda_refine if refine is None else refine
+            os.makedirs(config.eda_folder_path, exist_ok=True)
 
-                # Store relative path for HTML
-                eda_images.append(f"static/eda_results/{filename}")
+            run_id = uuid.uuid4().hex
+            folder_key = os.path.abspath(config.eda_folder_path)
+            with self._latest_eda_lock:
+                self._latest_eda[folder_key] = run_id
+                self._pending_refinements.pop(folder_key, None)
 
-            return eda_head, eda_shape, eda_images, eda_summary
+            sampled = (
+                sample_rows
+                and isinstance(df, pd.DataFrame)
+                and len(df) > sample_rows
+            )
+            if not sampled:
+                return self._eda_outputs(self._eda_result(df, run_id)[0])
+
+            # Full-data results, if a refinement already finished, beat a sample
+            result, _ = self._eda_result(df, run_id, compute=False)
+            if result is not None:
+                return self._eda_outputs(result)
+
+            sample = self.sample_for_eda(df, sample_rows)
+            result, _ = self._eda_result(sample, run_id, population_rows=len(df))
+            if refine and not config.eda_cache_max_bytes:
+                logging.warning("EDA refinement needs the EDA cache; skipping it")
+            elif refine:
+                with self._latest_eda_lock:
+                    self._pending_refinements[folder_key] = (run_id, df)
+                self.eda_refinement = self.eda_refiner.submit(
+                    self._refine_eda, folder_key, run_id
+                )
+            return self._eda_outputs(result)
 
         except Exception as e:
-            raise CustomException(e, sys)       
-    
+            raise CustomException(e, sys)
+
     def save_train_test(self, df: pd.DataFrame):
         logging.info("Splitting input data into training and testing sets")
         try:
@@ -106,12 +505,15 @@ class IngestionManager:
                 random_state=TraingingParams.RANDOM_STATE.value,
             )
 
-            # Save the split data
+            # Save the split data in the background; the sets are not
+            # modified in place afterwards, and reads of these paths wait
+            # for the writes to land (wait_for_train_test() surfaces a
+            # failed write)
             self.source.write_flat_file(
-                train_set, path=self.ingestion_config.train_data_path
+                train_set, path=self.ingestion_config.train_data_path, background=True
             )
             self.source.write_flat_file(
-                test_set, path=self.ingestion_config.test_data_path
+                test_set, path=self.ingestion_config.test_data_path, background=True
             )
 
             logging.info("Data Ingestion has completed.")
@@ -123,6 +525,17 @@ class IngestionManager:
         except Exception as e:
             raise CustomException(e, sys)
 
+    def wait_for_train_test(self):
+        """
+        Block until the background writes of save_train_test() have landed,
+        raising the error of either one if it failed.
+        """
+        try:
+            self.source.writer.wait(self.ingestion_config.train_data_path)
+            self.source.writer.wait(self.ingestion_config.test_data_path)
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def get_model_data(self, data_set):
         """
         Loads a saved dataset from model_run/ using self.source.read
@@ -146,7 +559,9 @@ class IngestionManager:
         # Get the raw data
         df_raw = self.load_raw(self.ingest_path)
 
-        # Run EDA
+        # The frame is already in memory, so the EDA runs on it directly;
+        # re-reading the snapshot to stream it would only add a second pass.
+        # For data too large to load, call run_eda(profile_data(path)).
         eda_head, eda_shape, eda_images, eda_summary = self.run_eda(df_raw)
 
         return {
@@ -90,15 +90,16 @@ class ModelTrainer:
         data_transformer_obj = self.model_trainer_config.data_transformer
         if target_feature_name=="EvaluateAllNumericFeatures":
             # Load Raw data and extract all numerical features
-            df_raw,df_train,df_test = data_transformer_obj.get_ingest_data()
+            df_raw = data_transformer_obj.data_ingestion.get_model_data("raw")
             categorical_features, numeric_features = data_transformer_obj.split_features(df_raw)
             # Iterate through all numerical features and perform model evalulation for each
             for target_feature in numeric_features:
-                train_arr,test_arr,pre_proc_obj_path = data_transformer_obj.initiate_data_transformation(target_feature)
-                smodel_report = self.initiate_model_trainer(train_arr,test_arr,target_feature)
+                train_arr,test_arr,pre_proc_obj_path = data_transformer_obj.run(target_feature)
+                model_report = self.initiate_model_trainer(train_arr,test_arr,target_feature)
         else:
-            # Load Raw data and extract all numerical features
-            train_arr,test_arr,pre_proc_obj_path = data_transformer_obj.initiate_data_transformation(target_feature_name)
+            # Reuse the memory-mapped arrays from the last transformation when
+            # the raw data and target are unchanged
+            train_arr,test_arr,pre_proc_obj_path = data_transformer_obj.run(target_feature_name, resume=True)
             model_report = self.initiate_model_trainer(train_arr,test_arr,target_feature_name)
         
         return model_report
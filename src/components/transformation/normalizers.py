@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+
+
+class CategoricalNormalizer(BaseEstimator, TransformerMixin):
+    """
+    Correct inconsistent formatting of categorical features: strip
+    surrounding spaces and lowercase.
+
+    Each column is factorized and only its distinct values are normalized,
+    then mapped back through the codes, so the string work scales with the
+    number of categories rather than rows. Missing values stay missing for
+    the imputer. The transformer is stateless and lives in the fitted
+    preprocessor, so training, test and inference inputs are normalized
+    identically, and the input frame is never modified.
+    """
+
+    def fit(self, X, y=None):
+        if isinstance(X, pd.DataFrame):
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        self.n_features_in_ = np.shape(X)[1]
+        return self
+
+    def transform(self, X):
+        frame = X if isinstance(X, pd.DataFrame) else pd.DataFrame(X)
+        out = np.empty(frame.shape, dtype=object)
+        for i in range(frame.shape[1]):
+            codes, uniques = pd.factorize(frame.iloc[:, i])
+            normalized = pd.Index(uniques.astype(str)).str.strip().str.lower()
+            # Code -1 (missing) picks the trailing NaN
+            out[:, i] = np.append(normalized.to_numpy(dtype=object), np.nan)[codes]
+        return out
+
+    def get_feature_names_out(self, input_features=None):
+        if input_features is not None:
+            return np.asarray(input_features, dtype=object)
+        return getattr(self, "feature_names_in_", None)
@@ -1,6 +1,10 @@
 import os
 import sys
+import json
+import hashlib
+import uuid
 import numpy as np
+import pandas as pd
 from scipy.sparse import issparse, hstack, csr_matrix
 
 from sklearn.impute import SimpleImputer
@@ -14,11 +18,17 @@ from src.common.monitoring.logger import logging
 from src.common.datasource import DataSourceIO
 from src.components.ingestion.ingestion import IngestionManager
 from src.components.features.feature_selection import FeatureSelector
+from src.components.transformation.normalizers import CategoricalNormalizer
 
 
 @dataclass
 class DataTransformConfig:
     pre_proc_obj_path: str = os.path.join("model_run", "pre_proc.joblib")
+    # Transformed arrays are persisted as .npy (dense) or .csr (sparse)
+    # under these stems and reopened memory-mapped
+    train_arr_path: str = os.path.join("model_run", "train_arr")
+    test_arr_path: str = os.path.join("model_run", "test_arr")
+    transformed_meta_path: str = os.path.join("model_run", "transformed_meta.json")
     timeseries_toggle = False
     correlation_factor = 0.9
     mutual_info_filter_count = 15
@@ -76,8 +86,9 @@ class DataTransformation:
         return combined_array
 
     def split_features(self, df):
-        categorical_features = df.select_dtypes(include="object").columns
-        numeric_features = df.select_dtypes(exclude="object").columns
+        # Schema sidecars load low-cardinality text columns as categoricals
+        categorical_features = df.select_dtypes(include=["object", "category"]).columns
+        numeric_features = df.select_dtypes(exclude=["object", "category"]).columns
 
         return categorical_features, numeric_features
 
@@ -116,10 +127,6 @@ class DataTransformation:
                     f"Target feature '{target_feature_name}' not found in dataframe"
                 )
 
-            # Correct inconsistent formatting for string columns
-            for col in df.select_dtypes(include="object").columns:
-                df[col] = df[col].astype(str).str.strip().str.lower()
-
             # Split features and target
             X, y = self.split_input_X_and_target_y(df, target_feature_name)
             categorical_features, numeric_features = self.split_features(X)
@@ -162,6 +169,8 @@ class DataTransformation:
             )
             cat_pipeline = Pipeline(
                 steps=[
+                    # Correct inconsistent formatting (strip spaces, lowercase)
+                    ("normalizer", CategoricalNormalizer()),
                     (
                         "imputer",
                         SimpleImputer(strategy="most_frequent"),
@@ -191,11 +200,103 @@ class DataTransformation:
         except Exception as e:
             raise CustomException(e, sys)
 
-    def run(self, target_feature_name=None):
+    def get_transform_fingerprint(self, df_raw, target_feature_name):
+        """
+        Fingerprint of everything the transformed arrays depend on: the raw
+        data, the target feature and the transformation settings.
+        """
+        digest = hashlib.sha256()
+        digest.update(pd.util.hash_pandas_object(df_raw, index=True).values.tobytes())
+        digest.update(repr(list(df_raw.columns)).encode())
+        digest.update(str(target_feature_name).encode())
+        config = self.transformation_config
+        settings = (
+            config.timeseries_toggle,
+            config.correlation_factor,
+            config.mutual_info_filter_count,
+            config.apply_outlier_clipping,
+            config.correct_numeric_skewness,
+        )
+        digest.update(repr(settings).encode())
+        return digest.hexdigest()
+
+    def save_transformed_arrays(self, train_arr, test_arr):
+        """
+        Persist the transformed arrays and return their paths.
+
+        The previous meta file is removed first: until save_transformed_meta
+        vouches for the new arrays, a resume must not pair them with the
+        fingerprint of the run that wrote the old ones.
+        """
+        config = self.transformation_config
+        if os.path.exists(config.transformed_meta_path):
+            os.remove(config.transformed_meta_path)
+        paths = []
+        for arr, stem in [(train_arr, config.train_arr_path), (test_arr, config.test_arr_path)]:
+            path = stem + (".csr" if issparse(arr) else ".npy")
+            self.source.write_flat_file(arr, path=path)
+            paths.append(path)
+        return paths
+
+    def save_transformed_meta(self, fingerprint, array_paths):
+        """
+        Record what the persisted arrays were built from. Written last and
+        atomically, once the arrays and the preprocessor have all landed.
+        """
+        config = self.transformation_config
+        meta_path = config.transformed_meta_path
+        tmp_path = os.path.join(
+            os.path.dirname(meta_path), f".tmp-{uuid.uuid4().hex[:8]}-{os.path.basename(meta_path)}"
+        )
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "fingerprint": fingerprint,
+                    "train_arr_path": array_paths[0],
+                    "test_arr_path": array_paths[1],
+                    "pre_proc_obj_path": config.pre_proc_obj_path,
+                },
+                f,
+                indent=2,
+            )
+        os.replace(tmp_path, meta_path)
+
+    def load_transformed_arrays(self, fingerprint):
+        """
+        Reopen previously persisted arrays memory-mapped, if they were built
+        from the same fingerprint. Returns None when they must be recomputed.
+        """
+        meta_path = self.transformation_config.transformed_meta_path
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+        paths = [meta["train_arr_path"], meta["test_arr_path"], meta["pre_proc_obj_path"]]
+        if meta["fingerprint"] != fingerprint or not all(map(os.path.exists, paths)):
+            return None
+
+        logging.info("Reusing persisted transformed arrays")
+        train_arr, test_arr = (self.source.read_flat_file(path) for path in paths[:2])
+        return train_arr, test_arr, meta["pre_proc_obj_path"]
+
+    def run(self, target_feature_name=None, resume=False):
+        """
+        Args:
+            target_feature_name: column to predict
+            resume: reuse persisted arrays when the raw data, target and
+                settings are unchanged instead of recomputing them
+        """
         logging.info("Transforming Model Input")
         try:
             # Get ingestion data
             df_raw = self.data_ingestion.get_model_data('raw')
+            fingerprint = self.get_transform_fingerprint(df_raw, target_feature_name)
+            if resume:
+                transformed = self.load_transformed_arrays(fingerprint)
+                if transformed is not None:
+                    return transformed
+
             print(df_raw)
             # Drop duplicates if present
             df_preprocessed = self.clean_raw_data(df_raw)
@@ -217,7 +318,7 @@ class DataTransformation:
             )
 
             # Get preprocessor object and fit model for numerical and categorical features
-            preprocessor_obj = self.get_transformer_obj(df_raw, target_feature_name)
+            preprocessor_obj = self.get_transformer_obj(df_train, target_feature_name)
             X_train_feature = preprocessor_obj.fit_transform(X_train)
             X_test_feature = preprocessor_obj.transform(X_test)
 
@@ -225,10 +326,23 @@ class DataTransformation:
             train_arr = self.combine_input_target_arrays(X_train_feature, y_train)
             test_arr = self.combine_input_target_arrays(X_test_feature, y_test)
 
-            # Save preprocessor object for downstream use
+            # Save preprocessor object for downstream use while the arrays
+            # are persisted
             self.source.write_flat_file(
-                preprocessor_obj, path=self.transformation_config.pre_proc_obj_path
+                preprocessor_obj,
+                path=self.transformation_config.pre_proc_obj_path,
+                background=True,
             )
+
+            # Persist and reopen memory-mapped so training can resume and
+            # joblib workers share pages instead of receiving pickled copies
+            array_paths = self.save_transformed_arrays(train_arr, test_arr)
+            # The returned path must be loadable by the caller, and a failed
+            # background write must fail the run rather than leave a stale file
+            self.source.writer.wait(self.transformation_config.pre_proc_obj_path)
+            self.data_ingestion.wait_for_train_test()
+            self.save_transformed_meta(fingerprint, array_paths)
+            train_arr, test_arr = (self.source.read_flat_file(path) for path in array_paths)
             logging.info("Input Transformations Completed")
 
             return (
@@ -42,14 +42,19 @@ class MockIngestionManager:
             test_set
         )
 
+    def wait_for_train_test(self):
+        pass  # Nothing is written in the background
+
 def test_data_transformation_run(tmp_path, sample_dataframe, monkeypatch):
     try:
         # Patch IngestionManager inside DataTransformation with mock
         transformer = DataTransformation()
         transformer.data_ingestion = MockIngestionManager()
-        transformer.transformation_config.pre_proc_obj_path = str(
-            tmp_path / "pre_proc.joblib"
-        )
+        config = transformer.transformation_config
+        config.pre_proc_obj_path = str(tmp_path / "pre_proc.joblib")
+        config.train_arr_path = str(tmp_path / "train_arr")
+        config.test_arr_path = str(tmp_path / "test_arr")
+        config.transformed_meta_path = str(tmp_path / "transformed_meta.json")
 
         # Run transformation
         train_arr, test_arr, preproc_path = transformer.run(
@@ -77,3 +82,111 @@ def test_data_transformation_run(tmp_path, sample_dataframe, monkeypatch):
 
     except Exception as e:
         raise CustomException(e, sys)
+
+
+def test_data_transformation_persists_memmapped_arrays(tmp_path, monkeypatch):
+    transformer = DataTransformation()
+    transformer.data_ingestion = MockIngestionManager()
+    config = transformer.transformation_config
+    config.pre_proc_obj_path = str(tmp_path / "pre_proc.joblib")
+    config.train_arr_path = str(tmp_path / "train_arr")
+    config.test_arr_path = str(tmp_path / "test_arr")
+    config.transformed_meta_path = str(tmp_path / "transformed_meta.json")
+
+    train_arr, test_arr, _ = transformer.run(target_feature_name="target")
+
+    # Arrays come back memory-mapped from the persisted artifacts
+    assert isinstance(train_arr, np.memmap)
+    assert Path(str(tmp_path / "train_arr.npy")).exists()
+    assert not train_arr.flags.writeable
+
+    # Resuming with unchanged data skips the transformation entirely
+    def fail(*args, **kwargs):
+        raise AssertionError("transformation should not be recomputed")
+
+    monkeypatch.setattr(transformer, "get_transformer_obj", fail)
+    resumed_train, resumed_test, _ = transformer.run(target_feature_name="target", resume=True)
+    np.testing.assert_array_equal(np.asarray(train_arr), np.asarray(resumed_train))
+    np.testing.assert_array_equal(np.asarray(test_arr), np.asarray(resumed_test))
+
+
+def test_transformed_meta_is_only_written_once_the_preprocessor_lands(tmp_path, monkeypatch):
+    from src.common.datasource import DataSourceIO
+
+    transformer = DataTransformation()
+    transformer.data_ingestion = MockIngestionManager()
+    config = transformer.transformation_config
+    config.pre_proc_obj_path = str(tmp_path / "pre_proc.joblib")
+    config.train_arr_path = str(tmp_path / "train_arr")
+    config.test_arr_path = str(tmp_path / "test_arr")
+    config.transformed_meta_path = str(tmp_path / "transformed_meta.json")
+    transformer.run(target_feature_name="target")
+    assert Path(config.transformed_meta_path).exists()
+
+    write_now = DataSourceIO._write_now
+
+    def fail_preprocessor(self, obj, path, *args):
+        if path == config.pre_proc_obj_path:
+            raise OSError("disk full")
+        return write_now(self, obj, path, *args)
+
+    monkeypatch.setattr(DataSourceIO, "_write_now", fail_preprocessor)
+    with pytest.raises(CustomException):
+        transformer.run(target_feature_name="target")
+
+    # The new arrays are never vouched for by a meta file
+    assert not Path(config.transformed_meta_path).exists()
+    assert not list(tmp_path.glob(".tmp-*"))
+    df_raw = transformer.data_ingestion.get_model_data("raw")
+    fingerprint = transformer.get_transform_fingerprint(df_raw, "target")
+    assert transformer.load_transformed_arrays(fingerprint) is None
+
+
+def test_sparse_arrays_roundtrip_memmapped(tmp_path):
+    from scipy.sparse import csr_matrix
+    from src.common.datasource import DataSourceIO
+
+    matrix = csr_matrix(np.array([[0.0, 1.5, 0.0], [2.0, 0.0, 3.0]]))
+    path = str(tmp_path / "train_arr.csr")
+    io = DataSourceIO()
+    io.write_flat_file(matrix, path=path)
+    result = io.read_flat_file(path)
+
+    # Components are views of the read-only memory maps, not copies
+    assert not result.data.flags.writeable
+    np.testing.assert_array_equal(matrix.toarray(), result.toarray())
+
+
+def test_categorical_normalizer_maps_unique_values_without_mutating():
+    from src.components.transformation.normalizers import CategoricalNormalizer
+
+    df = pd.DataFrame(
+        {
+            "region": [" North", "north ", "SOUTH", None],
+            "station": pd.Categorical(["A1 ", "a1", "B2", "b2"]),
+        }
+    )
+    original = df.copy()
+    result = CategoricalNormalizer().fit_transform(df)
+
+    assert list(result[:, 0][:3]) == ["north", "north", "south"]
+    assert pd.isna(result[3, 0])
+    assert list(result[:, 1]) == ["a1", "a1", "b2", "b2"]
+    pd.testing.assert_frame_equal(df, original)
+
+
+def test_transformer_obj_normalizes_train_and_test_consistently(sample_dataframe):
+    transformer = DataTransformation()
+    train = sample_dataframe.assign(feature_cat=["A", " b", "a ", "B"])
+    original = train.copy()
+
+    preprocessor = transformer.get_transformer_obj(train, "target")
+    X_train = train.drop(columns=["target"])
+    fitted = preprocessor.fit_transform(X_train)
+    pd.testing.assert_frame_equal(train, original)
+
+    # Test and inference inputs with other spellings hit the same categories
+    X_test = pd.DataFrame({"feature_num": [1.0, 2.0], "feature_cat": ["  a", "B  "]})
+    encoded = np.asarray(preprocessor.transform(X_test))
+    assert np.asarray(fitted).shape[1] == 3
+    np.testing.assert_allclose(encoded[:, 1:], np.asarray(fitted)[[0, 1], 1:])
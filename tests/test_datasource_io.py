@@ -1,14 +1,25 @@
 import sys
+import json
+import concurrent.futures
 import pytest
+import numpy as np
 import pandas as pd
+from pathlib import Path
 
 from src.common.monitoring.logger import logging
 from src.common.exception import CustomException
+from src.common.cache import FrameCache
+from src.common.datasource import DataSourceIO
+from src.common.write_behind import WriteBehindQueue
+from src.common.schema import DataSchema
+from src.common.sources import base_source
 
 from src.common.sources.csv_source import CSVSource
 from src.common.sources.json_source import JSONSource
 from src.common.sources.pickle_source import PickleSource
-from src.common.sources.joblib_source import JoblibSource  # import Joblib source
+from src.common.sources.joblib_source import JoblibSource, is_compressed
+from src.common.sources.parquet_source import ParquetSource
+from src.common.sources.feather_source import FeatherSource
 
 
 @pytest.mark.parametrize(
@@ -18,6 +29,8 @@ from src.common.sources.joblib_source import JoblibSource  # import Joblib sourc
         (JSONSource, ".json", {"options": {}, "write_options": {}}),
         (PickleSource, ".pkl", {"options": {}, "write_options": {}}),
         (JoblibSource, ".joblib", {"options": {}, "write_options": {}}),
+        (ParquetSource, ".parquet", {"options": {}, "write_options": {}}),
+        (FeatherSource, ".feather", {"options": {}, "write_options": {}}),
     ],
 )
 def test_datasource_io_roundtrip(tmp_path, source_class, extension, config_overrides):
@@ -49,3 +62,385 @@ def test_datasource_io_roundtrip(tmp_path, source_class, extension, config_overr
 
     except Exception as e:
         raise CustomException(e, sys)
+
+
+@pytest.mark.parametrize(
+    "source_class, extension",
+    [(ParquetSource, ".parquet"), (FeatherSource, ".feather")],
+)
+def test_columnar_projection_and_filters(tmp_path, source_class, extension):
+    df = pd.DataFrame(
+        {
+            "region": ["north", "south", "north", "east"],
+            "pm25": [12.0, 40.5, 55.1, 8.3],
+            "admissions": [3, 7, 9, 1],
+        }
+    )
+    file_path = str(tmp_path / f"test{extension}")
+
+    source = source_class()
+    source.write_flat_file(df, file_path)
+    result_df = source.read_flat_file(
+        file_path, columns=["region", "pm25"], filters=[("pm25", ">", 35)]
+    )
+
+    expected_df = df.loc[df["pm25"] > 35, ["region", "pm25"]]
+    pd.testing.assert_frame_equal(
+        expected_df.reset_index(drop=True), result_df.reset_index(drop=True)
+    )
+
+
+@pytest.mark.parametrize("config", [{}, {"lines": True}])
+def test_json_projection_and_filters(tmp_path, config):
+    df = pd.DataFrame(
+        {
+            "region": ["north", "south", "north", "east"],
+            "pm25": [12.0, 40.5, 55.1, 8.3],
+        }
+    )
+    file_path = str(tmp_path / "test.json")
+    # The default layout is an array of records, which cannot be scanned lazily
+    JSONSource(config).write_flat_file(df, file_path)
+
+    io = DataSourceIO()
+    result_df = io.read_flat_file(file_path, columns=["pm25"], filters=[("pm25", ">", 35)])
+    assert list(result_df["pm25"]) == [40.5, 55.1]
+    counts = io.read_flat_file(file_path, query="SELECT count(*) AS n FROM data")
+    assert counts["n"].iloc[0] == 4
+
+
+@pytest.mark.parametrize(
+    "source_class, extension, config_overrides",
+    [
+        (CSVSource, ".csv", {"options": {}, "write_options": {}}),
+        (JSONSource, ".json", {"lines": True, "write_options": {}}),
+        (JSONSource, ".json", {"lines": True, "engine": "pyarrow"}),
+        (ParquetSource, ".parquet", {"options": {}, "write_options": {}}),
+        (FeatherSource, ".feather", {"options": {}, "write_options": {}}),
+    ],
+)
+def test_chunked_read_matches_full_read(
+    tmp_path, source_class, extension, config_overrides
+):
+    df = pd.DataFrame(
+        {
+            "col1": list(range(10)),
+            "col2": [0.5 * i for i in range(10)],
+            "col3": list("abcdefghij"),
+        }
+    )
+    file_path = str(tmp_path / f"test{extension}")
+
+    source = source_class({**source_class().config, **config_overrides})
+    source.write_flat_file(df, file_path)
+    chunks = list(source.read_flat_file_chunks(file_path, chunksize=4))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert all(chunk.dtypes.equals(chunks[0].dtypes) for chunk in chunks)
+    pd.testing.assert_frame_equal(
+        df, pd.concat(chunks, ignore_index=True), check_dtype=False
+    )
+
+
+def test_chunked_read_rejects_lossy_dtype_change(tmp_path):
+    file_path = tmp_path / "test.csv"
+    file_path.write_text("col1\n1\n2\n2.5\n")
+
+    with pytest.raises(CustomException, match="changed dtype"):
+        list(CSVSource().read_flat_file_chunks(str(file_path), chunksize=2))
+
+
+@pytest.mark.parametrize(
+    "source_class, extension",
+    [(CSVSource, ".csv"), (JSONSource, ".json")],
+)
+def test_schema_sidecar_downcasts_on_read(tmp_path, source_class, extension):
+    df = pd.DataFrame(
+        {
+            "count": [1, 2, 3, 4],
+            "ratio": [0.5, 0.25, 1.5, 2.0],
+            "reading": [0.1, 0.2, 0.3, 0.4],
+            "region": ["north", "south", "north", "south"],
+            "date": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"]),
+        }
+    )
+    file_path = str(tmp_path / f"test{extension}")
+
+    source = source_class()
+    source.write_flat_file(df, file_path)
+    result_df = source.read_flat_file(file_path)
+
+    assert Path(f"{file_path}.schema.json").exists()
+    assert result_df["count"].dtype == "int8"
+    assert result_df["ratio"].dtype == "float32"
+    assert result_df["reading"].dtype == "float64"  # float32 would be lossy
+    assert isinstance(result_df["region"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(result_df["date"])
+    pd.testing.assert_frame_equal(df, result_df, check_dtype=False, check_categorical=False)
+
+
+def test_query_aggregates_are_not_cast_to_the_sidecar(tmp_path):
+    df = pd.DataFrame({"region": ["north", "south"] * 5000, "count": [1] * 10000})
+    file_path = str(tmp_path / "counts.csv")
+    DataSourceIO().write_flat_file(df, file_path)
+
+    io = DataSourceIO()
+    totals = io.read_flat_file(
+        file_path,
+        query="SELECT region, SUM(count) AS count FROM data GROUP BY region ORDER BY region",
+    )
+    assert list(totals["count"]) == [5000, 5000]  # int8 would wrap around
+
+    # Plain projections still get the sidecar types
+    projected = io.read_flat_file(file_path, query="SELECT region, count FROM data")
+    assert projected["count"].dtype == "int8"
+
+
+def test_ndjson_pyarrow_engine_roundtrip(tmp_path):
+    df = pd.DataFrame(
+        {
+            "count": list(range(10)),
+            "ratio": [0.5 * i for i in range(10)],
+            "region": ["north", "south"] * 5,
+            "date": pd.date_range("2024-01-01", periods=10, freq="37min"),
+        }
+    )
+    file_path = str(tmp_path / "test.json")
+
+    source = JSONSource({"lines": True, "engine": "pyarrow", "chunksize": 3})
+    source.write_flat_file(df, file_path)
+    result_df = source.read_flat_file(file_path)
+
+    with open(file_path) as f:
+        assert len(f.readlines()) == 10  # one record per line across write chunks
+    assert result_df["count"].dtype == "int8"  # parsed with the sidecar's Arrow schema
+    assert isinstance(result_df["region"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(df, result_df, check_dtype=False, check_categorical=False)
+
+    # An explicit schema in the config overrides the sidecar
+    source.config["schema"] = {"count": "int64"}
+    assert source.read_flat_file(file_path)["count"].dtype == "int64"
+
+
+def test_joblib_artifact_mode_memory_maps_large_buffers(tmp_path):
+    artifact = {"weights": np.arange(1_000_000, dtype="float64"), "name": "model"}
+    small_df = pd.DataFrame({"col1": [1, 2, 3]})
+    artifact_path = str(tmp_path / "model_rf.joblib")
+    small_path = str(tmp_path / "small.joblib")
+
+    source = JoblibSource({"mmap_threshold": 1024**2})
+    source.write_flat_file(artifact, artifact_path)
+    source.write_flat_file(small_df, small_path)
+    loaded = source.read_flat_file(artifact_path)
+
+    # Large buffers are stored raw and come back memory-mapped read-only
+    assert isinstance(loaded["weights"], np.memmap)
+    assert not loaded["weights"].flags.writeable
+    np.testing.assert_array_equal(loaded["weights"], artifact["weights"])
+    # Small artifacts keep the compressed default and still load
+    assert is_compressed(small_path)
+    pd.testing.assert_frame_equal(source.read_flat_file(small_path), small_df)
+
+    # A per-artifact policy overrides the size heuristic
+    policy = JoblibSource({"compress_policy": {"model_*.joblib": 3}})
+    assert policy.compression_for(artifact, artifact_path) == 3
+
+    # Policies match the final file name, not the atomic write's temp name
+    policy = JoblibSource({"compress_policy": {"model_*.joblib": 0}})
+    policy_path = str(tmp_path / "model_small.joblib")
+    policy.write_flat_file({"w": np.arange(10)}, policy_path)
+    assert not is_compressed(policy_path)
+    assert isinstance(policy.read_flat_file(policy_path)["w"], np.memmap)
+
+
+def test_uncompressed_joblib_frames_load_writable(tmp_path):
+    df = pd.DataFrame({"a": np.arange(1000), "b": np.linspace(0, 1, 1000)})
+    file_path = str(tmp_path / "ingested.joblib")
+    # What joblib.dump writes by default: uncompressed, but not an artifact
+    JoblibSource({"compress": 0}).write_flat_file(df, file_path)
+
+    result = JoblibSource().read_flat_file(file_path)
+    result.loc[0, "a"] = 5
+    result["b"].fillna(0, inplace=True)
+    assert result.loc[0, "a"] == 5
+
+    # Frames above the artifact threshold stay ordinary data as well
+    large = pd.DataFrame(np.zeros((300_000, 8)))
+    large_path = str(tmp_path / "large.joblib")
+    DataSourceIO().write_flat_file(large, large_path)
+    result = DataSourceIO().read_flat_file(large_path, use_cache=False)
+    result.iloc[0, 0] = 5
+    assert result.iloc[0, 0] == 5
+
+
+def test_stale_schema_sidecar_is_ignored(tmp_path):
+    file_path = tmp_path / "test.csv"
+    source = CSVSource()
+    source.write_flat_file(pd.DataFrame({"col1": [1, 2]}), str(file_path))
+
+    # Rewrite the file behind the source's back
+    file_path.write_text("col1\nx\ny\nz\n")
+    result_df = source.read_flat_file(str(file_path))
+
+    assert result_df["col1"].tolist() == ["x", "y", "z"]
+
+
+def test_schema_sidecar_lands_before_the_data(tmp_path, monkeypatch):
+    file_path = str(tmp_path / "test.csv")
+    source = CSVSource()
+    source.write_flat_file(pd.DataFrame({"col1": [1, 2]}), file_path)
+    replace = base_source._replace
+    seen = {}
+
+    def checking_replace(src, dst):
+        # New sidecar is on disk, but stale for the old data still in place
+        seen["sidecar"] = DataSchema.load(dst)
+        with open(DataSchema.sidecar_path(dst)) as f:
+            seen["columns"] = json.load(f)["columns"]
+        replace(src, dst)
+
+    monkeypatch.setattr(base_source, "_replace", checking_replace)
+    source.write_flat_file(pd.DataFrame({"col2": [1.5, 2.5]}), file_path)
+
+    assert seen == {"sidecar": None, "columns": ["col2"]}
+    assert DataSchema.load(file_path).dtypes == {"col2": "float32"}
+
+def test_read_options_do_not_leak_into_other_sources(tmp_path):
+    file_path = str(tmp_path / "test.csv")
+    CSVSource().write_flat_file(pd.DataFrame({"col1": [1, 2]}), file_path)
+
+    DataSourceIO().read_flat_file(file_path, use_cache=False, lines=True)
+
+    assert "lines" not in CSVSource().config
+    assert "lines" not in PickleSource().config
+
+def test_datasource_io_read_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(DataSourceIO, "cache", FrameCache())
+    io = DataSourceIO()
+    file_path = str(tmp_path / "test.parquet")
+    io.write_flat_file(pd.DataFrame({"col1": [1, 2, 3]}), file_path)
+
+    first_df = io.read_flat_file(file_path)
+    first_df["col1"] = first_df["col1"] * 10  # must not leak into the cache
+    second_df = io.read_flat_file(file_path)
+
+    assert second_df["col1"].tolist() == [1, 2, 3]
+    assert io.cache_info()["hits"] == 1
+
+    # Neither do in-place edits, to the frame that filled the cache or a hit
+    second_df.loc[0, "col1"] = -1
+    first_df.iloc[1, 0] = -2
+    assert io.read_flat_file(file_path)["col1"].tolist() == [1, 2, 3]
+    assert io.cache_info()["misses"] == 1
+
+    # Rewriting the file invalidates the cached frame
+    io.write_flat_file(pd.DataFrame({"col1": [4, 5]}), file_path)
+    assert io.read_flat_file(file_path)["col1"].tolist() == [4, 5]
+    assert io.cache_info()["misses"] == 2
+
+    # A write can seed the cache: the next plain read is a hit, not a new entry
+    io.write_flat_file(pd.DataFrame({"col1": [6, 7]}), file_path, cache_result=True)
+    hits, entries = io.cache_info()["hits"], io.cache_info()["entries"]
+    assert io.read_flat_file(file_path)["col1"].tolist() == [6, 7]
+    assert io.cache_info()["hits"] == hits + 1
+    assert io.cache_info()["entries"] == entries
+
+
+def test_read_cache_evicts_by_memory_budget(tmp_path, monkeypatch):
+    frame_bytes = int(pd.DataFrame({"col1": [1, 2, 3]}).memory_usage(deep=True).sum())
+    monkeypatch.setattr(DataSourceIO, "cache", FrameCache(max_bytes=frame_bytes))
+    io = DataSourceIO()
+    paths = [str(tmp_path / f"test{i}.parquet") for i in range(2)]
+    for path in paths:
+        io.write_flat_file(pd.DataFrame({"col1": [1, 2, 3]}), path)
+        io.read_flat_file(path)
+
+    info = io.cache_info()
+    assert info["entries"] == 1
+    assert info["evictions"] == 1
+    assert info["current_bytes"] <= frame_bytes
+
+
+@pytest.mark.parametrize("codec", ["gz", "zst", "lz4"])
+@pytest.mark.parametrize(
+    "source_class, extension, config_overrides",
+    [
+        (CSVSource, ".csv", {}),
+        (JSONSource, ".json", {"lines": True}),
+        (JSONSource, ".json", {"lines": True, "engine": "pyarrow"}),
+        (PickleSource, ".pkl", {}),
+    ],
+)
+def test_compressed_roundtrip(tmp_path, codec, source_class, extension, config_overrides):
+    if codec == "zst":
+        pytest.importorskip("zstandard")
+    elif codec == "lz4":
+        pytest.importorskip("lz4.frame")
+
+    df = pd.DataFrame({"col1": list(range(6)), "col2": list("abcdef")})
+    file_path = str(tmp_path / f"test{extension}.{codec}")
+
+    source = DataSourceIO().set_source_from_path(file_path)
+    assert isinstance(source, source_class)
+    source.config = {**source.config, **config_overrides}
+    source.write_flat_file(df, file_path)
+
+    with open(file_path, "rb") as f:
+        assert not f.read(4).startswith(b"col1")  # really compressed on disk
+    pd.testing.assert_frame_equal(df, source.read_flat_file(file_path), check_dtype=False)
+    if source_class is not PickleSource:
+        chunks = list(source.read_flat_file_chunks(file_path, chunksize=4))
+        assert [len(chunk) for chunk in chunks] == [4, 2]
+
+
+def test_compression_level_zero_is_honored(tmp_path):
+    file_path = tmp_path / "test.csv.gz"
+    source = CSVSource({"compression_level": 0})
+    source.write_flat_file(pd.DataFrame({"col1": ["stored"] * 50}), str(file_path))
+
+    # Level 0 gzip stores the data uncompressed instead of using the default
+    assert b"stored\nstored" in file_path.read_bytes()
+    assert source.read_flat_file(str(file_path))["col1"].tolist() == ["stored"] * 50
+
+
+def test_background_writes_are_atomic_and_ordered(tmp_path, monkeypatch):
+    monkeypatch.setattr(DataSourceIO, "cache", FrameCache())
+    monkeypatch.setattr(DataSourceIO, "writer", WriteBehindQueue(max_workers=4))
+    io = DataSourceIO()
+    file_path = str(tmp_path / "test.csv")
+
+    futures = [
+        io.write_flat_file(pd.DataFrame({"col1": [i] * 1000}), file_path, background=True)
+        for i in range(5)
+    ]
+    # Reads wait for queued writes to the path: the last write wins
+    assert io.read_flat_file(file_path)["col1"].unique().tolist() == [4]
+    assert all(future.done() for future in futures)
+    io.flush()
+    # No temp files are left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["test.csv", "test.csv.schema.json"]
+
+    # A failing write leaves the previous file intact and surfaces once,
+    # on the next wait for its path, even after it has long finished
+    future = io.write_flat_file(object(), file_path, background=True)
+    concurrent.futures.wait([future])
+    assert io.writer.pending() == 0
+    with pytest.raises(CustomException):
+        io.writer.wait(file_path)
+    io.writer.wait(file_path)
+    io.flush()
+
+    # ... or on a read of the path, or on flush
+    concurrent.futures.wait([io.write_flat_file(object(), file_path, background=True)])
+    with pytest.raises(CustomException):
+        io.read_flat_file(file_path, use_cache=False)
+    concurrent.futures.wait([io.write_flat_file(object(), file_path, background=True)])
+    with pytest.raises(CustomException):
+        io.flush()
+    assert io.read_flat_file(file_path, use_cache=False)["col1"].tolist() == [4] * 1000
+
+    # A later successful write to the path clears the earlier failure
+    io.write_flat_file(object(), file_path, background=True)
+    io.write_flat_file(pd.DataFrame({"col1": [5]}), file_path, background=True)
+    assert io.read_flat_file(file_path, use_cache=False)["col1"].tolist() == [5]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["test.csv", "test.csv.schema.json"]
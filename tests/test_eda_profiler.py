@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.components.eda.profiler import DataProfile, HyperLogLog, KLLSketch
+
+
+@pytest.fixture(scope="function")
+def air_quality():
+    rng = np.random.default_rng(0)
+    n = 5000
+    df = pd.DataFrame(
+        {
+            "pm25": rng.normal(30, 5, n),
+            "no2": rng.exponential(10, n),
+            "admissions": rng.integers(0, 20, n),
+            "region": rng.choice(["north", "south", "east"], n, p=[0.5, 0.3, 0.2]),
+        }
+    )
+    df.loc[::13, "pm25"] = np.nan
+    df.loc[::29, "no2"] = np.nan
+    df.loc[::31, "region"] = None
+    return df
+
+
+def _chunks(df, size):
+    return [df.iloc[start : start + size] for start in range(0, len(df), size)]
+
+
+def test_streaming_profile_matches_pandas(air_quality):
+    profile = DataProfile.from_chunks(_chunks(air_quality, 700))
+    summary = profile.summary_frame()
+    numeric = ["pm25", "no2", "admissions"]
+    expected = air_quality.describe(include="all")
+
+    assert profile.shape == air_quality.shape
+    pd.testing.assert_frame_equal(profile.head, air_quality.head())
+    for row in ["count", "mean", "std", "min", "max"]:
+        np.testing.assert_allclose(
+            summary.loc[row, numeric].astype(float), expected.loc[row, numeric].astype(float)
+        )
+    np.testing.assert_allclose(summary.loc["skew", numeric].astype(float), air_quality[numeric].skew())
+    np.testing.assert_allclose(summary.loc["kurtosis", numeric].astype(float), air_quality[numeric].kurt())
+    assert list(summary.loc["null_count"]) == list(air_quality.isnull().sum())
+    assert summary.loc["top", "region"] == "north"
+    assert summary.loc["freq", "region"] == air_quality["region"].value_counts().iloc[0]
+    assert summary.loc["unique", "region"] == 3
+    pd.testing.assert_frame_equal(profile.correlation(), air_quality[numeric].corr())
+
+    for hist in profile.histograms():
+        values = air_quality[hist["column"]].dropna()
+        expected_counts, _ = np.histogram(values, bins=hist["edges"])
+        np.testing.assert_array_equal(hist["counts"], expected_counts)
+        assert hist["kde"].shape == hist["grid"].shape
+
+
+def test_partial_profiles_merge_exactly(air_quality):
+    chunks = _chunks(air_quality, 600)
+    whole = DataProfile.from_chunks(chunks)
+    merged = DataProfile.from_chunks(chunks[:3]).merge(DataProfile.from_chunks(chunks[3:]))
+
+    assert merged.rows == whole.rows
+    np.testing.assert_array_equal(merged.nulls, whole.nulls)
+    for key in ["n", "mean", "m2"]:
+        np.testing.assert_allclose(merged.moments[key], whole.moments[key])
+    np.testing.assert_allclose(merged.correlation(), whole.correlation())
+    for a, b in zip(merged.hists, whole.hists):
+        assert a.width == b.width and a.start == b.start
+        np.testing.assert_array_equal(a.counts, b.counts)
+    for a, b in zip(merged.distinct, whole.distinct):
+        np.testing.assert_array_equal(a.registers, b.registers)
+    assert merged.top["region"].counts == whole.top["region"].counts
+
+    with pytest.raises(ValueError):
+        merged.merge(DataProfile.from_chunks([air_quality[["pm25"]]]))
+
+
+def test_sketches_estimate_quantiles_and_distinct_counts():
+    rng = np.random.default_rng(2)
+    values = rng.normal(size=100_000)
+
+    sketch = KLLSketch()
+    for part in np.array_split(values, 20):
+        sketch.update(part)
+    ranks = np.searchsorted(np.sort(values), sketch.quantiles([0.1, 0.5, 0.9])) / len(values)
+    np.testing.assert_allclose(ranks, [0.1, 0.5, 0.9], atol=0.02)
+
+    small = KLLSketch()
+    small.update(values[:50])
+    np.testing.assert_allclose(small.quantiles([0.25, 0.75]), np.quantile(values[:50], [0.25, 0.75]))
+
+    hll = HyperLogLog()
+    hll.update(pd.Series(rng.integers(0, 20_000, 100_000)))
+    assert abs(hll.count() - 20_000) / 20_000 < 0.05
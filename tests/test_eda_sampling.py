@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from src.components.eda.sampling import reservoir_sample, sample_error_bounds, stratified_sample
+
+
+def _frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "pm25": rng.normal(30, 5, n),
+            "region": rng.choice(["north", "south", "remote"], n, p=[0.6, 0.399, 0.001]),
+        }
+    )
+
+
+def test_reservoir_sample_streams_chunks_uniformly():
+    df = _frame(20_000)
+    chunks = [df.iloc[start : start + 3000] for start in range(0, len(df), 3000)]
+
+    sample = reservoir_sample(chunks, 2000)
+    assert len(sample) == 2000
+    assert sample.index.is_monotonic_increasing
+    # Every part of the stream is represented in proportion
+    counts, _ = np.histogram(sample.index, bins=10, range=(0, len(df)))
+    assert counts.min() > 140 and counts.max() < 260
+    pd.testing.assert_frame_equal(reservoir_sample(df, 2000), reservoir_sample(df, 2000))
+
+
+def test_stratified_sample_keeps_rare_strata():
+    df = _frame(20_000)
+    sample = stratified_sample(df, 1000, "region")
+
+    shares = sample["region"].value_counts(normalize=True)
+    assert "remote" in shares
+    assert abs(shares["north"] - 0.6) < 0.02
+    assert len(sample) <= 1000 + 3
+
+
+def test_sample_error_bounds_cover_the_population_mean():
+    df = _frame(50_000, seed=1)
+    sample = reservoir_sample(df, 2000)
+    bounds = sample_error_bounds(sample, len(df))
+
+    assert bounds.loc["sample_size", "pm25"] == 2000
+    error = bounds.loc["mean_error_95", "pm25"]
+    assert 0 < error < 0.5
+    assert abs(sample["pm25"].mean() - df["pm25"].mean()) < error
+    assert 0 < bounds.loc["top_share_error_95", "region"] < 0.05
+    assert np.isnan(bounds.loc["mean_error_95", "region"])
@@ -0,0 +1,31 @@
+import pandas as pd
+import pyarrow.fs as fs
+
+from src.common.sources.dev.hdfs_source import HDFSSource
+
+
+def test_hdfs_source_reads_partitioned_dataset_with_pruning(tmp_path):
+    df = pd.DataFrame(
+        {
+            "region": ["north", "south"] * 500,
+            "pm25": [float(i) for i in range(1000)],
+            "no2": [0.5 * i for i in range(1000)],
+        }
+    )
+    df.to_parquet(tmp_path / "readings", partition_cols=["region"], row_group_size=100)
+
+    source = HDFSSource(
+        {
+            "filesystem": fs.LocalFileSystem(),
+            "path": str(tmp_path / "readings"),
+            "file_format": "parquet",
+            "columns": ["pm25"],
+            "filters": [("region", "==", "north"), ("pm25", ">=", 900)],
+        }
+    )
+    result = source.load()
+
+    expected = df[(df["region"] == "north") & (df["pm25"] >= 900)]
+    assert list(result.columns) == ["pm25"]
+    assert result["pm25"].tolist() == expected["pm25"].tolist()
+    assert sum(len(chunk) for chunk in source.load_chunks(chunksize=10)) == len(expected)
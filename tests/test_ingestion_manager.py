@@ -1,10 +1,13 @@
 import sys
+import threading
 import pytest
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
 
 from src.components.ingestion.ingestion import IngestionManager
+from src.components.eda.plots import histogram_data
 from src.common.type_defs import SourceClassMap
 from src.common.exception import CustomException
 
@@ -35,6 +38,7 @@ def sample_dataframe():
         ),
         (SourceClassMap.PICKLE, ".pkl", {"options": {}, "write_options": {}}),
         (SourceClassMap.JOBLIB, ".joblib", {"options": {}, "write_options": {}}),
+        (SourceClassMap.PARQUET, ".parquet", {"options": {}, "write_options": {}}),
     ],
 )
 def test_ingestion_manager_end_to_end(
@@ -55,9 +59,15 @@ def test_ingestion_manager_end_to_end(
             import joblib
 
             joblib.dump(df, test_path)
+        elif extension == ".parquet":
+            df.to_parquet(test_path, index=False)
 
         # Run the ingestion manager using new method
         manager = IngestionManager(str(test_path))
+        config = manager.ingestion_config
+        config.raw_data_path = str(tmp_path / "model_run" / "raw.parquet")
+        config.manifest_path = str(tmp_path / "model_run" / "manifest.json")
+        config.eda_folder_path = str(tmp_path / "model_run" / "eda")
 
         # manager.set_source_from_config(source_enum, config_overrides)
         return_dict = manager.run()
@@ -77,3 +87,249 @@ def test_ingestion_manager_end_to_end(
 
     except Exception as e:
         raise CustomException(e, sys)
+
+
+def test_load_raw_snapshot_roundtrips_exactly(tmp_path):
+    df = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03"]),
+            "region": pd.Categorical(["north", "south", "north"]),
+            "pm25": [12.5, None, 40.1],
+            "admissions": [3, 7, 9],
+        }
+    )
+    test_path = tmp_path / "sample.pkl"
+    df.to_pickle(test_path)
+
+    manager = IngestionManager(str(test_path))
+    manager.ingestion_config.raw_data_path = str(tmp_path / "raw.parquet")
+    manager.ingestion_config.manifest_path = str(tmp_path / "manifest.json")
+    df_raw = manager.load_raw(None)
+
+    # The persisted snapshot must read back to the returned frame, dtypes included
+    df_persisted = manager.source.read_flat_file(
+        manager.ingestion_config.raw_data_path, use_cache=False
+    )
+    pd.testing.assert_frame_equal(df_raw, df_persisted)
+    pd.testing.assert_frame_equal(df_raw, df)
+
+
+def test_load_raw_snapshot_accepts_mixed_types_and_non_string_columns(tmp_path):
+    df = pd.DataFrame({"reading": [1, "x", 2.5, None], 0: [1.0, 2.0, 3.0, 4.0]})
+    test_path = tmp_path / "sample.pkl"
+    df.to_pickle(test_path)
+
+    manager = IngestionManager(str(test_path))
+    manager.ingestion_config.raw_data_path = str(tmp_path / "raw.parquet")
+    manager.ingestion_config.manifest_path = str(tmp_path / "manifest.json")
+    df_raw = manager.load_raw(None)
+
+    assert list(df_raw.columns) == ["reading", "0"]
+    assert df_raw["reading"].tolist()[:3] == ["1", "x", "2.5"]
+    assert df_raw["reading"].isnull().iloc[3]
+    df_persisted = manager.source.read_flat_file(
+        manager.ingestion_config.raw_data_path, use_cache=False
+    )
+    pd.testing.assert_frame_equal(df_raw, df_persisted)
+
+
+def test_load_raw_multi_file_glob_with_provenance(tmp_path):
+    for day, extra in [(1, {}), (2, {"pm25": [1.5, 2.5]}), (3, {})]:
+        pd.DataFrame({"feature1": [day, day], "label": [0, 1], **extra}).to_csv(
+            tmp_path / f"part_{day}.csv", index=False
+        )
+
+    manager = IngestionManager(str(tmp_path / "part_*.csv"))
+    manager.ingestion_config.raw_data_path = str(tmp_path / "model_run" / "raw.parquet")
+    manager.ingestion_config.manifest_path = str(tmp_path / "model_run" / "manifest.json")
+    manager.ingestion_config.source_file_column = "source_file"
+    manager.ingestion_config.max_workers = 2
+    df_raw = manager.load_raw()
+
+    assert df_raw["feature1"].tolist() == [1, 1, 2, 2, 3, 3]
+    assert df_raw["pm25"].isnull().sum() == 4
+    assert df_raw["source_file"].tolist()[::2] == ["part_1.csv", "part_2.csv", "part_3.csv"]
+    assert [entry["rows"] for entry in manager.load_manifest()] == [2, 2, 2]
+
+    # A new partition arrives: only it is parsed and appended to the snapshot
+    pd.DataFrame({"feature1": [4], "label": [1]}).to_csv(tmp_path / "part_4.csv", index=False)
+    df_raw = manager.load_raw(skip_ingested=True)
+
+    assert df_raw["feature1"].tolist() == [1, 1, 2, 2, 3, 3, 4]
+    assert len(manager.load_manifest()) == 4
+
+
+def test_load_raw_pushes_query_down_to_the_files(tmp_path):
+    df = pd.DataFrame(
+        {
+            "region": ["north", "south", "east"] * 20,
+            "pm25": [float(i) for i in range(60)],
+            "admissions": list(range(60)),
+        }
+    )
+    csv_path = tmp_path / "readings.csv"
+    df.to_csv(csv_path, index=False)
+
+    manager = IngestionManager(str(csv_path))
+    manager.ingestion_config.raw_data_path = str(tmp_path / "model_run" / "raw.parquet")
+    manager.ingestion_config.manifest_path = str(tmp_path / "model_run" / "manifest.json")
+
+    # Filter spec: evaluated in the pyarrow dataset scan
+    df_raw = manager.load_raw(columns=["region", "pm25"], filters=[("region", "==", "north")])
+    assert list(df_raw.columns) == ["region", "pm25"]
+    assert df_raw["pm25"].tolist() == df.loc[df["region"] == "north", "pm25"].tolist()
+
+    # SQL: run on DuckDB when it is installed
+    pytest.importorskip("duckdb")
+    df_raw = manager.load_raw(
+        query="SELECT region, pm25 FROM data WHERE pm25 >= 30 AND region <> 'east' ORDER BY pm25"
+    )
+    assert len(df_raw) == 20
+    assert set(df_raw["region"]) == {"north", "south"}
+    assert manager.load_manifest()[0]["rows"] == 20
+
+
+def test_run_eda_renders_plots_in_parallel(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "pm25": rng.normal(30, 5, 500),
+            "no2": rng.exponential(10, 500),
+            "admissions": rng.integers(0, 20, 500),
+            "region": ["north", "south"] * 250,
+        }
+    )
+    df.loc[::50, "pm25"] = np.nan
+
+    manager = IngestionManager()
+    manager.ingestion_config.eda_folder_path = str(tmp_path / "eda")
+    manager.ingestion_config.eda_max_workers = 2
+    _, eda_shape, eda_images, _ = manager.run_eda(df)
+
+    assert eda_shape == "Rows: 500, Columns: 4"
+    assert [Path(image).name for image in eda_images] == [
+        "pm25_distribution.png",
+        "no2_distribution.png",
+        "admissions_distribution.png",
+        "correlation_heatmap.png",
+    ]
+    for image in eda_images:
+        assert (tmp_path / "eda" / Path(image).name).stat().st_size > 0
+
+
+def test_vectorized_histograms_match_numpy():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({"a": rng.normal(size=1000), "b": rng.exponential(size=1000)})
+    df.loc[::7, "b"] = np.nan
+
+    for hist in histogram_data(df, ["a", "b"], bins=20):
+        expected, _ = np.histogram(df[hist["column"]].dropna(), bins=hist["edges"])
+        np.testing.assert_array_equal(hist["counts"], expected)
+        assert hist["kde"].shape == hist["grid"].shape
+
+
+def test_streaming_eda_profiles_files_in_parallel(tmp_path):
+    rng = np.random.default_rng(3)
+    for i in range(3):
+        pd.DataFrame(
+            {
+                "pm25": rng.normal(30, 5, 400),
+                "no2": rng.exponential(10, 400),
+                "region": rng.choice(["north", "south"], 400),
+            }
+        ).to_csv(tmp_path / f"part_{i}.csv", index=False)
+
+    manager = IngestionManager()
+    manager.ingestion_config.eda_folder_path = str(tmp_path / "eda")
+    manager.ingestion_config.max_workers = 2
+    profile = manager.profile_data(str(tmp_path / "part_*.csv"), chunksize=150)
+    df = pd.concat([pd.read_csv(tmp_path / f"part_{i}.csv") for i in range(3)])
+
+    assert profile.shape == (1200, 3)
+    np.testing.assert_allclose(profile.correlation(), df[["pm25", "no2"]].corr())
+
+    _, eda_shape, eda_images, eda_summary = manager.run_eda(profile)
+    assert eda_shape == "Rows: 1200, Columns: 3"
+    assert len(eda_images) == 3
+    assert "null_count" in eda_summary
+
+
+def test_run_eda_reuses_cached_results(tmp_path, monkeypatch):
+    rng = np.random.default_rng(4)
+    df = pd.DataFrame({"pm25": rng.normal(30, 5, 200), "no2": rng.exponential(10, 200)})
+
+    manager = IngestionManager()
+    manager.ingestion_config.eda_folder_path = str(tmp_path / "eda")
+    manager.ingestion_config.eda_max_workers = 1
+    first = manager.run_eda(df)
+
+    # An unchanged dataset is served from the cache without recomputing
+    def fail(*args, **kwargs):
+        raise AssertionError("EDA should not be recomputed")
+
+    monkeypatch.setattr(manager, "compute_eda", fail)
+    (tmp_path / "eda" / "pm25_distribution.png").unlink()
+    assert manager.run_eda(df.copy()) == first
+    assert (tmp_path / "eda" / "pm25_distribution.png").exists()
+    assert manager.run_eda(df) == first
+    assert not list((tmp_path / "eda").glob(".tmp-*"))
+
+    # Changed data misses; the size bound evicts the least recently used entry
+    monkeypatch.undo()
+    manager.ingestion_config.eda_cache_max_bytes = 1
+    manager.run_eda(df.assign(no2=df["no2"] * 2))
+    entries = list((tmp_path / "eda" / "cache").iterdir())
+    assert len(entries) == 1
+
+
+def test_sampled_eda_refines_to_full_statistics(tmp_path):
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({"pm25": rng.normal(30, 5, 5000), "no2": rng.exponential(10, 5000)})
+
+    manager = IngestionManager()
+    manager.ingestion_config.eda_folder_path = str(tmp_path / "eda")
+    manager.ingestion_config.eda_max_workers = 1
+    _, eda_shape, eda_images, eda_summary = manager.run_eda(df, sample_rows=500, refine=True)
+
+    assert eda_shape == "Rows: 5000, Columns: 2 (statistics from a sample of 500 rows)"
+    assert "mean_error_95" in eda_summary
+
+    sampled_plot = (tmp_path / "eda" / "pm25_distribution.png").read_bytes()
+
+    refined = manager.eda_refinement.result()
+    assert refined[1] == "Rows: 5000, Columns: 2"
+    assert "mean_error_95" not in refined[3]
+    # The refined plots live in their cache entry; the page showing the
+    # sampled summary keeps its sampled plots
+    assert [Path(image).name for image in refined[2]] == [Path(image).name for image in eda_images]
+    for image in refined[2]:
+        assert image.startswith("static/eda_results/cache/")
+        assert (tmp_path / "eda" / image[len("static/eda_results/"):]).exists()
+    assert (tmp_path / "eda" / "pm25_distribution.png").read_bytes() == sampled_plot
+
+    # Later sampled runs on the same data get the full statistics from the cache
+    assert manager.run_eda(df, sample_rows=500) == (refined[0], refined[1], eda_images, refined[3])
+
+
+def test_superseded_eda_refinements_are_skipped(tmp_path):
+    rng = np.random.default_rng(6)
+    manager = IngestionManager()
+    manager.ingestion_config.eda_folder_path = str(tmp_path / "eda")
+    manager.ingestion_config.eda_max_workers = 1
+
+    # Hold the refiner so both refinements are still queued
+    release = threading.Event()
+    blocker = IngestionManager.eda_refiner.submit(release.wait)
+    refinements = []
+    for scale in (1, 2):
+        df = pd.DataFrame({"pm25": rng.normal(30, 5, 2000) * scale, "no2": rng.exponential(10, 2000)})
+        manager.run_eda(df, sample_rows=200, refine=True)
+        refinements.append(manager.eda_refinement)
+    # Only the latest frame is kept alive for refinement
+    pending = IngestionManager._pending_refinements[str(tmp_path / "eda")]
+    assert pending[1] is df
+    release.set()
+    blocker.result()
+
+    assert refinements[0].result() is None
+    assert refinements[1].result()[1] == "Rows: 2000, Columns: 2"
@@ -0,0 +1,95 @@
+import json
+import pytest
+import pandas as pd
+
+pytest.importorskip("confluent_kafka")
+
+from src.common.datasource import DataSourceIO  # noqa: E402
+from src.common.sources.dev.kafka_source import KafkaSource  # noqa: E402
+
+
+class FakeMessage:
+    def __init__(self, value):
+        self._value = value
+
+    def value(self):
+        return self._value
+
+    def error(self):
+        return None
+
+
+class FakeConsumer:
+    """In-memory stand-in for confluent_kafka.Consumer."""
+
+    def __init__(self, records):
+        self.queue = [FakeMessage(json.dumps(r).encode()) for r in records]
+        self.position = 0
+        self.committed = []
+
+    def __call__(self, conf):
+        self.conf = conf
+        return self
+
+    def subscribe(self, topics):
+        self.topics = topics
+
+    def consume(self, num_messages=1, timeout=-1):
+        batch = self.queue[self.position : self.position + num_messages]
+        self.position += len(batch)
+        return batch
+
+    def commit(self, asynchronous=True):
+        self.committed.append(self.position)
+
+    def close(self):
+        pass
+
+
+def test_kafka_stream_flushes_micro_batches_before_commit(tmp_path):
+    records = [{"station": f"s{i % 3}", "pm25": float(i)} for i in range(25)]
+    consumer = FakeConsumer(records)
+    output_dir = tmp_path / "events.parquet"
+
+    source = KafkaSource(
+        {
+            "topic": "air-quality",
+            "output_dir": str(output_dir),
+            "batch_size": 10,
+            "consumer_factory": consumer,
+        }
+    )
+    partitions = source.stream()
+
+    assert len(partitions) == 3
+    assert consumer.conf["enable.auto.commit"] is False
+    # Offsets advance only after each partition has been written
+    assert consumer.committed == [10, 20, 25]
+
+    df = DataSourceIO().read_flat_file(str(output_dir))
+    assert "ingest_date" in df.columns
+    assert sorted(df["pm25"]) == [r["pm25"] for r in records]
+
+
+def test_kafka_stream_reads_back_batches_whose_schema_drifts(tmp_path):
+    # The first batch infers int64 readings, the second double readings
+    # plus a field the first batch never saw
+    records = [{"station": "s0", "reading": i} for i in range(3)] + [
+        {"station": "s1", "reading": i + 0.5, "unit": "ug/m3"} for i in range(3)
+    ]
+    output_dir = tmp_path / "events.parquet"
+
+    source = KafkaSource(
+        {
+            "topic": "air-quality",
+            "output_dir": str(output_dir),
+            "batch_size": 3,
+            "consumer_factory": FakeConsumer(records),
+        }
+    )
+    assert len(source.stream()) == 2
+
+    df = DataSourceIO().read_flat_file(str(output_dir)).sort_values("reading")
+    assert df["reading"].tolist() == [0.0, 0.5, 1.0, 1.5, 2.0, 2.5]
+    assert df["unit"].isna().sum() == 3
+    assert (df.loc[df["station"] == "s1", "unit"] == "ug/m3").all()
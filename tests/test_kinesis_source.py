@@ -0,0 +1,70 @@
+import json
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from src.common.sources.dev.kinesis_source import KinesisSource  # noqa: E402
+
+
+@pytest.fixture
+def kinesis_stream(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with moto.mock_aws():
+        client = boto3.client("kinesis", region_name="us-east-1")
+        client.create_stream(StreamName="air-quality", ShardCount=3)
+        yield client
+
+
+def put_records(client, records):
+    for i, record in enumerate(records):
+        data = record if isinstance(record, bytes) else json.dumps(record).encode()
+        client.put_record(StreamName="air-quality", Data=data, PartitionKey=str(i))
+
+
+def test_kinesis_reads_all_shards_and_resumes_from_checkpoint(kinesis_stream, tmp_path):
+    put_records(kinesis_stream, [{"pm25": float(i)} for i in range(30)] + [b"{broken"])
+    source = KinesisSource(
+        {
+            "stream_name": "air-quality",
+            "checkpoint_path": str(tmp_path / "checkpoints.json"),
+        }
+    )
+
+    df = source.load()
+    assert sorted(df["pm25"]) == [float(i) for i in range(30)]
+    assert len(source.malformed_records) == 1
+    assert len(source.load_checkpoints()) == 3
+
+    # A rerun only returns records that arrived after the checkpoint
+    put_records(kinesis_stream, [{"pm25": 99.0}])
+    assert source.load()["pm25"].tolist() == [99.0]
+
+
+class GapClient:
+    """Serves empty pages that are still behind the tip before the records."""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get_shard_iterator(self, **kwargs):
+        return {"ShardIterator": "0"}
+
+    def get_records(self, ShardIterator, Limit):
+        records, behind = self.pages[int(ShardIterator)]
+        next_iterator = str(int(ShardIterator) + 1)
+        return {"Records": records, "MillisBehindLatest": behind, "NextShardIterator": next_iterator}
+
+
+def test_kinesis_backs_off_on_empty_pages_behind_the_tip(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("src.common.sources.dev.kinesis_source.time.sleep", sleeps.append)
+    record = {"Data": json.dumps({"pm25": 1.0}).encode(), "SequenceNumber": "1"}
+    source = KinesisSource({"stream_name": "air-quality", "shard_id": "shard-0", "poll_interval": 0.5})
+    source._client = GapClient([([], 5000), ([], 3000), ([record], 1000), ([], 0)])
+
+    df = source.load()
+    assert df["pm25"].tolist() == [1.0]
+    # One wait per empty page that was still behind; none at the tip
+    assert sleeps == [0.5, 0.5]
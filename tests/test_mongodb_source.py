@@ -0,0 +1,79 @@
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from src.common.sources.dev.mongodb_source import MongoDBSource  # noqa: E402
+
+
+def test_mongodb_source_streams_projected_batches():
+    client = mongomock.MongoClient()
+    client["air"]["readings"].insert_many(
+        [{"station": f"s{i}", "pm25": i * 1.5, "notes": "x" * 10} for i in range(25)]
+    )
+
+    source = MongoDBSource(
+        {
+            "client": client,
+            "database": "air",
+            "collection": "readings",
+            "query": {"pm25": {"$gte": 3.0}},
+            "schema": {"station": "string", "pm25": "float32"},
+            "batch_size": 10,
+        }
+    )
+    chunks = list(source.load_chunks())
+    df = source.load()
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 3]
+    # _id and unrequested fields never leave the server
+    assert list(df.columns) == ["station", "pm25"]
+    assert df["pm25"].dtype == "float32"
+    assert df["station"].tolist()[:2] == ["s2", "s3"]
+
+
+def test_mongodb_source_unifies_drifting_schemas():
+    client = mongomock.MongoClient()
+    docs = [{"station": f"s{i}", "reading": None} for i in range(10)]
+    docs += [{"station": f"s{i}", "reading": i} for i in range(10, 20)]
+    docs += [{"station": f"s{i}", "reading": i + 0.5, "flag": True} for i in range(20, 25)]
+    client["air"]["readings"].insert_many(docs)
+
+    source = MongoDBSource(
+        {"client": client, "database": "air", "collection": "readings", "batch_size": 10}
+    )
+    chunks = list(source.load_chunks())
+    df = source.load()
+
+    assert len(df) == 25
+    assert df["reading"].dtype == "float64"
+    assert df["reading"].isnull().sum() == 10
+    assert df["reading"].iloc[-1] == 24.5
+    # A field first seen in a later batch is kept
+    assert df["flag"].isnull().sum() == 20 and df["flag"].iloc[-1]
+    assert list(chunks[-1].columns) == ["station", "reading", "flag"]
+
+
+def test_mongodb_source_loads_object_ids_and_decimals_as_strings():
+    from bson import Decimal128, ObjectId
+
+    client = mongomock.MongoClient()
+    object_ids = [ObjectId() for _ in range(3)]
+    client["air"]["readings"].insert_many(
+        [
+            {"_id": object_id, "pm25": Decimal128(f"{i}.25")}
+            for i, object_id in enumerate(object_ids)
+        ]
+    )
+
+    source = MongoDBSource(
+        {
+            "client": client,
+            "database": "air",
+            "collection": "readings",
+            "projection": {"_id": 1, "pm25": 1},
+        }
+    )
+    df = source.load()
+
+    assert df["_id"].tolist() == [str(object_id) for object_id in object_ids]
+    assert df["pm25"].tolist() == ["0.25", "1.25", "2.25"]
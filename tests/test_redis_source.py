@@ -0,0 +1,57 @@
+import pytest
+import pandas as pd
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from src.common.sources.dev.redis_source import RedisSource  # noqa: E402
+
+
+def test_redis_source_bulk_write_and_scan_load():
+    client = fakeredis.FakeRedis(decode_responses=True)
+    client.set("other:1", "not a feature")
+    df = pd.DataFrame(
+        {
+            "station": [f"s{i}" for i in range(25)],
+            "pm25": [float(i) for i in range(25)],
+        }
+    )
+
+    source = RedisSource(
+        {
+            "client": client,
+            "key_column": "station",
+            "key_prefix": "features:",
+            "pattern": "features:*",
+            "batch_size": 4,
+            "pipeline_depth": 2,
+        }
+    )
+    source.write_flat_file(df, "features")
+    chunks = list(source.load_chunks())
+    result_df = source.load()
+
+    assert client.get("features:s3") == '{"station":"s3","pm25":3.0}'
+    assert all(len(chunk) <= 8 for chunk in chunks)
+    pd.testing.assert_frame_equal(
+        df, result_df.sort_values("pm25", ignore_index=True), check_like=True
+    )
+
+
+def test_redis_source_skips_keys_scan_returns_twice(monkeypatch):
+    client = fakeredis.FakeRedis(decode_responses=True)
+    for i in range(5):
+        client.set(f"features:s{i}", f'{{"station":"s{i}"}}')
+    scan_iter = client.scan_iter
+
+    def scan_iter_with_repeats(*args, **kwargs):
+        keys = list(scan_iter(*args, **kwargs))
+        return iter(keys + keys[:3])
+
+    monkeypatch.setattr(client, "scan_iter", scan_iter_with_repeats)
+    source = RedisSource(
+        {"client": client, "pattern": "features:*", "batch_size": 2}
+    )
+
+    result_df = source.load()
+
+    assert sorted(result_df["station"]) == [f"s{i}" for i in range(5)]